@@ -1,9 +1,11 @@
 import numpy as np
-import math
 from dataclasses import dataclass
 
 
 class HoltropMennen:
+    """The attributes of ship can be floats or equally shaped numpy arrays, in which case the resistance of all
+    ships is calculated at once.
+    """
     def __init__(self, ship): 
         self.ship = ship
         self.mean_draft = (self.ship.t_a + self.ship.t_f) / 2
@@ -17,8 +19,6 @@ class HoltropMennen:
     def total_resistance(self):
         """test case 1793
         """
-        print(sum((self.friction_res() * self.form_factor(), self.wave_res(), self.bulb_res(), self.ra(), self.rtr())))
-        print(self.ship.lpp, self.ship.B, self.mean_draft)
         return sum((self.friction_res() * self.form_factor(), self.wave_res(), self.bulb_res(), self.ra(), self.rtr()))
 
     def friction_res(self):
@@ -120,10 +120,7 @@ class HoltropMennen:
         test = 0.6513
         """
         ratio = self.lwl / self.ship.B
-        if ratio < 12:
-            return 1.446 * self.ship.c_prism - 0.03 * ratio
-        else:
-            return 1.446 * self.ship.c_prism - 0.36
+        return np.where(ratio < 12, 1.446 * self.ship.c_prism - 0.03 * ratio, 1.446 * self.ship.c_prism - 0.36)
 
     @property
     def c1(self):
@@ -135,7 +132,7 @@ class HoltropMennen:
         """reduction of wave resistance due to the action of bulbous bow.
         0.7595 checks with the right c3 diff =/- 0.02
         """
-        return math.exp(-1.89 * np.sqrt(self.c3))
+        return np.exp(-1.89 * np.sqrt(self.c3))
     
     @property
     def c3(self):
@@ -149,10 +146,7 @@ class HoltropMennen:
         """test case = 0.04
         """
         ratio = self.ship.t_f / self.lwl
-        if ratio <= 0.04:
-            return ratio
-        else:
-            return 0.04
+        return np.minimum(ratio, 0.04)
 
     @property
     def c5(self):
@@ -165,21 +159,13 @@ class HoltropMennen:
     def c6(self):
         """Related to the Froude number based on the transom immersion\n
         """
-        if self.fn_t < 5:
-           return 0.2 * (1 - 0.2 * self.fn_t)
-        else:
-            return 0
+        return np.where(self.fn_t < 5, 0.2 * (1 - 0.2 * self.fn_t), 0)
     
     @property
     def c7(self):
         # 0.1561 in test case, has significant impact on c1.
         ratio = self.ship.B / self.lwl
-        if ratio < 0.11:
-            return 0.229_577 * ratio  ** 0.33_333
-        elif ratio < 0.25:
-            return ratio
-        else:
-            return 0.5 - 0.0625 * ratio
+        return np.select([ratio < 0.11, ratio < 0.25], [0.229_577 * ratio  ** 0.33_333, ratio], 0.5 - 0.0625 * ratio)
 
     @property
     def c12(self):
@@ -187,12 +173,8 @@ class HoltropMennen:
         0.5102 for the testcase
         """
         ratio = self.mean_draft / self.lwl
-        if ratio < 0.02:
-            return 0.479948
-        elif ratio < 0.05:
-            return 48.2 * (ratio - 0.02) ** 2.078 + 0.479948
-        else:
-            return ratio ** 0.2228446
+        return np.select([ratio < 0.02, ratio < 0.05],
+                         [0.479948, 48.2 * np.maximum(ratio - 0.02, 0) ** 2.078 + 0.479948], ratio ** 0.2228446)
        
     @property
     def c13(self):
@@ -208,19 +190,14 @@ class HoltropMennen:
         """1.69_385
         """
         ratio = self.lwl ** 3 / self.ship.displ
-        if ratio < 512:
-            return -1.69_385 # Holtrop and mennen is not clear about wheter this value is negative or positive
-        elif ratio < 1727:
-            return -1.69_385 + (self.lwl / self.ship.displ ** (1/3) -8) / 2.36
-        else:
-            return 0
+        # Holtrop and mennen is not clear about wheter the value for ratio < 512 is negative or positive
+        return np.select([ratio < 512, ratio < 1727], [-1.69_385, -1.69_385 + (self.lwl / self.ship.displ ** (1/3) -8) / 2.36], 0)
             
     @property
     def c16(self):
-        if self.ship.c_prism < 0.8:
-            return 8.07_981 * self.ship.c_prism - 13.8_673 * self.ship.c_prism ** 2 + 6.984_388 * self.ship.c_prism ** 3
-        else:
-            return 1.73_014 - 0.7_067 * self.ship.c_prism
+        return np.where(self.ship.c_prism < 0.8,
+                        8.07_981 * self.ship.c_prism - 13.8_673 * self.ship.c_prism ** 2 + 6.984_388 * self.ship.c_prism ** 3,
+                        1.73_014 - 0.7_067 * self.ship.c_prism)
 
     @property
     def p_b(self):
@@ -1,31 +1,31 @@
-from enviroment import ShipEnv
+from vec_env import make_vec_env
 from stable_baselines3 import PPO, A2C
-from stable_baselines3.common.vec_env import DummyVecEnv
 import os
-from gym.wrappers.time_limit import TimeLimit
 time_steps = 100
 episode_length = 25
-# TimeLimit(env, episode_length)]
-env = ShipEnv()
-env = DummyVecEnv([lambda: TimeLimit(env=env, max_episode_steps=episode_length)]) # wrapping
+n_envs = os.cpu_count()
 
-# from stable_baselines3.common.env_checker import check_env
+if __name__ == '__main__':
+    env = make_vec_env(n_envs, episode_length=episode_length)
 
+    # from stable_baselines3.common.env_checker import check_env
 
-# It will check your custom environment and output additional warnings if needed
-# check_env(env)
 
-# policies = ['MultiInputPolicy']
-model = PPO.load('Training\Saved Models\PPOv0_model.zip', env=env, verbose = 1, normalize_advantage=True) # tensorboard_log=log_path
+    # It will check your custom environment and output additional warnings if needed
+    # check_env(env)
 
-# model = A2C('MlpPolicy', env, verbose = 1, normalize_advantage=True) # tensorboard_log=log_path
+    # policies = ['MultiInputPolicy']
+    model = PPO.load('Training\Saved Models\PPOv0_model.zip', env=env, verbose = 1, normalize_advantage=True) # tensorboard_log=log_path
 
-# # model = A2C('MlpPolicy', env, verbose = 1) # tensorboard_log=log_path
+    # model = A2C('MlpPolicy', env, verbose = 1, normalize_advantage=True) # tensorboard_log=log_path
 
+    # # model = A2C('MlpPolicy', env, verbose = 1) # tensorboard_log=log_path
 
-model.learn(total_timesteps=time_steps, log_interval=2 ,progress_bar=True)
 
+    model.learn(total_timesteps=time_steps, log_interval=2 ,progress_bar=True)
 
-PPO_path = os.path.join('Training', 'Saved Models', 'A2C_model')
 
-model.save(PPO_path)
\ No newline at end of file
+    PPO_path = os.path.join('Training', 'Saved Models', 'A2C_model')
+
+    model.save(PPO_path)
+    env.close()
@@ -1,20 +1,20 @@
-from enviroment import ShipEnv
-from stable_baselines3 import PPO, A2C
-from stable_baselines3.common.vec_env import DummyVecEnv
+from vec_env import make_vec_env
+from stable_baselines3 import PPO
 import os
-from gym.wrappers.time_limit import TimeLimit
 
 
 time_steps = 100
 episode_length = 25
+n_envs = os.cpu_count()
 
 
-env = ShipEnv()
-env = DummyVecEnv([lambda: TimeLimit(env=env, max_episode_steps=episode_length)]) # wrapping
+if __name__ == '__main__':
+    env = make_vec_env(n_envs, episode_length=episode_length)
 
-model = PPO('MlpPolicy', env, verbose = 1, normalize_advantage=True)
-model.learn(total_timesteps=time_steps, log_interval=2 ,progress_bar=True)
+    model = PPO('MlpPolicy', env, verbose = 1, normalize_advantage=True)
+    model.learn(total_timesteps=time_steps, log_interval=2 ,progress_bar=True)
 
-PPO_path = os.path.join('Training', 'Saved Models', 'PPOv0')
+    PPO_path = os.path.join('Training', 'Saved Models', 'PPOv0')
 
-model.save(PPO_path)
+    model.save(PPO_path)
+    env.close()
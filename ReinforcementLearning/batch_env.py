@@ -0,0 +1,63 @@
+"""
+Vectorized environment which evaluates the hulls of all environments in one pass of array operations.
+
+Every sub environment behaves as a ShipEnv wrapped in a TimeLimit, but instead of stepping N environments one after
+another the actions are translated into Blocks, BatchHull and one HoltropMennen of arrays. The environment can be
+passed to PPO, A2C and SAC in place of a DummyVecEnv or SubprocVecEnv.
+
+Sources:
+    https://stable-baselines3.readthedocs.io/en/master/guide/vec_envs.html
+"""
+import numpy as np
+from stable_baselines3.common.vec_env import VecEnv
+from batch_episodes import BatchEpisodes
+from enviroment import BALE, VELOCITY
+
+
+class BatchShipEnv(BatchEpisodes, VecEnv):
+    """VecEnv of BatchEpisodes.
+    Arg:
+        n_envs (int): number of environments evaluated per step.
+        bale (float): bale space of the hold [m^3].
+        velocity (float): service speed [kn].
+        episode_length (int): maximum number of steps of an episode, same as the TimeLimit wrapper.
+        resolutions (tuple): resolutions of the frames from coarse to full, see BatchEpisodes.
+        milestones (tuple): fraction of the training at which every resolution starts, see set_training_progress.
+    """
+    def __init__(self, n_envs: int, bale: float = BALE, velocity: float = VELOCITY, episode_length: int = 25,
+                 resolutions: tuple = None, milestones: tuple = None):
+        BatchEpisodes.__init__(self, n_envs, bale, velocity, episode_length, resolutions, milestones)
+        VecEnv.__init__(self, n_envs, self.observation_space, self.action_space)
+        self._actions = None
+
+    def step_async(self, actions: np.ndarray) -> None:
+        self._actions = np.asarray(actions, dtype=np.float64).reshape(self.num_envs, -1)
+
+    def step_wait(self):
+        return BatchEpisodes.step(self, self._actions)
+
+    def close(self) -> None:
+        pass
+
+    def seed(self, seed: int = None) -> list:
+        self.action_space.seed(seed)
+        return [seed + i if seed is not None else None for i in range(self.num_envs)]
+
+    def _indices(self, indices) -> range:
+        if indices is None:
+            return range(self.num_envs)
+        if isinstance(indices, int):
+            return [indices]
+        return indices
+
+    def get_attr(self, attr_name: str, indices=None) -> list:
+        return [getattr(self, attr_name) for _ in self._indices(indices)]
+
+    def set_attr(self, attr_name: str, value, indices=None) -> None:
+        setattr(self, attr_name, value)
+
+    def env_method(self, method_name: str, *method_args, indices=None, **method_kwargs) -> list:
+        return [getattr(self, method_name)(*method_args, **method_kwargs) for _ in self._indices(indices)]
+
+    def env_is_wrapped(self, wrapper_class, indices=None) -> list:
+        return [False for _ in self._indices(indices)]
@@ -0,0 +1,112 @@
+"""
+Episodes of N environments which are evaluated in one pass of array operations.
+
+BatchEpisodes translates the actions of all environments into Blocks, BatchHull and one HoltropMennen of arrays and
+keeps the best resistance, the step and the resolution schedule of every episode. It doesn't depend on
+stable_baselines3, BatchShipEnv adds the VecEnv interface.
+"""
+import numpy as np
+from build_vessel.batch import Blocks, BatchHull
+from build_vessel.table import PARAMETERS
+from HoltropMennen import HoltropMennen
+from enviroment import ShipEnv, BALE, VELOCITY
+
+
+class BatchEpisodes:
+    """
+    Arg:
+        n_envs (int): number of environments evaluated per step.
+        bale (float): bale space of the hold [m^3].
+        velocity (float): service speed [kn].
+        episode_length (int): maximum number of steps of an episode, same as the TimeLimit wrapper.
+        resolutions (tuple): resolutions of the frames from coarse to full, see ShipEnv. The designs that beat the
+            best of their episode are evaluated again at the full resolution.
+        milestones (tuple): fraction of the training at which every resolution starts, see set_training_progress.
+    """
+    def __init__(self, n_envs: int, bale: float = BALE, velocity: float = VELOCITY, episode_length: int = 25,
+                 resolutions: tuple = None, milestones: tuple = None):
+        env = ShipEnv(bale, velocity, resolutions=resolutions, milestones=milestones)
+        self.num_envs = n_envs
+        self.observation_space = env.observation_space
+        self.action_space = env.action_space
+        self.bale = bale
+        self.velocity = velocity
+        self.episode_length = episode_length
+        self.time_step = np.zeros(n_envs, dtype=int)
+        self.episode_step = np.zeros(n_envs, dtype=int)
+        self.best = np.full(n_envs, np.inf)
+        self.schedule = env.schedule
+        self.full_resolution = env.full_resolution
+
+    # the schedule is shared by the sub environments
+    set_training_progress = ShipEnv.set_training_progress
+
+    @property
+    def resolution(self) -> int:
+        return self.full_resolution if self.schedule is None else self.schedule.resolution
+
+    def _evaluate(self, blocks: Blocks, resolution: int) -> tuple:
+        hull = BatchHull(blocks, resolution)
+        properties = hull.properties()
+        hm_input = hull.hm_input(self.velocity, properties)
+        return properties, hm_input, HoltropMennen(hm_input).total_resistance()
+
+    def reset(self) -> np.ndarray:
+        observation = self.best.copy()
+        self.best[:] = np.inf
+        self.episode_step[:] = 0
+        return observation[:, None]
+
+    def step(self, actions: np.ndarray) -> tuple:
+        """
+        Arg:
+            actions (np.ndarray): shape (n_envs, 8)
+        Return:
+            observation, reward, dones, infos (tuple): of every environment, an episode which is done is reset.
+        """
+        actions = np.array(actions, dtype=np.float64).reshape(self.num_envs, -1)
+        actions[np.isnan(actions).any(axis=1)] = 0.5
+        self.time_step += 1
+        self.episode_step += 1
+
+        blocks = Blocks(**ShipEnv.block_parameters(actions.T, self.bale))
+        done = blocks.check_done() | (self.time_step >= 100)
+        properties, hm_input, resistance = self._evaluate(blocks, self.resolution)
+        evaluated = np.full(self.num_envs, self.resolution)
+        coarse_resistance = np.full(self.num_envs, None)
+        if self.resolution < self.full_resolution:
+            # the reward of a new best design is computed at the full resolution
+            rows = np.nonzero(resistance < self.best)[0]
+            if len(rows):
+                self.schedule.n_reevaluated += len(rows)
+                evaluated[rows], coarse_resistance[rows] = self.full_resolution, resistance[rows]
+                selected = Blocks(**{name: getattr(blocks, name)[rows] for name in PARAMETERS})
+                selected.draft, selected.transom_height = blocks.draft[rows], blocks.transom_height[rows]
+                full_properties, full_input, resistance[rows] = self._evaluate(selected, self.full_resolution)
+                for key, value in full_properties.items():
+                    properties[key][rows] = value
+                hm_input.reward_correct_input[rows] = full_input.reward_correct_input
+
+        # same reward as ShipEnv.reward_function
+        improved = resistance < self.best
+        reward = np.where(improved, hm_input.reward_correct_input + 1 - 2 * (resistance < 0), -1).astype(np.float32)
+        self.best = np.minimum(self.best, resistance)
+
+        observation = resistance[:, None].astype(np.float64)
+        truncated = ~done & (self.episode_step >= self.episode_length)
+        infos = [{key: value[i] for key, value in properties.items()} for i in range(self.num_envs)]
+        if self.schedule is not None:
+            # the same record as ShipEnv
+            stats = self.schedule.stats()
+            for info, resolution, coarse in zip(infos, evaluated, coarse_resistance):
+                info["resolution"] = {**stats, "evaluated": int(resolution), "coarse_resistance": coarse}
+        for i in np.nonzero(done | truncated)[0]:
+            infos[i]["TimeLimit.truncated"] = bool(truncated[i])
+            infos[i]["terminal_observation"] = observation[i]
+        dones = done | truncated
+        if dones.any():
+            observation = observation.copy()
+            observation[dones] = self.best[dones, None]
+            self.best[dones] = np.inf
+            self.episode_step[dones] = 0
+        return observation, reward, dones, infos
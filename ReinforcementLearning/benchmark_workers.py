@@ -0,0 +1,61 @@
+"""
+Scaling benchmark of the environment steps per second against the number of workers.
+
+usage:
+    python benchmark_workers.py --workers 1 2 4 8 --steps 200 --output workers.csv
+"""
+import argparse
+import csv
+import io
+import os
+import time
+from contextlib import redirect_stdout
+import numpy as np
+from vec_env import make_vec_env
+
+
+def steps_per_second(n_envs: int, n_steps: int, seed: int = 0, start_method: str = None) -> float:
+    """Time n_steps steps of every worker with random actions, the start up of the workers is excluded.
+    """
+    vec_env = make_vec_env(n_envs, seed=seed, start_method=start_method)
+    rng = np.random.default_rng(seed)
+    actions = rng.uniform(-1, 1, size=(n_steps, n_envs) + vec_env.action_space.shape)
+    with redirect_stdout(io.StringIO()):
+        vec_env.reset()
+        start = time.perf_counter()
+        for action in actions:
+            vec_env.step(action)
+        elapsed = time.perf_counter() - start
+    vec_env.close()
+    return n_steps * n_envs / elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--workers", type=int, nargs="+", default=None, help="worker counts, defaults to powers of 2 up to the number of cores")
+    parser.add_argument("--steps", type=int, default=100, help="steps per worker")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--start-method", default=None, choices=["spawn", "fork", "forkserver"])
+    parser.add_argument("--output", default=None, help="csv file for the results")
+    args = parser.parse_args()
+
+    workers = args.workers
+    if workers is None:
+        workers = [2 ** i for i in range(int(np.log2(os.cpu_count())) + 1)]
+
+    rows = []
+    for n_envs in workers:
+        sps = steps_per_second(n_envs, args.steps, args.seed, args.start_method)
+        speedup = sps / rows[0]["steps_per_second"] * workers[0] if rows else float(workers[0])
+        rows.append({"workers": n_envs, "steps_per_second": sps, "speedup": speedup, "efficiency": speedup / n_envs})
+        print(f"{n_envs:>4} workers {sps:10.1f} steps/s  speedup {speedup:5.2f}  efficiency {speedup / n_envs:5.2f}")
+
+    if args.output:
+        with open(args.output, "w", newline="") as f:
+            writer = csv.DictWriter(f, fieldnames=rows[0].keys())
+            writer.writeheader()
+            writer.writerows(rows)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,42 @@
+"""
+Callbacks of the training scripts.
+
+usage:
+    env = make_vec_env(n_envs, resolutions=(25, 50, 100))
+    model.learn(total_timesteps, callback=ResolutionCallback(total_timesteps))
+
+Sources:
+    https://stable-baselines3.readthedocs.io/en/master/guide/callbacks.html
+"""
+from stable_baselines3.common.callbacks import BaseCallback
+
+
+class ResolutionCallback(BaseCallback):
+    """Raises the resolution of the frames of the ShipEnv workers as the training progresses, see
+    ShipEnv.set_training_progress.
+    Arg:
+        total_timesteps (int): the total_timesteps passed to learn.
+        update_freq (int): steps between the updates, every update is a call to all workers.
+    """
+    def __init__(self, total_timesteps: int, update_freq: int = 1000, verbose: int = 0) -> None:
+        super().__init__(verbose)
+        self.total_timesteps = total_timesteps
+        self.update_freq = update_freq
+        self.resolution = None
+
+    def _on_training_start(self) -> None:
+        self._update()
+
+    def _on_step(self) -> bool:
+        if self.n_calls % self.update_freq == 0:
+            self._update()
+        return True
+
+    def _update(self) -> None:
+        progress = self.num_timesteps / self.total_timesteps
+        resolution = self.training_env.env_method("set_training_progress", progress)[0]
+        if resolution != self.resolution:
+            self.resolution = resolution
+            self.logger.record("train/resolution", resolution)
+            if self.verbose:
+                print(f"resolution of the frames {resolution} at {progress:.0%} of the training")
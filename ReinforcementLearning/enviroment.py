@@ -13,17 +13,28 @@ Sources:
     https://gymnasium.farama.org/tutorials/environment_creation/
 """
 from gym.spaces import Box
-from build_vessel.utils import modify_control_points
-from build_vessel.properties import Properties, Info
-from build_vessel.cross_section import CrossSection, BuildFrames
-from build_vessel.parameters import Block, CtrlPts, HMInput
+from build_vessel.properties import Info
+from build_vessel.cross_section import BuildFrames, HullBuffer
+from build_vessel.parameters import Block, CtrlPts, HMInput, rescale_actions, block_parameters
+from build_vessel.cache import ResultCache
+from build_vessel.store import EvaluationStore
+from build_vessel.neighbours import DesignIndex
+from build_vessel.timing import StageTimer
+from episode import EpisodeTracker
+from trajectory import TrajectoryLogger
+from evaluation import build_frames, hull_input, resistance_components
+from resistance import HoltropMennenBackend, MainDimensionBackend, ScreeningScheduler, ResolutionSchedule
 import gym
+import copy
 import numpy as np
 # np.seterr(invalid='raise')
 
 
 BALE = 8000
 VELOCITY = 12
+# fields of Info written to the trajectory log
+HYDROSTATICS = ("transom_area", "volume", "statical_moment", "lcb", "prismatic_coefficient", "block_coefficient", "ie",
+                "c_wp", "c_m", "fidelity")
 
 
 class ShipEnv(gym.Env):
@@ -31,10 +42,60 @@ class ShipEnv(gym.Env):
 
     metadata = {"render.modes": ["human"]}
 
-    def __init__(self):
+    def __init__(self, bale: float = BALE, velocity: float = VELOCITY, screening: bool = False, margin: float = 0.1,
+                 cache_size: int = 4096, store: str = None, visualize: bool = False, timing: bool = False,
+                 history: int = 100, log: str = None, precheck: bool = False, resolutions: tuple = None,
+                 milestones: tuple = None, tolerance: float = 0):
+        """
+        The environment holds no module level state and pyvista is only imported when visualize is True, so every
+        worker of a SubprocVecEnv can construct its own environment.
+        Arg:
+            bale (float): bale space of the hold [m^3].
+            velocity (float): service speed [kn].
+            screening (bool): screen every design with the main dimension backend and only build the frames of
+                promising designs.
+            margin (float): relative margin on the best resistance of the episode within which a design is promoted.
+            cache_size (int): number of evaluated designs kept in the least recently used cache, 0 disables the cache.
+            store (str): SQLite file of the EvaluationStore shared with other runs and workers.
+            visualize (bool): plot the frames of every step, see BuildFrames.visualize.
+            timing (bool): time the stages of every step, the timings of the step are in info['timing'] and the
+                percentiles of all steps are returned by timing_summary.
+            history (int): number of recent resistances kept by the EpisodeTracker.
+            log (str): directory of the TrajectoryLogger, which records the action, the block, the hydrostatics, the
+                resistance components and the reward of every step.
+            precheck (bool): end the episode without building the frames when the design violates a geometric
+                constraint. The violations of every step are in info['violations'], see Block.violations.
+            resolutions (tuple): resolutions of the frames from coarse to full, e.g. (25, 50, 100), see
+                ResolutionSchedule. A design that beats the best of the episode is evaluated again at the full
+                resolution, so the best of the episode is always a full evaluation. The resolutions of every step are
+                in info['resolution']. None evaluates every design at the full resolution of BuildFrames.
+            milestones (tuple): fraction of the training at which every resolution starts, see
+                set_training_progress.
+            tolerance (float): reuse the result of an evaluated design within the tolerance when the design isn't
+                cached, see DesignIndex. The near hits are in info['cache']['near']. 0 disables the lookup.
+        """
         super().__init__()
+        self.bale = bale
+        self.velocity = velocity
+        self.visualize = visualize
         self.time_step = 0
-        self.hm_resistance = np.array([np.inf])
+        self.episode = EpisodeTracker(history)
+        self.high_fidelity = HoltropMennenBackend(self.hull_input)
+        self.scheduler = None
+        if screening:
+            self.scheduler = ScreeningScheduler(MainDimensionBackend(), self.high_fidelity, margin=margin)
+        self.cache = ResultCache(cache_size) if cache_size else None
+        self.store = EvaluationStore(store) if store else None
+        self.tolerance = tolerance
+        self.neighbours = DesignIndex() if tolerance else None
+        self.timer = StageTimer(enabled=timing)
+        self.logger = TrajectoryLogger(log) if log else None
+        self.precheck = precheck
+        self.schedule = ResolutionSchedule(resolutions, milestones) if resolutions else None
+        self.full_resolution = BuildFrames.n_evalpts if self.schedule is None else self.schedule.full
+        self.resolution = self.full_resolution
+        # the frames of every step are build in the same buffer
+        self.hull_buffer = HullBuffer(BuildFrames.n_evalpts)
 
         self.action_space = Box(low=np.array([-1, -1, -1, -1, -1, -1, -1, -1]), high=np.array(
             [1, 1, 1, 1, 1, 1, 1, 1]), shape=(8,), dtype=np.float64)
@@ -43,9 +104,15 @@ class ShipEnv(gym.Env):
 
         # self.action_space = Box(low=np.array([1, 4, 3, 3, 0, 0, 0, 0]), high=np.array([100, 6, 9, 9, 20, 20, 4, 25]), shape=(8,), dtype=np.float64)
         # self.observation_space = Box(low=np.array([0, 0, 0, 0, 0, 0, 0, 0]), high=np.array([1, 1, 1, 1, 1, 1, 1, 1]), shape=(8,), dtype=np.float64)
-    def rescale_actions(self, tanh_output, low, high):
-        range = high - low
-        return tanh_output * range / 2 + (low + (0.5 * range))
+    @property
+    def hm_resistance(self) -> np.ndarray:
+        """the most recent resistances of the episode, see EpisodeTracker.recent.
+        """
+        return self.episode.recent()
+
+    # the translation of the normalized action is shared with the optimizers, see build_vessel.parameters.
+    rescale_actions = staticmethod(rescale_actions)
+    block_parameters = staticmethod(block_parameters)
 
     def step(self, action):
         """
@@ -61,36 +128,22 @@ class ShipEnv(gym.Env):
         # and also for the transom
         self.time_step += 1
 
-        from build_vessel.parameters import MainDimGenerator
-        md = MainDimGenerator(bale=BALE)
         if np.nan in action:
             print(action)
             action = np.array([0.5, 0.5, 0.5, 0.5, 0.5, 0.5, 0.5, 0.5])
-        lhold = self.rescale_actions(action[0], low=25, high=125)
-        boa = self.rescale_actions(action[1], low=2, high=7) # B/L relation
-        laft = self.rescale_actions(action[2], low=0, high=0.5) # percentage of lhold
-        lfore = self.rescale_actions(action[3], low=0, high=0.5) # percentage of lhold
-        md.action = [lhold, boa, laft, lfore]
-        md.maindim()
- 
-        self.block = Block(laft=md.laft,
-                           lhold=md.lhold,
-                           lfore=md.lfore,
-                           boa=md.boa,
-                           depth=md.depth_hold,
-                           bilge_radius=self.rescale_actions(action[6], low=0, high=4),
-                           ctrlpt_offset_forward=self.rescale_actions(action[7], low=0, high=md.lfore),
-                           transom_width=self.rescale_actions(action[4], low=0, high=md.boa),
-                           transom_height_action=self.rescale_actions(action[5],low=0,high=1),
-                           )
+        self.block = Block(**self.block_parameters(action, self.bale))
+        violations = self.block.violations()  # before check_done, which changes the draft
         cp = CtrlPts(self.block)
         done1 = self.block.check_done(action)
         done2 = False
         if self.time_step >= 100:
             done2 = True
 
-        
-        info, input_reward, observation, done3 = self.observe_resistance(cp)
+        if self.precheck and violations:
+            info, input_reward, observation, done3 = Info(), None, np.array([np.inf]), True
+        else:
+            info, input_reward, observation, done3 = self.observe_resistance()
+        info.violations = int(violations)
         info.laft = self.block.laft
         info.lhold = self.block.lhold
         info.lfore = self.block.lfore
@@ -109,20 +162,28 @@ class ShipEnv(gym.Env):
         #     ValueError("The resistance could not be calculated")
         #     return np.array([np.inf]), self.reward_function(), True, {"info": "ValueError raised: The resistance could not be calculated", "satus": "Failed!!!"}
             
-        reward = self.reward_function(input_reward)
+        # an invalid design isn't evaluated and gets the reward of a design without improvement
+        reward = -1 if input_reward is None else self.reward_function(input_reward)
         done = False
         if True in [done1, done2, done3]:
             done = True
-        return observation, reward, done, info.__dict__  # observation, reward, done, info
+        if self.logger is not None:
+            self.logger.log(self.trajectory_record(action, info, reward, done))
+        return observation, reward, done, info.as_dict()  # observation, reward, done, info
 
     def reset(self):
         # reset the reward
-        observation = self.hm_resistance
-        if len(self.hm_resistance) > 0:
-            observation = np.array(min(self.hm_resistance))
-        self.hm_resistance = np.array([np.inf])
+        observation = self.episode.reset()
+        if self.scheduler is not None:
+            self.scheduler.reset()
+        if self.store is not None:
+            self.store.flush()
         return np.array([observation])  # reward, done, info can't be included
 
+    def seed(self, seed=None):
+        self.action_space.seed(seed)
+        return [seed]
+
     def render(self, mode="human"):
         """
         This function initialize the parametric model.
@@ -138,87 +199,150 @@ class ShipEnv(gym.Env):
         This function is probably necassary to stop the learning proces
         This function should close the visualization of the ship.
         """
-        pass
-
-    def main_frames(self, ctrlpts: CtrlPts):
-        from build_vessel.waterplane import WaterPlane
-
-        transom = CrossSection(ctrlpts.cross_frames.transom)
-        self.wbfrm = CrossSection(ctrlpts.cross_frames.web_frame)
-        fpp = CrossSection(ctrlpts.cross_frames.fpp_frame)
-
-        # control points at the aft of the hold based on the web frame
-        self.hold_aft_ctrlpts = modify_control_points(
-            ctrlpts.web_frame, 0, self.block.laft)
-        hold_aft = CrossSection(self.hold_aft_ctrlpts)
-        hold_fore_ctrlpts = modify_control_points(
-            ctrlpts.web_frame, 0, (self.block.laft + self.block.lhold))
-        hold_fore = CrossSection(hold_fore_ctrlpts)
-        self.wp = WaterPlane(ctrlpts.waterlines.waterplane)
-        return transom, fpp, hold_aft, hold_fore_ctrlpts, hold_fore
-
-    def frames(self, ctrlpts: CtrlPts):
-        transom, fpp, hold_aft, hold_fore_ctrlpts, hold_fore = self.main_frames(
-            ctrlpts)
-        self.bf = BuildFrames(self.wp, self.block.laft, self.block.draft)
-        aft = self.bf.aft(
-            self.block.laft, self.hold_aft_ctrlpts, ctrlpts.transom)
-        mid = self.bf.midship(hold_aft.points, hold_fore.points)
-        fore = self.bf.forward(hold_fore.points)
-        return np.concatenate((aft, mid, fore), axis=0)
-
-    def observe_resistance(self, ctrlpts: CtrlPts):
+        if self.store is not None:
+            self.store.close()
+        if self.logger is not None:
+            self.logger.close()
+
+    def trajectory_record(self, action, info: Info, reward, done: bool) -> dict:
+        """
+        Return:
+            (dict): flat record of the step for the TrajectoryLogger.
+        """
+        record = {"episode": self.episode.episode, "step": self.episode.count, "time_step": self.time_step}
+        record.update({f"action_{i}": value for i, value in enumerate(np.asarray(action, dtype=float))})
+        record.update(self.block.as_dict())
+        record.update({key: getattr(info, key) for key in HYDROSTATICS})
+        record.update({f"resistance_{key}": value for key, value in (info.resistance or {}).items()})
+        record["violations"] = info.violations
+        record.update({f"resolution_{key}": value for key, value in (info.resolution or {}).items()})
+        record["reward"] = reward if isinstance(reward, (int, float)) else None
+        record["done"] = done
+        return record
+
+    def hull_input(self, block: Block, velocity: float, info: Info) -> HMInput:
+        """The full geometry pipeline, see evaluation.hull_input. The frames are kept for the visualisation.
+        Return:
+            hm_input: HMInput derived from the frames of the hull.
+        """
+        with self.timer.stage("ctrlpts"):
+            ctrlpts = CtrlPts(block)
+        frames = build_frames(ctrlpts, plot=self.visualize, timer=self.timer, buffer=self.hull_buffer,
+                              aft=self.visualize, resolution=self.resolution)
+        self.wbfrm, self.wp, self.bf = frames.web_frame, frames.waterplane, frames.builder
+        return hull_input(block, velocity, info, frames, timer=self.timer)
+
+    def set_training_progress(self, progress: float) -> int:
+        """Raise the resolution of the frames with the fraction of the training that is done, e.g. from a callback
+        with env_method('set_training_progress', progress), see callbacks.ResolutionCallback.
+        Return:
+            (int): the resolution of the next steps.
+        """
+        if self.schedule is None:
+            return self.full_resolution
+        return self.schedule.update(progress)
+
+    def high_fidelity_resistance(self, info: Info) -> tuple:
+        """
+        Return:
+            hm_input, resistance (tuple): of the frames of the block at the current resolution.
+        """
+        hm_input = self.high_fidelity.hm_input(self.block, self.velocity, info)
+        with self.timer.stage("holtrop_mennen"):
+            info.resistance = resistance_components(hm_input)
+        info.fidelity = self.high_fidelity.fidelity
+        return hm_input, info.resistance["total"]
+
+    def timing_summary(self) -> dict:
+        """Percentiles of the stage timings of all steps, see StageTimer.summary. With a SubprocVecEnv the summaries
+        of the workers are collected with env_method('timing_summary') and the samples with get_attr('timer').
+        """
+        return self.timer.summary()
+
+    def observe_resistance(self):
         """
         Return:
             observation: np.array
             info: Info object
             done: Bool
         """
-        from HoltropMennen import HoltropMennen
-        
-        points = self.frames(ctrlpts)
-        
-        info = Info()
-        info.c_m = self.wbfrm.cross_section_coefficient()
-        info.c_wp = self.wp.c_wp(self.block.lwl, self.block.boa)
-
-        prop = Properties(self.block.draft, len(points), info)
-        prop.memory = points, True
-        prop.area()
-        try:
-            hm_input = HMInput(lpp=self.block.lwl,
-                            B=self.block.boa * 2,
-                            t_f=self.block.draft,
-                            t_a=self.block.draft,
-                            displ=prop.volume_scipy() * 2 * 1.025,
-                            lcb=prop.lcb_ratio(self.block.lwl),
-                            c_m=self.wbfrm.cross_section_coefficient(),
-                            c_wp=self.wp.c_wp(self.block.lwl, self.block.boa),
-                            c_b=prop.block_coefficient(
-                                self.block.lwl, self.block.boa, self.block.draft),
-                            a_t=prop.transom_area,
-                            c_prism=prop.prismatic_coefficient(
-                                self.wbfrm.area, self.block.lwl),
-                            ie=prop.ie(self.block.boa, self.block.lfore),
-                            velocity=VELOCITY,
-                            )
-        except ValueError:
-            info.error = {"ValueError": "unkown error", 'state': np.inf}
-            
-            return info, "", np.array([np.inf]), True
+        self.timer.start_step()
+        cached = None
+        self.resolution = self.full_resolution if self.schedule is None else self.schedule.resolution
+        coarse_resistance = None
+        with self.timer.stage("cache"):
+            if self.cache is not None or self.store is not None:
+                key = (self.block.key(), self.velocity, self.bale)
+            if self.cache is not None:
+                cached = self.cache.get(key)
+            if cached is None and self.store is not None:
+                cached = self.store.get(EvaluationStore.key(*key, resolution=self.full_resolution))
+                if cached is not None and self.cache is not None:
+                    self.cache.put(key, cached)
+            if cached is None and self.neighbours is not None:
+                cached = self.neighbours.lookup(self.block, self.tolerance)
+        if cached is not None:
+            hm_total_res, input_reward, info_dict = cached
+            info = Info()
+            info.update(copy.deepcopy(info_dict))
+            self.resolution = self.full_resolution
+        else:
+            info = Info()
+            try:
+                if self.scheduler is None:
+                    hm_input, hm_total_res = self.high_fidelity_resistance(info)
+                else:
+                    # the screening stage includes the geometry stages of the promoted designs
+                    with self.timer.stage("screening"):
+                        hm_input, hm_total_res, info.fidelity = self.scheduler.evaluate(self.block, self.velocity,
+                                                                                        info)
+                    info.resistance = {"total": hm_total_res}
+                if (self.resolution < self.full_resolution and info.fidelity == self.high_fidelity.fidelity
+                        and hm_total_res < self.episode.best):
+                    # the reward of a new best design is computed at the full resolution
+                    coarse_resistance = hm_total_res
+                    self.resolution = self.full_resolution
+                    self.schedule.n_reevaluated += 1
+                    info = Info()
+                    hm_input, hm_total_res = self.high_fidelity_resistance(info)
+            except ValueError:
+                info.error = {"ValueError": "unkown error", 'state': np.inf}
+
+                return info, "", np.array([np.inf]), True
+            input_reward = hm_input.reward_correct_input
+            # only the full evaluations are cached, a screened design can still be promoted later.
+            if info.fidelity == self.high_fidelity.fidelity and self.resolution == self.full_resolution:
+                if self.cache is not None:
+                    self.cache.put(key, (hm_total_res, input_reward, copy.deepcopy(info.as_dict())))
+                if self.neighbours is not None:
+                    self.neighbours.add(self.block, (hm_total_res, input_reward, copy.deepcopy(info.as_dict())))
+                if self.store is not None:
+                    self.store.put(EvaluationStore.key(*key, resolution=self.full_resolution), hm_total_res,
+                                   input_reward, {k: v for k, v in info.as_dict().items()
+                                                  if k not in ("screening", "cache", "timing", "resolution")})
+        if self.schedule is not None:
+            # a screened design is evaluated without frames
+            evaluated = self.resolution if info.fidelity == self.high_fidelity.fidelity else None
+            info.resolution = {**self.schedule.stats(), "evaluated": evaluated, "coarse_resistance": coarse_resistance}
+        if self.scheduler is not None:
+            info.screening = self.scheduler.stats()
+        if self.cache is not None:
+            info.cache = self.cache.stats()
+        if self.neighbours is not None:
+            info.cache = {**(info.cache or {}), "near": self.neighbours.stats()}
+        if self.timer.enabled:
+            info.timing = dict(self.timer.last)
 
-        self.hm_res = HoltropMennen(hm_input)
-        hm_total_res = self.hm_res.total_resistance()
         print(f"{hm_total_res = :.2f}")
-        self.hm_resistance = np.append(self.hm_resistance, hm_total_res)
-        return info, hm_input.reward_correct_input, np.array([hm_total_res]), False
+        self.episode.add(hm_total_res)
+        return info, input_reward, np.array([hm_total_res]), False
 
     def reward_function(self, input_reward):
         reward = input_reward
-        if len(self.hm_resistance) > 1:
-            if self.hm_resistance[-1] < 0:
+        if self.episode.count > 0:
+            if self.episode.last < 0:
                 reward += -2
-            if self.hm_resistance[-1] < np.min(self.hm_resistance[:-1]):
+            if self.episode.improved:
                 reward += 1
             else:
                 return -1
@@ -226,7 +350,7 @@ class ShipEnv(gym.Env):
 
 
 def main_1():
-    env = ShipEnv()
+    env = ShipEnv(visualize=True)
     episodes = 20
     for episode in range(1, episodes+1):
         state = env.reset()
@@ -257,7 +381,7 @@ def main_1():
 def main_2():
     from build_vessel.parameters import Block
     
-    env = ShipEnv()
+    env = ShipEnv(visualize=True)
     
     env.block = Block(laft=30,
                   lhold=150,
@@ -268,15 +392,16 @@ def main_2():
                   ctrlpt_offset_forward=7,
                   transom_width=14,
                   transom_height_action=0.8)
-    cp = CtrlPts(env.block)
-    points = env.frames(cp)
-    info, reward, state, done = env.observe_resistance(cp)
+    info, reward, state, done = env.observe_resistance()
     
     print(f"resistance: {state}")    
-    for key, value in info.__dict__.items():
+    for key, value in info.as_dict().items():
         print(f"{key}: {value}")
 
     env.bf.visualize()
 
 if __name__ == "__main__":
+    import logging
+    logging.basicConfig(filename='vessel_env.log', level=logging.INFO, format='%(asctime)s %(message)s',
+                        datefmt='%m/%d/%Y %I:%M:%S %p')
     main_1()
\ No newline at end of file
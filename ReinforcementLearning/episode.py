@@ -0,0 +1,84 @@
+"""
+Streaming statistics of the resistances of an episode.
+
+The tracker keeps the running minimum, the running mean and standard deviation (Welford) and a ring buffer with the
+most recent resistances, so adding a resistance and computing the reward are O(1) whatever the length of the
+episode. The full trajectory can be exported to a sink, e.g. the log method of a trajectory logger, instead of kept
+in memory.
+"""
+import numpy as np
+
+
+class EpisodeTracker:
+    """
+    Arg:
+        maxlen (int): number of recent resistances kept in the ring buffer.
+        sink (callable): called with a dict of episode, step and resistance for every resistance.
+    """
+    def __init__(self, maxlen: int = 100, sink=None) -> None:
+        self.maxlen = maxlen
+        self.sink = sink
+        self._buffer = np.empty(maxlen)
+        self.episode = 0
+        self._clear()
+
+    def _clear(self) -> None:
+        self.count = 0
+        self.last = np.inf
+        self.best = np.inf
+        self.previous_best = np.inf
+        self.maximum = -np.inf
+        self.mean = 0.0
+        self._m2 = 0.0
+
+    def reset(self) -> float:
+        """Start a new episode.
+        Return:
+            (float): lowest resistance of the finished episode, inf when no resistance was added.
+        """
+        best = self.best
+        if self.count:
+            self.episode += 1
+        self._clear()
+        return best
+
+    def add(self, resistance: float) -> None:
+        resistance = float(resistance)
+        self._buffer[self.count % self.maxlen] = resistance
+        self.count += 1
+        self.last = resistance
+        self.previous_best = self.best
+        # like np.min, a nan is kept as the minimum
+        if resistance < self.best or resistance != resistance:
+            self.best = resistance
+        self.maximum = max(self.maximum, resistance)
+        delta = resistance - self.mean
+        self.mean += delta / self.count
+        self._m2 += delta * (resistance - self.mean)
+        if self.sink is not None:
+            self.sink({"episode": self.episode, "step": self.count, "resistance": resistance})
+
+    @property
+    def improved(self) -> bool:
+        """the last resistance is lower than all resistances before it in the episode.
+        """
+        return self.last < self.previous_best
+
+    @property
+    def std(self) -> float:
+        if self.count < 2:
+            return 0.0
+        return float(np.sqrt(self._m2 / (self.count - 1)))
+
+    def recent(self) -> np.ndarray:
+        """
+        Return:
+            (np.ndarray): the resistances in the ring buffer, the oldest first.
+        """
+        if self.count <= self.maxlen:
+            return self._buffer[:self.count].copy()
+        start = self.count % self.maxlen
+        return np.concatenate((self._buffer[start:], self._buffer[:start]))
+
+    def stats(self) -> dict:
+        return {"count": self.count, "min": self.best, "max": self.maximum, "mean": self.mean, "std": self.std}
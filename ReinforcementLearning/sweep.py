@@ -0,0 +1,207 @@
+"""
+Sweep over algorithms, hyperparameters and seeds.
+
+The runs of a grid or random search are scheduled on a process pool. Every run writes its config, model, metrics
+and throughput to its own directory; the metrics are written last, so a run with metrics is complete. Starting the
+sweep again skips the complete runs, which makes the sweep resumable after an interruption.
+
+spec.json:
+    {"algorithms": {"PPO": {"learning_rate": [0.0003, 0.001], "n_steps": [128, 256]},
+                    "SAC": {"learning_rate": {"low": 0.0001, "high": 0.001, "log": true}}},
+     "seeds": [0, 1, 2],
+     "search": "grid",           grid or random
+     "n_samples": 10,            hyperparameter samples per algorithm of a random search
+     "total_timesteps": 10000,
+     "episode_length": 25,
+     "n_envs": 1,                environments per run, evaluated in one process with BatchShipEnv when > 1, or in a
+                                 SubprocVecEnv when env has options of ShipEnv which BatchShipEnv doesn't take
+     "env": {"bale": 8000, "velocity": 12}}
+
+usage:
+    python sweep.py spec.json --output "Training/Sweeps/ppo_vs_sac" --workers 4
+"""
+import argparse
+import hashlib
+import inspect
+import io
+import itertools
+import json
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from contextlib import redirect_stdout
+from pathlib import Path
+import numpy as np
+
+DEFAULTS = {"search": "grid", "n_samples": 10, "seeds": [0], "total_timesteps": 10000, "episode_length": 25,
+            "n_envs": 1, "env": {}}
+
+
+def _sample(value, rng: np.random.Generator):
+    """a list is a choice, a dict with low and high a uniform or log uniform distribution, else a constant.
+    """
+    if isinstance(value, list):
+        return value[rng.integers(len(value))]
+    if isinstance(value, dict):
+        if value.get("log"):
+            return float(np.exp(rng.uniform(np.log(value["low"]), np.log(value["high"]))))
+        return float(rng.uniform(value["low"], value["high"]))
+    return value
+
+
+def _grid(hyperparameters: dict) -> list:
+    names = list(hyperparameters)
+    values = [value if isinstance(value, list) else [value] for value in hyperparameters.values()]
+    return [dict(zip(names, combination)) for combination in itertools.product(*values)]
+
+
+def expand(spec: dict) -> list:
+    """
+    Arg:
+        spec (dict): the sweep, see the module docstring.
+    Return:
+        (list[dict]): one config per run with the run id, algorithm, hyperparameters and seed.
+    """
+    spec = {**DEFAULTS, **spec}
+    rng = np.random.default_rng(spec.get("search_seed", 0))
+    runs = []
+    for algorithm, hyperparameters in spec["algorithms"].items():
+        if spec["search"] == "grid":
+            combinations = _grid(hyperparameters)
+        elif spec["search"] == "random":
+            combinations = [{name: _sample(value, rng) for name, value in hyperparameters.items()}
+                            for _ in range(spec["n_samples"])]
+        else:
+            raise ValueError("search should be 'grid' or 'random'")
+        for combination, seed in itertools.product(combinations, spec["seeds"]):
+            config = {"algorithm": algorithm, "hyperparameters": combination, "seed": seed,
+                      "total_timesteps": spec["total_timesteps"], "episode_length": spec["episode_length"],
+                      "n_envs": spec["n_envs"], "env": spec["env"]}
+            config["run_id"] = run_id(config)
+            runs.append(config)
+    return runs
+
+
+def run_id(config: dict) -> str:
+    """Readable and unique name of the run, equal configs give the same name.
+    """
+    settings = json.dumps({key: config[key] for key in sorted(config) if key != "run_id"}, sort_keys=True)
+    return f"{config['algorithm']}_{hashlib.sha1(settings.encode()).hexdigest()[:8]}_seed{config['seed']}"
+
+
+def is_complete(directory: Path) -> bool:
+    return (directory / "metrics.json").exists()
+
+
+def algorithm_class(name: str):
+    import stable_baselines3
+    return getattr(stable_baselines3, name)
+
+
+def batched(config: dict) -> bool:
+    """whether the environments of a run are evaluated with BatchShipEnv, which takes only some of the options of
+    ShipEnv, see BatchEpisodes.
+    """
+    from batch_episodes import BatchEpisodes
+
+    return config["n_envs"] > 1 and set(config["env"]) <= set(inspect.signature(BatchEpisodes).parameters)
+
+
+def train(config: dict, output: str) -> dict:
+    """Train one run in the worker, the model and the metrics are written to output/run_id.
+    Return:
+        (dict): metrics of the run.
+    """
+    from stable_baselines3.common.vec_env import VecMonitor
+    from vec_env import make_vec_env
+
+    directory = Path(output) / config["run_id"]
+    directory.mkdir(parents=True, exist_ok=True)
+    with open(directory / "config.json", "w") as f:
+        json.dump(config, f, indent=2)
+
+    env = VecMonitor(make_vec_env(config["n_envs"], seed=config["seed"], episode_length=config["episode_length"],
+                                  batched=batched(config), **config["env"]))
+    model = algorithm_class(config["algorithm"])("MlpPolicy", env, seed=config["seed"], verbose=0,
+                                                 **config["hyperparameters"])
+    with redirect_stdout(io.StringIO()):
+        start = time.perf_counter()
+        model.learn(total_timesteps=config["total_timesteps"])
+        elapsed = time.perf_counter() - start
+    model.save(directory / "model")
+    env.close()
+
+    rewards = [info["r"] for info in model.ep_info_buffer]
+    metrics = {"run_id": config["run_id"], "algorithm": config["algorithm"], "seed": config["seed"],
+               "timesteps": model.num_timesteps, "wall_clock": elapsed,
+               "steps_per_second": model.num_timesteps / elapsed,
+               "episodes": len(rewards), "mean_reward": float(np.mean(rewards)) if rewards else None,
+               "max_reward": float(np.max(rewards)) if rewards else None}
+    tmp = directory / "metrics.json.tmp"
+    with open(tmp, "w") as f:
+        json.dump(metrics, f, indent=2)
+    os.replace(tmp, directory / "metrics.json")
+    return metrics
+
+
+def run_sweep(spec: dict, output: str, workers: int = None, trainer=train) -> list:
+    """
+    Arg:
+        output (str): directory of the sweep, every run gets a sub directory.
+        workers (int): size of the process pool, defaults to the number of cores divided by n_envs.
+        trainer (callable): trainer(config, output) -> metrics, runs in the worker.
+    Return:
+        (list[dict]): metrics of the runs completed in this call.
+    """
+    runs = [config for config in expand(spec) if not is_complete(Path(output) / config["run_id"])]
+    if workers is None:
+        workers = max(1, (os.cpu_count() or 1) // {**DEFAULTS, **spec}["n_envs"])
+    Path(output).mkdir(parents=True, exist_ok=True)
+    with open(Path(output) / "spec.json", "w") as f:
+        json.dump(spec, f, indent=2)
+
+    completed = []
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        futures = {pool.submit(trainer, config, output): config for config in runs}
+        for future in as_completed(futures):
+            config = futures[future]
+            try:
+                metrics = future.result()
+            except Exception as error:
+                # the run is retried when the sweep is started again
+                print(f"{config['run_id']} failed: {error!r}")
+                continue
+            completed.append(metrics)
+            print(f"{metrics['run_id']}: mean reward {metrics['mean_reward']}, "
+                  f"{metrics['steps_per_second']:.1f} steps/s ({len(completed)}/{len(runs)})")
+    return completed
+
+
+def collect(output: str) -> list:
+    """
+    Return:
+        (list[dict]): metrics of all complete runs of the sweep.
+    """
+    metrics = []
+    for path in sorted(Path(output).glob("*/metrics.json")):
+        with open(path) as f:
+            metrics.append(json.load(f))
+    return metrics
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("spec", help="json file of the sweep")
+    parser.add_argument("--output", default=os.path.join("Training", "Sweeps", "sweep"))
+    parser.add_argument("--workers", type=int, default=None)
+    args = parser.parse_args()
+
+    with open(args.spec) as f:
+        spec = json.load(f)
+    run_sweep(spec, args.output, args.workers)
+    for metrics in sorted(collect(args.output), key=lambda m: -(m["mean_reward"] or -np.inf)):
+        print(f"{metrics['run_id']:<40} mean reward {metrics['mean_reward']}  {metrics['steps_per_second']:.1f} steps/s")
+
+
+if __name__ == "__main__":
+    main()
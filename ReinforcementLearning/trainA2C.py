@@ -1,23 +1,23 @@
-from enviroment import ShipEnv
+from vec_env import make_vec_env
 from stable_baselines3 import A2C
-from stable_baselines3.common.vec_env import DummyVecEnv
 import os
-from gym.wrappers.time_limit import TimeLimit
 
 
 time_steps = 100
 episode_length = 25
+n_envs = os.cpu_count()
 
 
-env = ShipEnv()
-env = DummyVecEnv([lambda: TimeLimit(env=env, max_episode_steps=episode_length)]) # wrapping
+if __name__ == '__main__':
+    env = make_vec_env(n_envs, episode_length=episode_length)
 
-model = A2C('MlpPolicy', env, verbose = 2, normalize_advantage=True)
-try:
-    model.learn(total_timesteps=time_steps, log_interval=2 ,progress_bar=True)
-except ValueError:
-    print('ValueError')
-    print(model.get_parameters())
-A2C_path = os.path.join('Training', 'Saved Models', 'A2Cv1')
+    model = A2C('MlpPolicy', env, verbose = 2, normalize_advantage=True)
+    try:
+        model.learn(total_timesteps=time_steps, log_interval=2 ,progress_bar=True)
+    except ValueError:
+        print('ValueError')
+        print(model.get_parameters())
+    A2C_path = os.path.join('Training', 'Saved Models', 'A2Cv1')
 
-model.save(A2C_path)
+    model.save(A2C_path)
+    env.close()
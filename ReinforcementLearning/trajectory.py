@@ -0,0 +1,128 @@
+"""
+Columnar log of every step of the environment.
+
+The records are collected in batches, a background thread writes every batch as a part file with one array per
+column. The queue between the environment and the thread is bounded; when the disk can't keep up the batch is dropped
+and counted instead of stalling the environment, unless block is True.
+
+usage:
+    logger = TrajectoryLogger("Training/Logs/run_0")
+    logger.log({"step": 1, "reward": 9.0, ...})
+    logger.close()
+
+    df = load_trajectories("Training/Logs/run_*")
+"""
+import glob
+import os
+import queue
+import threading
+from pathlib import Path
+import numpy as np
+
+
+def _column(values: list) -> np.ndarray:
+    """numeric columns get nan for missing values, other columns are stored as strings.
+    """
+    if any(isinstance(value, str) for value in values):
+        return np.asarray(["" if value is None else str(value) for value in values])
+    column = np.asarray([np.nan if value is None else value for value in values])
+    if column.dtype == object:
+        column = column.astype(str)
+    return column
+
+
+class TrajectoryLogger:
+    """
+    Arg:
+        path (str): directory of the part files, created when it doesn't exist. A new logger continues the numbering
+            of the existing parts.
+        batch_size (int): number of records per part file.
+        max_batches (int): number of batches waiting to be written.
+        block (bool): wait for the writer when the queue is full instead of dropping the batch.
+    """
+    def __init__(self, path: str, batch_size: int = 4096, max_batches: int = 8, block: bool = False) -> None:
+        self.path = Path(path)
+        self.path.mkdir(parents=True, exist_ok=True)
+        self.batch_size = batch_size
+        self.block = block
+        self.dropped = 0
+        self.written = 0
+        self._records = []
+        self._part = len(list(self.path.glob("part-*.npz")))
+        self._queue = queue.Queue(max_batches)
+        self._thread = threading.Thread(target=self._write, daemon=True)
+        self._thread.start()
+
+    def log(self, record: dict) -> None:
+        self._records.append(record)
+        if len(self._records) >= self.batch_size:
+            self._submit()
+
+    def _submit(self, block: bool = None) -> None:
+        if not self._records:
+            return
+        records, self._records = self._records, []
+        names = dict.fromkeys(name for record in records for name in record)
+        columns = {name: _column([record.get(name) for record in records]) for name in names}
+        try:
+            self._queue.put(columns, block=self.block if block is None else block)
+        except queue.Full:
+            self.dropped += len(records)
+
+    def _write(self) -> None:
+        while True:
+            columns = self._queue.get()
+            try:
+                if columns is None:
+                    return
+                name = f"part-{self._part:06d}.npz"
+                tmp = self.path / f"tmp-{name}"
+                np.savez(tmp, **columns)
+                # the part appears complete or not at all
+                os.replace(tmp, self.path / name)
+                self._part += 1
+                self.written += len(next(iter(columns.values())))
+            finally:
+                self._queue.task_done()
+
+    def flush(self) -> None:
+        """Submit the collected records and wait until all batches are written.
+        """
+        self._submit(block=True)
+        self._queue.join()
+
+    def close(self) -> None:
+        if not self._thread.is_alive():
+            return
+        self._submit(block=True)
+        self._queue.put(None)
+        self._thread.join()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+
+def load_trajectories(pattern: str, columns: list = None):
+    """
+    Arg:
+        pattern (str): directory of a logger or a glob pattern of directories, e.g. the directories of the workers.
+        columns (list): load only these columns.
+    Return:
+        (pandas.DataFrame): the records of all part files.
+    """
+    import pandas as pd
+
+    frames = []
+    for directory in sorted(glob.glob(pattern)):
+        for part in sorted(Path(directory).glob("part-*.npz")):
+            with np.load(part) as data:
+                names = data.files if columns is None else [name for name in columns if name in data.files]
+                frame = pd.DataFrame({name: data[name] for name in names})
+            frame["source"] = directory
+            frames.append(frame)
+    if not frames:
+        return pd.DataFrame(columns=columns)
+    return pd.concat(frames, ignore_index=True)
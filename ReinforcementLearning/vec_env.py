@@ -0,0 +1,58 @@
+"""
+Environment factory for training with multiple workers.
+
+Every worker of a SubprocVecEnv constructs its own ShipEnv, so the geometry pipeline of the workers runs on
+separate cores. The scripts that use SubprocVecEnv must create the environment under `if __name__ == '__main__':`,
+because the workers are started with spawn on Windows.
+
+Sources:
+    https://stable-baselines3.readthedocs.io/en/master/guide/vec_envs.html
+"""
+import os
+from gym.wrappers.time_limit import TimeLimit
+from stable_baselines3.common.vec_env import DummyVecEnv, SubprocVecEnv
+from enviroment import ShipEnv
+
+
+def make_env(rank: int, seed: int = 0, episode_length: int = 25, **env_kwargs):
+    """
+    Arg:
+        rank (int): index of the worker, the environment is seeded with seed + rank.
+        seed (int): seed of the first worker.
+        episode_length (int): maximum number of steps of an episode.
+        env_kwargs: passed to ShipEnv, a log directory gets the suffix _rank.
+    Return:
+        _init (callable): constructs the environment inside the worker.
+    """
+    if env_kwargs.get("log"):
+        # every worker logs to its own directory
+        env_kwargs = dict(env_kwargs, log=f"{env_kwargs['log']}_{rank}")
+
+    def _init():
+        env = TimeLimit(env=ShipEnv(**env_kwargs), max_episode_steps=episode_length)
+        env.seed(seed + rank)
+        return env
+    return _init
+
+
+def make_vec_env(n_envs: int = None, seed: int = 0, episode_length: int = 25, start_method: str = None,
+                 batched: bool = False, **env_kwargs):
+    """
+    Arg:
+        n_envs (int): number of workers, defaults to the number of cores.
+        start_method (str): 'spawn', 'fork' or 'forkserver', see SubprocVecEnv.
+        batched (bool): evaluate the n_envs hulls in one process with BatchShipEnv.
+    Return:
+        vec_env: DummyVecEnv for one worker, otherwise SubprocVecEnv or BatchShipEnv.
+    """
+    if n_envs is None:
+        n_envs = os.cpu_count()
+    if batched:
+        from batch_env import BatchShipEnv
+        vec_env = BatchShipEnv(n_envs, episode_length=episode_length, **env_kwargs)
+        vec_env.seed(seed)
+        return vec_env
+    env_fns = [make_env(rank, seed, episode_length, **env_kwargs) for rank in range(n_envs)]
+    if n_envs == 1:
+        return DummyVecEnv(env_fns)
+    return SubprocVecEnv(env_fns, start_method=start_method)
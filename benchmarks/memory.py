@@ -0,0 +1,137 @@
+"""
+Memory harness for long training runs.
+
+Runs ShipEnv for thousands of steps and samples the resident set size and the memory traced by tracemalloc. After a
+warm up the growth per step is measured and the allocation sites that grew the most are reported. The exit status
+is 1 when the growth per step exceeds the budget, so a leak in the geometry or the environment is caught before a
+run of several days.
+
+usage:
+    python -m benchmarks.memory --steps 2000 --budget 512 --output memory.csv
+"""
+import argparse
+import csv
+import io
+import os
+import sys
+import tracemalloc
+from contextlib import redirect_stdout
+from pathlib import Path
+import numpy as np
+
+ROOT = Path(__file__).parents[1]
+sys.path.insert(0, str(ROOT / "ReinforcementLearning"))
+
+
+def rss() -> int:
+    """Resident set size of the process in bytes, 0 when it can't be read.
+    """
+    try:
+        import psutil
+        return psutil.Process().memory_info().rss
+    except ImportError:
+        pass
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError, AttributeError):
+        return 0
+
+
+def measure(step, n_steps: int, warmup: int = 100, interval: int = 100, top: int = 10, frames: int = 1) -> dict:
+    """
+    Arg:
+        step (callable): step(i) runs the i-th step.
+        warmup (int): steps before the reference snapshot, the caches and buffers fill up in these steps.
+        interval (int): steps between the samples.
+        top (int): number of allocation sites reported.
+        frames (int): frames of the traceback stored by tracemalloc, more frames are slower.
+    Return:
+        (dict): samples, growth per step of the traced memory and the rss in bytes and the allocation sites.
+    """
+    tracing = tracemalloc.is_tracing()
+    if not tracing:
+        tracemalloc.start(frames)
+    samples = []
+    try:
+        reference = None
+        for i in range(n_steps):
+            step(i)
+            if i + 1 == warmup:
+                reference = tracemalloc.take_snapshot()
+            if (i + 1) % interval == 0 or i + 1 == n_steps:
+                traced, peak = tracemalloc.get_traced_memory()
+                samples.append({"step": i + 1, "traced": traced, "peak": peak, "rss": rss()})
+        final = tracemalloc.take_snapshot()
+    finally:
+        if not tracing:
+            tracemalloc.stop()
+
+    measured = [s for s in samples if s["step"] >= warmup]
+    growth = {"traced": 0.0, "rss": 0.0}
+    if len(measured) > 1:
+        steps = np.array([s["step"] for s in measured], dtype=float)
+        for name in growth:
+            growth[name] = float(np.polyfit(steps, [s[name] for s in measured], 1)[0])
+    sites = []
+    if reference is not None:
+        for stat in final.compare_to(reference, "lineno")[:top]:
+            frame = stat.traceback[0]
+            sites.append({"site": f"{frame.filename}:{frame.lineno}", "size_diff": stat.size_diff,
+                          "count_diff": stat.count_diff})
+    return {"samples": samples, "bytes_per_step": growth["traced"], "rss_per_step": growth["rss"], "sites": sites}
+
+
+def env_stepper(episode_length: int = 25, seed: int = 0, **env_kwargs):
+    """
+    Return:
+        step (callable): steps a ShipEnv with seeded random actions and resets it every episode_length steps.
+    """
+    from enviroment import ShipEnv
+
+    env = ShipEnv(**env_kwargs)
+    env.seed(seed)
+    rng = np.random.default_rng(seed)
+
+    def step(i: int) -> None:
+        with redirect_stdout(io.StringIO()):
+            if i % episode_length == 0:
+                env.reset()
+            env.step(rng.uniform(-1, 1, env.action_space.shape))
+    return step
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--steps", type=int, default=2000)
+    parser.add_argument("--warmup", type=int, default=200)
+    parser.add_argument("--interval", type=int, default=100)
+    parser.add_argument("--budget", type=float, default=512, help="allowed growth of the traced memory, bytes per step")
+    parser.add_argument("--episode-length", type=int, default=25)
+    parser.add_argument("--cache-size", type=int, default=0, help="the cache grows by design, disabled by default")
+    parser.add_argument("--top", type=int, default=10)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--output", default=None, help="csv file for the samples")
+    args = parser.parse_args()
+
+    step = env_stepper(args.episode_length, args.seed, cache_size=args.cache_size)
+    report = measure(step, args.steps, args.warmup, args.interval, args.top)
+
+    for sample in report["samples"]:
+        print(f"step {sample['step']:>7}  traced {sample['traced'] / 2 ** 20:8.2f} MiB  "
+              f"rss {sample['rss'] / 2 ** 20:8.2f} MiB")
+    print(f"growth: traced {report['bytes_per_step']:.1f} B/step, rss {report['rss_per_step']:.1f} B/step")
+    for site in report["sites"]:
+        print(f"{site['size_diff']:>+12} B {site['count_diff']:>+8} blocks  {site['site']}")
+    if args.output:
+        with open(args.output, "w", newline="") as f:
+            writer = csv.DictWriter(f, fieldnames=report["samples"][0].keys())
+            writer.writeheader()
+            writer.writerows(report["samples"])
+    if report["bytes_per_step"] > args.budget:
+        print(f"memory per step exceeds the budget of {args.budget} B")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,103 @@
+"""
+Convergence of the design optimizers and of the reinforcement learning agents.
+
+Every optimizer runs with the same budget of evaluations for a number of seeds. The agents are read from the
+trajectory logs of training runs (ShipEnv(log=...)), where every step is one evaluation. The benchmark reports the
+best resistance and the number of evaluations until the target was reached. The target defaults to the best
+resistance of all runs plus the tolerance.
+
+usage:
+    python -m benchmarks.optimizers --evaluations 2000 --seeds 0 1 2 --output optimizers.json
+    python -m benchmarks.optimizers --trajectories "ReinforcementLearning/Training/Logs/sac_*"
+"""
+import argparse
+import json
+import sys
+from pathlib import Path
+import numpy as np
+from optimization import OPTIMIZERS, BatchObjective, evaluations_to_target
+
+
+def optimizer_traces(names: list, seeds: list, max_evaluations: int, bale: float, velocity: float,
+                     workers: int = 0) -> dict:
+    """
+    Return:
+        (dict): per method a list with the trace of every seed.
+    """
+    traces = {}
+    for name in names:
+        traces[name] = []
+        for seed in seeds:
+            with BatchObjective(bale, velocity, workers=workers) as objective:
+                # a Gaussian process doesn't scale to thousands of evaluations
+                budget = min(max_evaluations, 300) if name == "bayesian" else max_evaluations
+                result = OPTIMIZERS[name](objective, max_evaluations=budget, seed=seed)
+            traces[name].append(result.trace)
+    return traces
+
+
+def agent_traces(pattern: str) -> list:
+    """
+    Arg:
+        pattern (str): glob pattern of the log directories of the agents.
+    Return:
+        (list): trace of every log directory, one evaluation per step.
+    """
+    sys.path.insert(0, str(Path(__file__).parents[1] / "ReinforcementLearning"))
+    from trajectory import load_trajectories
+
+    df = load_trajectories(pattern, columns=["resistance_total"])
+    traces = []
+    for _, run in df.groupby("source", sort=True):
+        resistance = run["resistance_total"].to_numpy(dtype=float)
+        resistance = np.where(np.isfinite(resistance) & (resistance >= 0), resistance, np.inf)
+        best = np.minimum.accumulate(resistance)
+        traces.append([(i + 1, float(value)) for i, value in enumerate(best)])
+    return traces
+
+
+def summarize(traces: dict, target: float) -> dict:
+    summary = {}
+    for name, runs in traces.items():
+        best = [trace[-1][1] for trace in runs if trace]
+        to_target = [evaluations_to_target(trace, target) for trace in runs]
+        reached = [n for n in to_target if n is not None]
+        summary[name] = {"runs": len(runs), "best": float(np.min(best)) if best else None,
+                         "median_best": float(np.median(best)) if best else None,
+                         "reached_target": len(reached),
+                         "median_evaluations_to_target": float(np.median(reached)) if reached else None}
+    return summary
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--optimizers", nargs="+", default=list(OPTIMIZERS), choices=list(OPTIMIZERS))
+    parser.add_argument("--evaluations", type=int, default=2000, help="budget of every optimizer run")
+    parser.add_argument("--seeds", type=int, nargs="+", default=[0, 1, 2])
+    parser.add_argument("--bale", type=float, default=8000)
+    parser.add_argument("--velocity", type=float, default=12)
+    parser.add_argument("--workers", type=int, default=0)
+    parser.add_argument("--trajectories", default=None, help="glob pattern of the trajectory logs of the agents")
+    parser.add_argument("--target", type=float, default=None, help="resistance [kN] to reach")
+    parser.add_argument("--tolerance", type=float, default=0.01, help="target relative to the best of all runs")
+    parser.add_argument("--output", default="optimizers.json")
+    args = parser.parse_args()
+
+    traces = optimizer_traces(args.optimizers, args.seeds, args.evaluations, args.bale, args.velocity, args.workers)
+    if args.trajectories:
+        traces["agents"] = agent_traces(args.trajectories)
+    target = args.target
+    if target is None:
+        target = (1 + args.tolerance) * min(trace[-1][1] for runs in traces.values() for trace in runs if trace)
+    summary = summarize(traces, target)
+
+    print(f"target {target:.2f} kN")
+    for name, row in summary.items():
+        print(f"{name:<24} best {row['best']:10.2f}  reached {row['reached_target']}/{row['runs']}  "
+              f"evaluations to target {row['median_evaluations_to_target']}")
+    with open(args.output, "w") as f:
+        json.dump({"target": target, "summary": summary, "traces": traces}, f)
+
+
+if __name__ == "__main__":
+    main()
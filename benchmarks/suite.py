@@ -0,0 +1,190 @@
+"""
+Benchmark suite of the geometry and resistance pipeline.
+
+Every stage is timed for a set of reference designs from a 44 m coaster to a 300 m hull, and ShipEnv.step is timed
+with seeded random actions. The results are written to a json file, which can be passed as the baseline of a later
+run. A stage that is slower than the baseline by more than the tolerance is a regression and the exit status is 1.
+
+usage:
+    python -m benchmarks.suite --output main.json
+    python -m benchmarks.suite --output branch.json --baseline main.json --tolerance 0.25
+"""
+import argparse
+import io
+import json
+import platform
+import subprocess
+import sys
+import time
+import timeit
+from contextlib import redirect_stdout
+from pathlib import Path
+import numpy as np
+
+ROOT = Path(__file__).parents[1]
+sys.path.insert(0, str(ROOT / "ReinforcementLearning"))
+
+from HoltropMennen import HoltropMennen
+from build_vessel.aft_body import AftBody
+from build_vessel.cross_section import CrossSection, BuildFrames
+from build_vessel.parameters import Block, CtrlPts
+from build_vessel.properties import Properties, Info
+from build_vessel.utils import modify_control_points
+from evaluation import build_frames, hull_input
+
+REFERENCE_DESIGNS = {
+    "coaster_44m": dict(laft=6, lhold=30, lfore=8, boa=4, depth=5, bilge_radius=1, ctrlpt_offset_forward=2,
+                        transom_width=3, transom_height_action=0.5),
+    "feeder_112m": dict(laft=12, lhold=80, lfore=20, boa=8, depth=12, bilge_radius=2, ctrlpt_offset_forward=5,
+                        transom_width=6, transom_height_action=0.5),
+    "handysize_170m": dict(laft=20, lhold=120, lfore=30, boa=12, depth=16, bilge_radius=2.5, ctrlpt_offset_forward=8,
+                           transom_width=10, transom_height_action=0.6),
+    "panamax_240m": dict(laft=30, lhold=170, lfore=40, boa=16, depth=20, bilge_radius=3, ctrlpt_offset_forward=10,
+                         transom_width=13, transom_height_action=0.6),
+    "capesize_300m": dict(laft=40, lhold=210, lfore=50, boa=22, depth=25, bilge_radius=3, ctrlpt_offset_forward=12,
+                          transom_width=18, transom_height_action=0.7),
+}
+VELOCITY = 12
+
+
+def seconds_per_call(func, repeat: int = 5) -> float:
+    """Best of repeat runs, each run calls func for at least 0.2 seconds.
+    """
+    timer = timeit.Timer(func)
+    number, _ = timer.autorange()
+    return min(timer.repeat(repeat=repeat, number=number)) / number
+
+
+def design_benchmarks(design: dict) -> dict:
+    """
+    Return:
+        (dict): name of the stage and a callable which runs the stage once.
+    """
+    block = Block(**design)
+    ctrlpts = CtrlPts(block)
+    frames = build_frames(ctrlpts)
+    hold_aft_ctrlpts = modify_control_points(ctrlpts.web_frame, 0, block.laft)
+    hold_fore_points = CrossSection(modify_control_points(ctrlpts.web_frame, 0, block.laft + block.lhold)).points
+    builder = BuildFrames(frames.waterplane, block.laft, block.draft)
+
+    def properties() -> Properties:
+        points = frames.points[frames.n_aft:]
+        return Properties(block.draft, len(points), Info(), memory=points, aft_body=frames.aft_body, segments=(1,))
+
+    prop = properties()
+    prop.area()
+
+    def derived():
+        prop.volume()
+        prop.lcb_ratio(block.lwl)
+        prop.block_coefficient(block.lwl, block.boa, block.draft)
+        prop.prismatic_coefficient(frames.web_frame.area, block.lwl)
+        frames.web_frame.cross_section_coefficient()
+        frames.waterplane.c_wp(block.lwl, block.boa)
+
+    hm_input = hull_input(block, VELOCITY, Info(), frames)
+    return {"control_points": lambda: CtrlPts(block),
+            "cross_section_points": lambda: CrossSection(ctrlpts.cross_frames.web_frame).points,
+            "build_frames_aft": lambda: builder.aft(block.laft, hold_aft_ctrlpts, ctrlpts.transom),
+            "build_frames_forward": lambda: builder.forward(hold_fore_points),
+            "aft_body": lambda: AftBody.from_ctrlpts(ctrlpts),
+            "properties_area": lambda: properties().area(),
+            "derived_quantities": derived,
+            "holtrop_mennen": lambda: HoltropMennen(hm_input).total_resistance(),
+            "hull_input": lambda: hull_input(block, VELOCITY, Info()),
+            }
+
+
+def env_step(n_steps: int, seed: int) -> float:
+    """
+    Return:
+        (float): seconds per ShipEnv.step with seeded random actions and without the cache.
+    """
+    from enviroment import ShipEnv
+
+    env = ShipEnv(cache_size=0)
+    env.seed(seed)
+    actions = np.random.default_rng(seed).uniform(-1, 1, size=(n_steps,) + env.action_space.shape)
+    with redirect_stdout(io.StringIO()):
+        env.reset()
+        start = time.perf_counter()
+        for action in actions:
+            env.step(action)
+        elapsed = time.perf_counter() - start
+    env.close()
+    return elapsed / n_steps
+
+
+def run(designs: list = None, n_steps: int = 50, seed: int = 0, repeat: int = 5) -> dict:
+    """
+    Return:
+        (dict): meta data of the run and the seconds per call of every benchmark.
+    """
+    np.random.seed(seed)
+    results = {}
+    for name in designs or REFERENCE_DESIGNS:
+        for stage, func in design_benchmarks(REFERENCE_DESIGNS[name]).items():
+            results[f"{stage}[{name}]"] = seconds_per_call(func, repeat)
+    if n_steps:
+        results["env_step"] = env_step(n_steps, seed)
+    return {"meta": meta(seed, n_steps), "results": results}
+
+
+def meta(seed: int, n_steps: int) -> dict:
+    try:
+        commit = subprocess.run(["git", "rev-parse", "HEAD"], cwd=ROOT, capture_output=True, text=True).stdout.strip()
+    except OSError:
+        commit = None
+    return {"commit": commit or None, "python": platform.python_version(), "numpy": np.__version__,
+            "machine": platform.machine(), "processor": platform.processor(), "seed": seed, "env_steps": n_steps,
+            "unit": "seconds per call"}
+
+
+def compare(results: dict, baseline: dict, tolerance: float = 0.25) -> list:
+    """
+    Arg:
+        results, baseline (dict): the results of two runs.
+        tolerance (float): allowed relative slow down.
+    Return:
+        (list[tuple]): name, baseline, result and ratio of the benchmarks that are slower than the tolerance.
+    """
+    regressions = []
+    for name, seconds in results["results"].items():
+        base = baseline["results"].get(name)
+        if base is None:
+            continue
+        ratio = seconds / base
+        if ratio > 1 + tolerance:
+            regressions.append((name, base, seconds, ratio))
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--output", default="benchmark.json", help="json file for the results")
+    parser.add_argument("--baseline", default=None, help="json file of an earlier run to compare with")
+    parser.add_argument("--tolerance", type=float, default=0.25, help="allowed relative slow down")
+    parser.add_argument("--designs", nargs="+", default=None, choices=list(REFERENCE_DESIGNS))
+    parser.add_argument("--steps", type=int, default=50, help="ShipEnv steps, 0 skips the environment")
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    results = run(args.designs, args.steps, args.seed, args.repeat)
+    with open(args.output, "w") as f:
+        json.dump(results, f, indent=2)
+    for name, seconds in results["results"].items():
+        print(f"{name:<40} {seconds * 1000:10.3f} ms")
+
+    if args.baseline:
+        with open(args.baseline) as f:
+            baseline = json.load(f)
+        regressions = compare(results, baseline, args.tolerance)
+        for name, base, seconds, ratio in regressions:
+            print(f"regression {name}: {base * 1000:.3f} ms -> {seconds * 1000:.3f} ms ({ratio:.2f}x)")
+        if regressions:
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
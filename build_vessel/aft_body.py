@@ -0,0 +1,88 @@
+"""
+Sectional area curve of the aft body in closed form.
+
+The control points of the aft frames move linearly in x between the transom (x = 0) and the aft of the hold
+(x = laft), see lin_interpolate. The area of a frame is the integral of y dz over its B-spline, a bilinear form of the
+y and z of the control points, so the area is a quadratic polynomial of x. The volume and the statical moment of the
+aft body follow from its three coefficients, whatever the length of the aft body.
+"""
+from functools import lru_cache
+import numpy as np
+from build_vessel.utils import lin_interpolate, modify_control_points
+
+
+@lru_cache(maxsize=None)
+def area_matrix(n_ctrlpts: int, degree: int = 2) -> np.ndarray:
+    """M of the area of a B-spline with a clamped uniform knot vector: the integral of y dz is y @ M @ z, where y and z
+    are the coordinates of the control points.
+    """
+    from geomdl import helpers, utilities
+
+    knotvector = utilities.generate_knot_vector(degree, n_ctrlpts)
+    # N_i N_j' has degree 2 * degree - 1 on every knot span, degree Gauss points are exact
+    nodes, weights = np.polynomial.legendre.leggauss(degree)
+    matrix = np.zeros((n_ctrlpts, n_ctrlpts))
+    for span in range(degree, n_ctrlpts):
+        a, b = knotvector[span], knotvector[span + 1]
+        for node, weight in zip(nodes, weights):
+            u = a + (b - a) * (node + 1) / 2
+            basis, derivative = np.array(helpers.basis_function_ders(degree, knotvector, span, u, 1))
+            matrix[span - degree:span + 1, span - degree:span + 1] += weight * (b - a) / 2 * np.outer(basis, derivative)
+    matrix.setflags(write=False)
+    return matrix
+
+
+class AftBody:
+    """Area, volume and statical moment of the aft body of one design or of a batch of designs.
+    Arg:
+        transom (np.ndarray): control points (..., n_ctrlpts, 3) of the frame at x = 0.
+        hold_aft (np.ndarray): control points (..., n_ctrlpts, 3) of the frame at x = laft.
+        laft (float | np.ndarray): length of the aft body.
+    """
+    def __init__(self, transom: np.ndarray, hold_aft: np.ndarray, laft) -> None:
+        transom, hold_aft = np.asarray(transom, dtype=float), np.asarray(hold_aft, dtype=float)
+        self.laft = np.asarray(laft, dtype=float)
+        matrix = area_matrix(transom.shape[-2])
+        length = np.where(self.laft > 0, self.laft, 1)[..., None]
+        y0, z0 = transom[..., 1], transom[..., 2]
+        dy, dz = (hold_aft[..., 1] - y0) / length, (hold_aft[..., 2] - z0) / length
+
+        def form(y, z):
+            return np.einsum("...i,ij,...j->...", y, matrix, z)
+
+        # area(x) = a + b x + c x^2
+        self.coefficients = (form(y0, z0), form(y0, dz) + form(dy, z0), form(dy, dz))
+
+    @classmethod
+    def from_ctrlpts(cls, ctrlpts) -> "AftBody":
+        """aft body of the CtrlPts of a Block.
+        """
+        block = ctrlpts.block
+        # without an aft body both ends are the transom, the same as BatchHull.aft_ctrlpts
+        hold_aft = modify_control_points(ctrlpts.web_frame, 0, block.laft if block.laft > 0 else 1)
+        frames = [lin_interpolate((ctrlpts.transom, hold_aft), x, block.draft) for x in (0, block.laft)]
+        return cls(frames[0], frames[1], block.laft)
+
+    def area(self, x):
+        """sectional area at x, 0 <= x <= laft.
+        """
+        a, b, c = self.coefficients
+        return a + b * x + c * x ** 2
+
+    @property
+    def transom_area(self):
+        return self.area(0)
+
+    @property
+    def volume(self):
+        a, b, c = self.coefficients
+        L = self.laft
+        return a * L + b * L ** 2 / 2 + c * L ** 3 / 3
+
+    @property
+    def statical_moment(self):
+        """first moment of the volume about the aft end.
+        """
+        a, b, c = self.coefficients
+        L = self.laft
+        return a * L ** 2 / 2 + b * L ** 3 / 3 + c * L ** 4 / 4
@@ -0,0 +1,319 @@
+"""
+This module builds the hulls of N designs at once.
+
+The frames, the hydrostatics and the Holtrop and Mennen input are the same as those of BuildFrames, Properties and
+HMInput, but every quantity is an array over the designs. The B-splines are evaluated with precomputed basis functions
+instead of a geomdl curve per frame, so all frames of all designs are evaluated at once.
+
+The number of aft frames differs per design, the aft frames are therefore right aligned in an array of max(laft)
+frames and the unused frames are masked.
+"""
+from dataclasses import dataclass, field
+from functools import lru_cache
+import numpy as np
+from scipy.integrate import simpson
+from build_vessel import integration
+from build_vessel.aft_body import AftBody
+from build_vessel.freeboard import min_freeboard
+from build_vessel.intersection import intersect_plane
+from build_vessel.parameters import violations
+
+
+@lru_cache(maxsize=None)
+def basis_functions(degree: int, n_ctrlpts: int, n_evalpts: int = 100) -> tuple:
+    """Knot spans and non zero B-spline basis functions of a clamped uniform knot vector, evaluated at the same
+    parameters as geomdl does for delta = 1 / n_evalpts.
+    Return:
+        spans (np.ndarray): shape (n_evalpts,)
+        basis (np.ndarray): shape (n_evalpts, degree + 1)
+    """
+    from geomdl import helpers, linalg, utilities
+    knotvector = utilities.generate_knot_vector(degree, n_ctrlpts)
+    knots = linalg.linspace(0.0, 1.0, n_evalpts, decimals=18)
+    spans = helpers.find_spans(degree, knotvector, n_ctrlpts, knots)
+    basis = helpers.basis_functions(degree, knotvector, spans, knots)
+    spans, basis = np.array(spans), np.array(basis)
+    spans.setflags(write=False)
+    basis.setflags(write=False)
+    return spans, basis
+
+
+def evaluate(ctrlpts: np.ndarray, degree: int = 2, n_evalpts: int = 100) -> np.ndarray:
+    """Evaluate B-splines with the control points on the second to last axis. The terms are summed in the same order
+    as geomdl does, so the points are identical to BSpline.Curve.evalpts.
+    Arg:
+        ctrlpts (np.ndarray): shape (..., n_ctrlpts, 3)
+    Return:
+        points (np.ndarray): shape (..., n_evalpts, 3)
+    """
+    spans, basis = basis_functions(degree, ctrlpts.shape[-2], n_evalpts)
+    points = basis[:, 0, None] * ctrlpts[..., spans - degree, :]
+    for i in range(1, degree + 1):
+        points += basis[:, i, None] * ctrlpts[..., spans - degree + i, :]
+    return points
+
+
+@dataclass
+class Blocks:
+    """Parameters of N designs, each field is an array of length N. See Block.
+    """
+    laft: np.ndarray
+    lhold: np.ndarray
+    lfore: np.ndarray
+    boa: np.ndarray
+    lwl: np.ndarray = field(init=False)
+    loa: np.ndarray = field(init=False)
+    depth: np.ndarray
+    draft: np.ndarray = field(init=False)
+    bilge_radius: np.ndarray
+    ctrlpt_offset_forward: np.ndarray
+    transom_width: np.ndarray
+    transom_height_action: np.ndarray
+    transom_offset: np.ndarray = 0
+
+    def __post_init__(self):
+        self.laft = np.asarray(self.laft, dtype=int)
+        self.lfore = np.asarray(self.lfore, dtype=int)
+        self.transom_offset = np.broadcast_to(np.asarray(self.transom_offset, dtype=float), self.laft.shape)
+        self.lwl = self.laft + self.lhold + self.lfore
+        self.loa = self.lwl
+        self.draft = self.depth - min_freeboard(self.loa)
+        self.transom_height = np.abs(self.transom_height_action * self.draft)
+
+    def __len__(self) -> int:
+        return len(self.laft)
+
+    def violations(self) -> np.ndarray:
+        """violation codes of every design, see build_vessel.parameters.violations.
+        """
+        return violations(self)
+
+    def check_done(self) -> np.ndarray:
+        """Same as Block.check_done for every design.
+        """
+        done = self.draft < 0
+        self.draft = np.where(done, 20, self.draft)
+        return done
+
+
+@dataclass
+class HMInputs:
+    """Holtrop and Mennen input of N designs, each field is an array of length N. The out of range values are corrected
+    in the same way as HMInput does.
+    """
+    lpp: np.ndarray
+    B: np.ndarray
+    t_f: np.ndarray
+    t_a: np.ndarray
+    displ: np.ndarray
+    lcb: np.ndarray
+    c_m: np.ndarray
+    c_wp: np.ndarray
+    a_t: np.ndarray
+    c_prism: np.ndarray
+    c_b: np.ndarray
+    ie: np.ndarray
+    velocity: np.ndarray
+    c_stern: int = 0
+    h_b: float = 0.0001
+    a_bt: float = 0.0001
+    reward_correct_input: np.ndarray = 0
+
+    def __post_init__(self):
+        negative_draft = self.t_f < 0
+        self.t_a = np.where(negative_draft, 50, self.t_a)
+        self.t_f = np.where(negative_draft, 50, self.t_f)
+        self.a_t = np.where(self.a_t < 0, 50, self.a_t)
+        self.displ = np.where(self.displ < 0, 1000000, self.displ)
+        # HMInput replaces the coefficients whether or not they are in range.
+        self.c_m = np.full(np.shape(self.lpp), 0.9)
+        self.c_wp = np.full(np.shape(self.lpp), 0.9)
+        self.c_prism = np.full(np.shape(self.lpp), 0.9)
+        self.c_b = np.full(np.shape(self.lpp), 0.9)
+        self.lcb = np.where(self.lcb < 0, 0, self.lcb)
+        # every check of HMInput adds one to the reward.
+        self.reward_correct_input = self.reward_correct_input + np.full(self.lpp.shape, 8)
+
+
+class BatchHull:
+    """Frames and hydrostatic properties of N designs.
+    Arg:
+        blocks (Blocks): the designs.
+        n_evalpts (int): number of points per frame.
+    """
+    def __init__(self, blocks: Blocks, n_evalpts: int = 100) -> None:
+        self.blocks = blocks
+        self.n_evalpts = n_evalpts
+
+    def transom_ctrlpts(self) -> np.ndarray:
+        """control points of the transom, see CtrlPts.transom.
+        Return:
+            (np.ndarray): shape (N, 3, 3)
+        """
+        b = self.blocks
+        zero = np.zeros(len(b))
+        return np.stack([np.stack([zero, zero, b.transom_height], axis=-1),
+                         np.stack([zero, b.transom_width, b.transom_height - b.transom_offset], axis=-1),
+                         np.stack([zero, b.transom_width, b.depth], axis=-1)], axis=1)
+
+    @property
+    def intersect_transom(self) -> np.ndarray:
+        """half breadth where the transom intersects with the waterline, see CtrlPts.intersect_transom.
+        """
+        return intersect_plane(self.transom_ctrlpts(), 2, self.blocks.draft, clamp=True)[1][:, 1]
+
+    def web_frame_ctrlpts(self, x: np.ndarray) -> np.ndarray:
+        """control points of the web frame at x, see CtrlPts.web_frame.
+        Return:
+            (np.ndarray): shape (N, 5, 3)
+        """
+        b = self.blocks
+        zero = np.zeros(len(b))
+        x = np.broadcast_to(x, zero.shape)
+        return np.stack([np.stack([x, zero, zero], axis=-1),
+                         np.stack([x, b.boa - b.bilge_radius, zero], axis=-1),
+                         np.stack([x, b.boa, zero], axis=-1),
+                         np.stack([x, b.boa, b.bilge_radius], axis=-1),
+                         np.stack([x, b.boa, b.draft], axis=-1)], axis=1)
+
+    def waterplane(self) -> tuple:
+        """points of the aft and forward waterplane, see WaterPlane.water_plane_points.
+        Return:
+            aft, forward (tuple[np.ndarray]): shape (N, n_evalpts, 3)
+        """
+        b = self.blocks
+        zero = np.zeros(len(b))
+        ctrlpts = np.stack([np.stack([zero, self.intersect_transom, b.draft], axis=-1),
+                            np.stack([zero, b.boa, b.draft], axis=-1),
+                            np.stack([b.laft, b.boa, b.draft], axis=-1),
+                            np.stack([b.laft + b.lhold, b.boa, b.draft], axis=-1),
+                            np.stack([b.lwl - b.ctrlpt_offset_forward, b.boa, b.draft], axis=-1),
+                            np.stack([b.lwl, zero, b.draft], axis=-1)], axis=1)
+        return evaluate(ctrlpts[:, :3], 2, self.n_evalpts), evaluate(ctrlpts[:, 3:], 2, self.n_evalpts)
+
+    def aft_ctrlpts(self, x: np.ndarray) -> np.ndarray:
+        """control points of the aft frames at x, which interpolate linear between the transom and the aft of the
+        hold. See lin_interpolate.
+        Arg:
+            x (np.ndarray): shape (N, n_frames)
+        Return:
+            (np.ndarray): shape (N, n_frames, 5, 3)
+        """
+        b = self.blocks
+        laft = np.where(b.laft > 0, b.laft, 1)[:, None]
+        # the middle control points of the transom and of the aft of the hold.
+        y1, z1 = b.transom_width[:, None], (b.transom_height - b.transom_offset)[:, None]
+        y2, z2 = b.boa[:, None], 0
+        z_max = b.draft[:, None]
+        y = y1 + x * ((y2 - y1) / laft)
+        z = z1 + x * ((z2 - z1) / laft)
+        y_radius1 = x * ((b.boa - b.bilge_radius)[:, None] / laft)
+        z_radius2 = z_max + x * ((b.bilge_radius[:, None] - z_max) / laft)
+        x, zero = np.broadcast_arrays(x, np.zeros_like(y))
+        z_max = np.broadcast_to(z_max, y.shape)
+        return np.stack([np.stack([x, zero, z], axis=-1),
+                         np.stack([x, y_radius1, z], axis=-1),
+                         np.stack([x, y, z], axis=-1),
+                         np.stack([x, y, z_radius2], axis=-1),
+                         np.stack([x, y, z_max], axis=-1)], axis=2)
+
+    def aft(self) -> tuple:
+        """aft frames, see aft_ctrlpts.
+        Return:
+            frames (np.ndarray): shape (N, max(laft), n_evalpts, 3), right aligned.
+            valid (np.ndarray): shape (N, max(laft)), False for the padding.
+        """
+        b = self.blocks
+        n_frames = int(b.laft.max(initial=0))
+        x = np.arange(n_frames)[None, :] - (n_frames - b.laft)[:, None]
+        return evaluate(self.aft_ctrlpts(x), 2, self.n_evalpts), x >= 0
+
+    def aft_body(self) -> AftBody:
+        """the aft body in closed form, without sampling the aft frames.
+        """
+        b = self.blocks
+        ctrlpts = self.aft_ctrlpts(np.stack([np.zeros(len(b)), b.laft], axis=1))
+        return AftBody(ctrlpts[:, 0], ctrlpts[:, 1], b.laft)
+
+    def midship(self) -> np.ndarray:
+        """frames at the aft and the fore of the hold.
+        Return:
+            (np.ndarray): shape (N, 2, n_evalpts, 3)
+        """
+        b = self.blocks
+        ctrlpts = np.stack([self.web_frame_ctrlpts(b.laft), self.web_frame_ctrlpts(b.laft + b.lhold)], axis=1)
+        return evaluate(ctrlpts, 2, self.n_evalpts)
+
+    def forward(self, hold_fore: np.ndarray, wp_forward: np.ndarray) -> np.ndarray:
+        """forward frames, the frame at the fore of the hold is narrowed to the forward waterplane.
+        See new_cross_fore.
+        Return:
+            (np.ndarray): shape (N, n_evalpts, n_evalpts, 3)
+        """
+        wl_y = wp_forward[:, :, 1, None]
+        y = hold_fore[:, None, :, 1]
+        y = np.where(y > wl_y, y - (wp_forward[:, :1, 1, None] - wl_y), y)
+        frames = np.broadcast_to(hold_fore[:, None], y.shape + (3,)).copy()
+        frames[..., 0] = wp_forward[:, :, 0, None]
+        frames[..., 1] = np.maximum(y, 0)
+        return frames
+
+    def properties(self) -> dict:
+        """hydrostatic properties of every design, see Properties and Info.
+        Return:
+            (dict): arrays of length N with the keys of Info.
+        """
+        b = self.blocks
+        aft_body = self.aft_body()
+        mid = self.midship()
+        wp_aft, wp_forward = self.waterplane()
+        fore = self.forward(mid[:, 1], wp_forward)
+
+        # the aft body in closed form, the parallel midbody and the fore body from their frames, see Properties
+        frames = np.concatenate((mid, fore), axis=1)
+        section_x = frames[:, :, 0, 0]
+        section_area = integration.simpson(frames[..., 1], frames[..., 2])
+        volume, statical_moment = aft_body.volume, aft_body.statical_moment
+        for start, stop in ((0, 2), (1, frames.shape[1])):
+            x, area = section_x[:, start:stop], section_area[:, start:stop]
+            volume = volume + integration.simpson_distinct(area, x)
+            statical_moment = statical_moment + integration.simpson_distinct(x * area, x)
+        lcb = statical_moment / volume
+
+        wbfrm = evaluate(self.web_frame_ctrlpts(b.loa / 2), 2, self.n_evalpts)
+        wbfrm_area = simpson(wbfrm[..., 1], x=wbfrm[..., 2], axis=-1)
+        wp = np.concatenate((wp_aft, wp_forward), axis=1)
+        with np.errstate(divide='ignore'):
+            ie = np.tanh(b.boa / b.lfore) * 180 / np.pi
+        return {"laft": b.laft, "lhold": b.lhold, "lfore": b.lfore, "lwl": b.lwl, "half_boa": b.boa,
+                "draft": b.draft,
+                "transom_area": aft_body.transom_area,
+                "volume": volume,
+                "statical_moment": statical_moment,
+                "lcb": lcb,
+                "prismatic_coefficient": volume / (wbfrm_area * b.lwl),
+                "block_coefficient": volume / (b.lwl * b.boa * b.draft),
+                "ie": ie,
+                "c_wp": simpson(wp[..., 1], x=wp[..., 0], axis=-1) / (b.lwl * b.boa),
+                "c_m": wbfrm_area / (wbfrm[..., 1].max(axis=-1) * wbfrm[..., 2].max(axis=-1)),
+                }
+
+    def hm_input(self, velocity, properties: dict = None) -> HMInputs:
+        b = self.blocks
+        if properties is None:
+            properties = self.properties()
+        lpp_2 = b.lwl / 2
+        return HMInputs(lpp=b.lwl,
+                        B=b.boa * 2,
+                        t_f=b.draft,
+                        t_a=b.draft,
+                        displ=properties["volume"] * 2 * 1.025,
+                        lcb=(properties["lcb"] - lpp_2) / lpp_2,
+                        c_m=properties["c_m"],
+                        c_wp=properties["c_wp"],
+                        a_t=properties["transom_area"],
+                        c_prism=properties["prismatic_coefficient"],
+                        c_b=properties["block_coefficient"],
+                        ie=properties["ie"],
+                        velocity=np.broadcast_to(velocity, b.lwl.shape),
+                        )
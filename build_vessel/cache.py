@@ -0,0 +1,51 @@
+"""
+This module caches the results of evaluated designs.
+
+The key of a design is Block.key together with the evaluation settings, such as the velocity and the bale.
+"""
+from collections import OrderedDict
+
+
+class ResultCache:
+    """Least recently used cache of evaluated designs.
+    Arg:
+        maxsize (int): maximum number of designs, the least recently used design is removed first.
+    """
+    def __init__(self, maxsize: int = 4096) -> None:
+        self.maxsize = maxsize
+        self._results = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def __len__(self) -> int:
+        return len(self._results)
+
+    def __contains__(self, key) -> bool:
+        return key in self._results
+
+    def get(self, key, default=None):
+        try:
+            result = self._results[key]
+        except KeyError:
+            self.misses += 1
+            return default
+        self._results.move_to_end(key)
+        self.hits += 1
+        return result
+
+    def put(self, key, result) -> None:
+        self._results[key] = result
+        self._results.move_to_end(key)
+        if len(self._results) > self.maxsize:
+            self._results.popitem(last=False)
+
+    def clear(self) -> None:
+        self._results.clear()
+
+    @property
+    def hit_rate(self) -> float:
+        lookups = self.hits + self.misses
+        return self.hits / lookups if lookups else 0.0
+
+    def stats(self) -> dict:
+        return {"hits": self.hits, "misses": self.misses, "hit_rate": self.hit_rate, "size": len(self)}
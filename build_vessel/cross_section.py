@@ -4,17 +4,13 @@ This modules creates cross sectional frames
 author: Dorus Boogaard
 """
 import numpy as np
-from geomdl import BSpline
-from geomdl import utilities
 from scipy.integrate import simpson
-from build_vessel.properties import Properties, Info
 from build_vessel.utils import lin_interpolate, new_cross_fore
-from pyvista import KochanekSpline, PolyData, Plotter
 
 class CrossSection():
-    def __init__(self, ctrlpts) -> None:
+    def __init__(self, ctrlpts, delta: float = 0.01) -> None:
         self._degree = 2
-        self._delta = 0.01
+        self._delta = delta
         self._ctrlpts = ctrlpts
 
     def cross_section_coefficient(self):
@@ -25,7 +21,7 @@ class CrossSection():
     def area(self) -> float:
         points = np.array(self.points)
         y, z = points[:,1], points[:,2] 
-        return simpson(y, z)
+        return simpson(y, x=z)
 
     @property
     def delta(self):
@@ -51,7 +47,8 @@ class CrossSection():
     def ctrlpts(self, ctrlpts  : list) -> None:
         self._ctrlpts = ctrlpts
 
-    def b_spline(self) -> BSpline.Curve:
+    def b_spline(self):
+        from geomdl import BSpline, utilities
         curve = BSpline.Curve()
         curve.degree = self.degree
         curve.ctrlpts = self.ctrlpts
@@ -70,46 +67,110 @@ def midship_coefficient(l, b, r):
     return (l * b - left_over) / (l * b)
 
 
+class HullBuffer:
+    """The frames of the hull in one array. The aft, mid and fore stages of BuildFrames write into their slice and
+    Properties uses the array by reference. The memory is reused by the next hull when it has no more points, also
+    when the hull is build at another resolution.
+    Arg:
+        n_evalpts (int): points per frame.
+    """
+    def __init__(self, n_evalpts: int = 100) -> None:
+        self.n_evalpts = n_evalpts
+        self._storage = np.empty(0)
+        self._array = self._storage.reshape([0, n_evalpts, 3])
+        self.n_aft, self.n_mid, self.n_fore = 0, 0, 0
+
+    def allocate(self, n_aft: int, n_fore: int, n_mid: int = 2, n_evalpts: int = None) -> None:
+        """Set the number of frames of every stage and the points per frame, the memory grows when the hull doesn't
+        fit.
+        """
+        if n_evalpts is not None:
+            self.n_evalpts = n_evalpts
+        n_frames = n_aft + n_mid + n_fore
+        size = n_frames * self.n_evalpts * 3
+        if size > len(self._storage):
+            self._storage = np.empty(size)
+        self._array = self._storage[:size].reshape([n_frames, self.n_evalpts, 3])
+        self.n_aft, self.n_mid, self.n_fore = n_aft, n_mid, n_fore
+
+    def __len__(self) -> int:
+        return self.n_aft + self.n_mid + self.n_fore
+
+    @property
+    def points(self) -> np.ndarray:
+        return self._array[:len(self)]
+
+    @property
+    def aft(self) -> np.ndarray:
+        return self._array[:self.n_aft]
+
+    @property
+    def mid(self) -> np.ndarray:
+        return self._array[self.n_aft:self.n_aft + self.n_mid]
+
+    @property
+    def fore(self) -> np.ndarray:
+        return self._array[self.n_aft + self.n_mid:len(self)]
+
+
 class BuildFrames:
-    def __init__(self, waterplane, aftrange: int, height: float) -> None:
+    n_evalpts = 100  # full resolution
+
+    def __init__(self, waterplane, aftrange: int, height: float, plot: bool = False, n_evalpts: int = None) -> None:
+        """
+        Arg:
+            plot (bool): add the frames to a pyvista Plotter. pyvista is only imported when plot is True, so the frames
+                can be build in processes without a display.
+            n_evalpts (int): points per frame, the full resolution when not given.
+        """
+        if n_evalpts is not None:
+            self.n_evalpts = n_evalpts
         self.wp = waterplane
         self.wp.water_plane_points
         self.aftrange = aftrange
         self.height = height
-        self.n_evalpts = 100
-        
-        self.pl = Plotter()
-        self.pl.set_background("royalblue", top="aliceblue")
 
-    def aft(self, laft: int, hold_aft_ctrlpts: list, cross_frames_transom):
-        points_array = np.empty([laft, self.n_evalpts, 3])
+        self.pl = None
+        if plot:
+            from pyvista import Plotter
+            self.pl = Plotter()
+            self.pl.set_background("royalblue", top="aliceblue")
+
+    def plot_frame(self, points) -> None:
+        if self.pl is None:
+            return
+        from pyvista import KochanekSpline, PolyData
+        c, t, b = (-0.2, 1, 0)
+        spline = KochanekSpline(points, tension=[t, t, t], continuity=[c, c, c], n_points=1000)
+        self.pl.add_mesh(spline, color="r")
+        self.pl.add_mesh(PolyData(points), color="r", point_size=1, render_points_as_spheres=True)
+
+    def aft(self, laft: int, hold_aft_ctrlpts: list, cross_frames_transom, out: np.ndarray = None):
+        """
+        Arg:
+            out (np.ndarray): array of the frames, e.g. HullBuffer.aft, allocated when not given.
+        """
+        points_array = np.empty([laft, self.n_evalpts, 3]) if out is None else out
         for x in np.arange(0, laft):
             _ctrpts = lin_interpolate((cross_frames_transom, hold_aft_ctrlpts), x, self.height)
-            frame = CrossSection(_ctrpts)
+            frame = CrossSection(_ctrpts, delta=1 / self.n_evalpts)
             
             points = frame.points
             points_array[x] = points
-            c, t, b = (-0.2, 1, 0)
-            spline = KochanekSpline(points, tension=[t, t, t], continuity=[c, c, c], n_points=1000)
-            self.pl.add_mesh(spline, color="r")
-            self.pl.add_mesh(PolyData(frame.points), color="r", point_size=1, render_points_as_spheres=True)
+            self.plot_frame(points)
         return points_array
 
-    def midship(self, hold_aft_points, hold_fore_points, lmid: int = 2):
-        info = Info()
-        mid = Properties(self.height, lmid, info)
-        mid.memory = np.array(hold_aft_points), 0
-        mid.memory = np.array(hold_fore_points), 1
-        return mid.memory
+    def midship(self, hold_aft_points, hold_fore_points, lmid: int = 2, out: np.ndarray = None):
+        points_array = np.empty([lmid, self.n_evalpts, 3]) if out is None else out
+        points_array[0] = hold_aft_points
+        points_array[1] = hold_fore_points
+        return points_array
 
-    def forward(self, hold_fore_points):
-        c, t, b = (-0.2, 1, 0)
-        points_array = np.empty([len(self.wp.forward), self.n_evalpts, 3])
+    def forward(self, hold_fore_points, out: np.ndarray = None):
+        points_array = np.empty([len(self.wp.forward), self.n_evalpts, 3]) if out is None else out
         for x in range(len(self.wp.forward)):
             points = new_cross_fore(self.wp.forward, np.array(hold_fore_points), x)
-            spline = KochanekSpline(points, tension=[t, t, t], continuity=[c, c, c], n_points=1000)
-            self.pl.add_mesh(spline, color="r")
-            self.pl.add_mesh(PolyData(points), color="r", point_size=1, render_points_as_spheres=True)
+            self.plot_frame(points)
             points_array[x] = points
         return points_array
 
@@ -118,7 +179,8 @@ class BuildFrames:
         self.pl.show()
 
     def close_visualisation(self):
-        self.pl.close()
+        if self.pl is not None:
+            self.pl.close()
 
 
 if __name__ == '__main__':
@@ -19,29 +19,49 @@ Type 'B' ships
 
 Author:     Dorus Boogaard
 """
-import pandas as pd
+from functools import lru_cache
 from pathlib import Path
+import numpy as np
 
 p = Path(__file__)
 relative_path = p.parent / "Rules" / "min_freeboard.csv"
-free_board = pd.read_csv(relative_path)
+SHIP_TYPES = {'A': 0, 'B': 1}
 
-def min_freeboard(loa, type: str ='B'):
+
+@lru_cache(maxsize=None)
+def freeboard_table(path: Path = relative_path):
+    """The table is read once, on first use.
+    Args:
+      path (Path): csv with the columns length [m], A [mm] and B [mm], lengths in equal steps.
+    Returns:
+      tuple: first length, length step and the (n, 2) array of freeboards in meters
+    """
+    table = np.loadtxt(path, delimiter=',', skiprows=1, ndmin=2)
+    lengths = table[:, 0]
+    steps = np.diff(lengths)
+    if len(lengths) < 2 or not np.allclose(steps, steps[0]) or steps[0] <= 0:
+        raise ValueError(f"the lengths in {path} should increase in equal steps")
+    freeboards = table[:, 1:3] / 1000
+    freeboards.setflags(write=False)
+    return lengths[0], steps[0], freeboards
+
+
+def min_freeboard(loa, type: str ='B', path: Path = relative_path):
     """
-    If length is not in the table, return 6.0 meters.
+    Linear interpolation between the tabulated lengths. Lengths outside the table get the freeboard of the
+    nearest tabulated length, the rules don't give a value for them.
     Args:
-      loa (int): length overall in meters
+      loa (float | np.ndarray): length overall in meters
       type (str): 'A' or 'B'
     Returns:
-      float: minimum freeboard in meters
+      float | np.ndarray: minimum freeboard in meters
     """
-    try:
-      if type == 'A':
-          return (free_board.loc[free_board["length"] == int(loa)].values[0][1] / 1000)
-      elif type == 'B':
-          return (free_board.loc[free_board["length"] == int(loa)].values[0][2] / 1000)
-      else:
-          raise ValueError("type should be 'A' or 'B'")
-    except IndexError:
-      return 6.0
-        
+    if type not in SHIP_TYPES:
+        raise ValueError("type should be 'A' or 'B'")
+    start, step, freeboards = freeboard_table(path)
+    column = freeboards[:, SHIP_TYPES[type]]
+    # the table has equal steps, so the index follows from the length
+    position = np.clip((np.asarray(loa, dtype=float) - start) / step, 0, len(column) - 1)
+    i = np.minimum(np.nan_to_num(position).astype(int), len(column) - 2)  # nan gives a nan freeboard
+    freeboard = column[i] + (position - i) * (column[i + 1] - column[i])
+    return float(freeboard) if freeboard.ndim == 0 else freeboard
@@ -0,0 +1,133 @@
+"""
+Numerical integration of sampled curves, such as the sectional area curve, on stations with any spacing.
+
+The rules integrate along an axis, so the curves of many hulls are integrated at once. x is an array with the shape
+of y or a 1D array with the stations along the axis. Stations at the same position, e.g. the last midship frame and
+the first frame of the fore body, are allowed: Simpson's rule falls back to the trapezoidal rule for the pair of
+intervals with a zero width interval. Leave them out with distinct_stations, or simpson_distinct for many curves, to
+keep the accuracy of Simpson's rule.
+
+rules:
+    trapezoid, cumulative_trapezoid     exact for linear curves
+    simpson, cumulative_simpson         composite Simpson's rule on non-uniform stations, exact for quadratic curves
+    simpson_distinct                    simpson of every curve without its coincident stations
+    gauss_legendre                      for a curve which can be evaluated anywhere, e.g. a B-spline
+"""
+import numpy as np
+
+
+def _along_last_axis(y, x, axis: int) -> tuple:
+    y = np.moveaxis(np.asarray(y, dtype=float), axis, -1)
+    x = np.asarray(x, dtype=float)
+    if x.ndim > 1:
+        x = np.moveaxis(x, axis, -1)
+    return y, np.broadcast_to(x, y.shape)
+
+
+def distinct_stations(x) -> np.ndarray:
+    """Mask of the stations on the last axis which aren't at the position of the previous station of their curve, the
+    shape of x. The first station is always kept. Stations within a rounding error, relative to x, are at the same
+    position: the weights of Simpson's rule are inversely proportional to the width of an interval.
+    """
+    x = np.asarray(x, dtype=float)
+    return np.diff(x, axis=-1, prepend=-np.inf) > 1e-9 * np.abs(x)
+
+
+def _trapezoid_intervals(y: np.ndarray, x: np.ndarray) -> np.ndarray:
+    return np.diff(x, axis=-1) * (y[..., 1:] + y[..., :-1]) / 2
+
+
+def _simpson_intervals(y: np.ndarray, x: np.ndarray) -> np.ndarray:
+    """integral over every interval of the quadratic through the pair of intervals it belongs to. With an odd number
+    of intervals the last one uses the quadratic through the last three stations.
+    """
+    n_intervals = y.shape[-1] - 1
+    if n_intervals < 2:
+        return _trapezoid_intervals(y, x)
+    h = np.diff(x, axis=-1)
+    integrals = np.empty(h.shape)
+    n_pairs = n_intervals // 2
+    h0, h1 = h[..., 0:2 * n_pairs:2], h[..., 1:2 * n_pairs:2]
+    y0, y1, y2 = y[..., 0:2 * n_pairs:2], y[..., 1:2 * n_pairs + 1:2], y[..., 2:2 * n_pairs + 1:2]
+    integrals[..., 0:2 * n_pairs:2], integrals[..., 1:2 * n_pairs:2] = _quadratic(h0, h1, y0, y1, y2)
+    if n_intervals % 2:
+        integrals[..., -1] = _quadratic(h[..., -2], h[..., -1], y[..., -3], y[..., -2], y[..., -1])[1]
+    return integrals
+
+
+def _quadratic(h0, h1, y0, y1, y2) -> tuple:
+    """integrals over [x0, x1] and [x1, x2] of the quadratic through three stations, h0 = x1 - x0 and h1 = x2 - x1.
+    """
+    H = h0 + h1
+    with np.errstate(divide="ignore", invalid="ignore"):
+        first = h0 * (3 * H - h0) / (6 * H) * y0 + h0 * (3 * H - 2 * h0) / (6 * h1) * y1 - h0 ** 3 / (6 * H * h1) * y2
+        second = -h1 ** 3 / (6 * H * h0) * y0 + h1 * (3 * H - 2 * h1) / (6 * h0) * y1 + h1 * (3 * H - h1) / (6 * H) * y2
+    degenerate = (h0 == 0) | (h1 == 0)
+    first = np.where(degenerate, h0 * (y0 + y1) / 2, first)
+    second = np.where(degenerate, h1 * (y1 + y2) / 2, second)
+    return first, second
+
+
+def _cumulative(integrals: np.ndarray, axis: int) -> np.ndarray:
+    cumulative = np.zeros(integrals.shape[:-1] + (integrals.shape[-1] + 1,))
+    np.cumsum(integrals, axis=-1, out=cumulative[..., 1:])
+    return np.moveaxis(cumulative, -1, axis)
+
+
+def trapezoid(y, x, axis: int = -1):
+    y, x = _along_last_axis(y, x, axis)
+    return _trapezoid_intervals(y, x).sum(axis=-1)
+
+
+def cumulative_trapezoid(y, x, axis: int = -1) -> np.ndarray:
+    """
+    Return:
+        (np.ndarray): integral from the first station to every station, the shape of y.
+    """
+    y, x = _along_last_axis(y, x, axis)
+    return _cumulative(_trapezoid_intervals(y, x), axis)
+
+
+def simpson(y, x, axis: int = -1):
+    y, x = _along_last_axis(y, x, axis)
+    return _simpson_intervals(y, x).sum(axis=-1)
+
+
+def simpson_distinct(y, x) -> np.ndarray:
+    """simpson of every curve on the last axis over its distinct stations, so the integral of a curve doesn't depend
+    on the stations of the other curves. The curves with the same coincident stations are integrated together.
+    Arg:
+        y, x (np.ndarray): shape (N, n_stations)
+    Return:
+        (np.ndarray): shape (N,)
+    """
+    y, x = _along_last_axis(y, x, -1)
+    integrals = np.empty(y.shape[0])
+    masks, groups = np.unique(distinct_stations(x), axis=0, return_inverse=True)
+    for group, mask in enumerate(masks):
+        rows = groups.ravel() == group
+        integrals[rows] = simpson(y[rows][:, mask], x[rows][:, mask])
+    return integrals
+
+
+def cumulative_simpson(y, x, axis: int = -1) -> np.ndarray:
+    """
+    Return:
+        (np.ndarray): integral from the first station to every station, the shape of y. The last value is equal to
+            simpson.
+    """
+    y, x = _along_last_axis(y, x, axis)
+    return _cumulative(_simpson_intervals(y, x), axis)
+
+
+def gauss_legendre(f, a, b, n: int = 5):
+    """Gauss-Legendre quadrature of n points, exact for polynomials up to degree 2n - 1.
+    Arg:
+        f (callable): f(x) of an array of stations, the stations of the integral are on the last axis.
+        a, b (float | np.ndarray): bounds of the integral, arrays integrate many curves at once.
+    """
+    nodes, weights = np.polynomial.legendre.leggauss(n)
+    a, b = np.asarray(a, dtype=float)[..., None], np.asarray(b, dtype=float)[..., None]
+    half = (b - a) / 2
+    x = a + half * (nodes + 1)
+    return np.sum(weights * f(x) * half, axis=-1)
@@ -0,0 +1,166 @@
+"""
+Intersections of B-spline curves with planes, e.g. where the transom meets the waterline.
+
+The curves have a clamped uniform knot vector, like the curves of geomdl in this package. The curves are arrays of
+control points (..., n_ctrlpts, 3), so the intersections of a batch of designs are found at once without sampling
+the curves densely.
+
+The crossing is bracketed with the control points, without sampling the curve. By the variation diminishing property a
+curve whose control polygon doesn't cross the plane doesn't cross it either. On a knot span the curve is a convex
+combination of degree + 1 control points, so the curve has no root before the span where the first sign change of
+the polygon enters and the bracket ends degree spans later. The polygon crosses the plane once for the monotone curves
+of the hull, then the ends of the bracket are on either side of the plane. Otherwise the curve is evaluated at the ends
+of the bracket; when both are on the same side the bracket is extended to the end of the curve, and a curve which
+ends on that side as well is returned as not crossing, even if it crosses the plane twice further on. The root in the
+bracket is refined with Newton's method, starting at the crossing of the polygon, which falls back to bisection when a
+step leaves the bracket.
+"""
+from functools import lru_cache
+import numpy as np
+
+
+@lru_cache(maxsize=None)
+def knot_vector(degree: int, n_ctrlpts: int) -> np.ndarray:
+    """clamped uniform knot vector, the same as geomdl.utilities.generate_knot_vector.
+    """
+    interior = np.linspace(0, 1, n_ctrlpts - degree + 1)
+    knots = np.concatenate((np.zeros(degree), interior, np.ones(degree)))
+    knots.setflags(write=False)
+    return knots
+
+
+@lru_cache(maxsize=None)
+def greville(degree: int, n_ctrlpts: int) -> np.ndarray:
+    """parameters of the control points, the averages of degree successive knots.
+    """
+    knots = knot_vector(degree, n_ctrlpts)
+    stations = np.array([knots[i + 1:i + degree + 1].mean() for i in range(n_ctrlpts)])
+    stations.setflags(write=False)
+    return stations
+
+
+def _basis(degree: int, knots: np.ndarray, u: np.ndarray) -> tuple:
+    """knot spans and non zero basis functions at the parameters u of any shape, algorithm A2.2 of The NURBS Book.
+    Return:
+        spans (np.ndarray): the shape of u.
+        basis (np.ndarray): shape u.shape + (degree + 1,)
+    """
+    n_ctrlpts = len(knots) - degree - 1
+    spans = np.clip(np.searchsorted(knots, u, side="right") - 1, degree, n_ctrlpts - 1)
+    basis = np.zeros(u.shape + (degree + 1,))
+    basis[..., 0] = 1
+    left, right = np.zeros(basis.shape), np.zeros(basis.shape)
+    for j in range(1, degree + 1):
+        left[..., j] = u - knots[spans + 1 - j]
+        right[..., j] = knots[spans + j] - u
+        saved = 0
+        for r in range(j):
+            temp = basis[..., r] / (right[..., r + 1] + left[..., j - r])
+            basis[..., r] = saved + right[..., r + 1] * temp
+            saved = left[..., j - r] * temp
+        basis[..., j] = saved
+    return spans, basis
+
+
+def _combine(ctrlpts: np.ndarray, spans: np.ndarray, basis: np.ndarray, degree: int) -> np.ndarray:
+    index = spans[..., None] - degree + np.arange(degree + 1)
+    ctrlpts = np.broadcast_to(ctrlpts, index.shape[:-1] + ctrlpts.shape[-2:])
+    return np.einsum("...k,...kd->...d", basis, np.take_along_axis(ctrlpts, index[..., None], axis=-2))
+
+
+def curve_points(ctrlpts: np.ndarray, u, degree: int = 2, derivative: bool = False):
+    """Points of B-spline curves at one parameter per curve.
+    Arg:
+        ctrlpts (np.ndarray): shape (..., n_ctrlpts, dim)
+        u (float | np.ndarray): parameters in [0, 1], broadcast with the shape ctrlpts.shape[:-2].
+        derivative (bool): return the first derivative to u as well.
+    Return:
+        points (np.ndarray): shape (..., dim), and the derivatives of the same shape if derivative is True.
+    """
+    ctrlpts = np.asarray(ctrlpts, dtype=float)
+    n_ctrlpts = ctrlpts.shape[-2]
+    u = np.asarray(u, dtype=float)
+    u = np.broadcast_to(u, np.broadcast_shapes(u.shape, ctrlpts.shape[:-2]))
+    points = _combine(ctrlpts, *_basis(degree, knot_vector(degree, n_ctrlpts), u), degree)
+    if not derivative:
+        return points
+    # the derivative is a B-spline of degree - 1 on the knots without the first and the last knot
+    knots = knot_vector(degree, n_ctrlpts)
+    scale = degree / (knots[degree + 1:degree + n_ctrlpts] - knots[1:n_ctrlpts])
+    difference = np.diff(ctrlpts, axis=-2) * scale[:, None]
+    derivatives = _combine(difference, *_basis(degree - 1, knots[1:-1], u), degree - 1)
+    return points, derivatives
+
+
+def intersect_plane(ctrlpts: np.ndarray, axis: int, value, degree: int = 2, clamp: bool = False, tol: float = 1e-10,
+                    max_iter: int = 50) -> tuple:
+    """First intersection of B-spline curves with the plane coordinate[axis] = value.
+    Arg:
+        ctrlpts (np.ndarray): shape (..., n_ctrlpts, 3)
+        axis (int): x = 0, y = 1, z = 2
+        value (float | np.ndarray): position of the plane, broadcast to the shape ctrlpts.shape[:-2].
+        clamp (bool): for a curve which doesn't cross the plane, return the end of the curve nearest to the plane
+            instead of nan.
+        tol (float): tolerance on the coordinate of the intersection.
+    Return:
+        u (np.ndarray): parameter of the intersection on every curve.
+        points (np.ndarray): shape (..., 3), the intersections.
+    """
+    ctrlpts = np.asarray(ctrlpts, dtype=float)
+    n_ctrlpts = ctrlpts.shape[-2]
+    value = np.broadcast_to(np.asarray(value, dtype=float), ctrlpts.shape[:-2])
+    knots = knot_vector(degree, n_ctrlpts)
+    stations = greville(degree, n_ctrlpts)
+
+    with np.errstate(invalid="ignore", divide="ignore"):
+        # the first sign change of the control polygon, between the control points first and first + 1
+        polygon = ctrlpts[..., axis] - value[..., None]
+        crossing = (np.sign(polygon[..., :-1]) * np.sign(polygon[..., 1:]) <= 0)
+        found = crossing.any(axis=-1)
+        first = np.argmax(crossing, axis=-1)
+        # the spans up to span first only combine control points on one side of the plane, the spans up to
+        # span first + degree combine control point first + 1 as well
+        lo, hi = knots[first + 1], knots[np.minimum(first + degree, n_ctrlpts - 1) + 1]
+        # only the signs at the ends of the bracket are used, which are the signs of the ends of the polygon when it
+        # crosses the plane once
+        f_lo, f_hi = polygon[..., 0], polygon[..., -1]
+        if (crossing.sum(axis=-1) > 1).any():
+            ends = curve_points(ctrlpts[..., None, :, :], np.stack((lo, hi), axis=-1), degree)[..., axis]
+            f_lo, f_hi = ends[..., 0] - value, ends[..., 1] - value
+            # the curve doesn't cross within the bracket, the end of a clamped curve is its last control point
+            beyond = np.sign(f_lo) * np.sign(f_hi) > 0
+            hi, f_hi = np.where(beyond, 1.0, hi), np.where(beyond, polygon[..., -1], f_hi)
+            found = found & (np.sign(f_lo) * np.sign(f_hi) <= 0)
+        # start at the crossing of the control polygon
+        c_first = np.take_along_axis(polygon, first[..., None], axis=-1)[..., 0]
+        c_next = np.take_along_axis(polygon, first[..., None] + 1, axis=-1)[..., 0]
+        u = stations[first] + (stations[first + 1] - stations[first]) * c_first / (c_first - c_next)
+        u = np.where((u >= lo) & (u <= hi), u, (lo + hi) / 2)
+        u = np.where(found, u, 0.5)
+
+        converged = ~found
+        for _ in range(max_iter):
+            points, derivatives = curve_points(ctrlpts, u, degree, derivative=True)
+            f = points[..., axis] - value
+            converged = converged | (np.abs(f) <= tol) | (hi - lo <= 4 * np.finfo(float).eps)
+            if converged.all():
+                break
+            left = np.sign(f) == np.sign(f_lo)
+            lo, f_lo = np.where(left, u, lo), np.where(left, f, f_lo)
+            hi = np.where(left, hi, u)
+            newton = u - f / derivatives[..., axis]
+            inside = (newton > lo) & (newton < hi)
+            u = np.where(converged, u, np.where(inside, newton, (lo + hi) / 2))
+        else:
+            points = curve_points(ctrlpts, u, degree)
+
+    # the ends of a clamped curve are its first and last control point
+    if clamp:
+        end = np.argmin(np.abs(np.stack((polygon[..., 0], polygon[..., -1]))), axis=0)
+        u = np.where(found, u, end.astype(float))
+        ends = np.where(end[..., None] == 0, ctrlpts[..., 0, :], ctrlpts[..., -1, :])
+        points = np.where(found[..., None], points, ends)
+    else:
+        u = np.where(found, u, np.nan)
+        points = np.where(found[..., None], points, np.nan)
+    return u, points
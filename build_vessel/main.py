@@ -68,8 +68,7 @@ def main():
     aft_area.area()
     print(f"the area of the web frame {aft_area.section_area[-1]}")
     print(f"the area of the transom frame {transom.area:.2f}")
-    print(f"The volume according to my function is {aft_area.volume():.2f}")
-    print(f"The volume according to scipy is {aft_area.volume_scipy():.2f}")
+    print(f"The volume is {aft_area.volume():.2f}")
     print(f"The statical moment of {aft_area.statical_moment() =}")
     print(f"the {aft_area.total_area() =}")
     print(f"lcb {aft_area.lcb() =:.2f}")
@@ -94,8 +93,7 @@ def main():
         forward_area.memory = (points, x)
 
     forward_area.area()
-    print(f"The volume of the forepeak according to my function is {forward_area.volume()}")
-    print(f"The volume of the forepeak according to scipy is {forward_area.volume_scipy()}")
+    print(f"The volume of the forepeak is {forward_area.volume()}")
     print(f"the {forward_area.statical_moment() =:.2f}")
     print(f"the {forward_area.lcb() =:.2f}")
     print()
@@ -105,7 +103,7 @@ def main():
     mid.memory = ms_1_points, 0
     mid.memory = ms_2_points, 1
     mid.area()
-    print(f"the {mid.volume_scipy() =:.2f}")
+    print(f"the {mid.volume() =:.2f}")
     print(f"the {mid.statical_moment() =:.2f}")
     print(f"the {mid.lcb() = :.2f}")
 
@@ -114,7 +112,7 @@ def main():
     total_area = Properties(block.draft, len(arrays))
     total_area.memory = arrays, True
     total_area.area()
-    print(f"{total_area.volume_scipy() = :.2f}")
+    print(f"{total_area.volume() = :.2f}")
     print(f"{total_area.statical_moment() = :.2f}")
     print(f"{total_area.lcb() =}")
     print(f"immersed {total_area.transom_area = }")
@@ -128,7 +126,7 @@ def main():
                        B= block.boa * 2,
                        t_f= block.draft,
                        t_a= block.draft,
-                       displ= total_area.volume_scipy() * 2 * 1.025,
+                       displ= total_area.volume() * 2 * 1.025,
                        lcb=total_area.lcb(),
                        c_m=wbfrm.cross_section_coefficient(),
                        c_wp=wp.c_wp(block.lwl, block.boa),
@@ -56,7 +56,7 @@ if __name__ == '__main__':
 	data_points = main_deck.main_deck_points
 	print(data_points[:,0])
 	x, y = data_points[:,0], data_points[:,1]
-	area = simpson(y, x)
+	area = simpson(y, x=x)
 	print(f"The waterplane area is {area}")
 	kochanek_spline = KochanekSpline(data_points, tension=[t, t, t], continuity=[c, c, c], n_points=1000)
 
@@ -0,0 +1,186 @@
+"""
+Nearest evaluated designs.
+
+Designs that differ only in negligible decimals, e.g. of the bilge radius or the transom width, have a different
+Block.key but the same resistance for all practical purposes. DesignIndex finds the evaluated designs near a design in
+the space of the parameters of Block divided by their range, see PARAMETER_BOUNDS. The distance is the largest
+difference of a parameter by default, so a tolerance of 1e-4 is 0.01 % of the range of every parameter.
+
+The index grows with the logarithmic method: a new design goes into a small buffer which is searched brute force. A
+full buffer becomes a static cKDTree, and a tree is merged with the trees which aren't larger than it, like the carry
+of a binary counter. Every design is therefore moved into a new tree O(log n) times and a query searches O(log n)
+trees, without rebuilding the index from scratch.
+"""
+from dataclasses import fields
+import numpy as np
+from build_vessel.parameters import Block, PARAMETER_BOUNDS
+
+# the design vector, the parameters of Block
+NAMES = tuple(f.name for f in fields(Block) if f.init)
+
+
+class DesignIndex:
+    """
+    Arg:
+        scale (dict): range of a parameter, replaces the range of PARAMETER_BOUNDS. A parameter without a range has a
+            scale of 1.
+        p (float): Minkowski norm of the distance, inf is the largest difference of a parameter, 2 is Euclidean.
+        buffer_size (int): designs which are searched brute force before they are moved into a tree.
+    """
+    def __init__(self, scale: dict = None, p: float = np.inf, buffer_size: int = 64) -> None:
+        scale = {**{name: high - low for name, (low, high) in PARAMETER_BOUNDS.items()}, **(scale or {})}
+        self.scale = np.array([scale.get(name, 1.0) for name in NAMES], dtype=float)
+        self.p = p
+        self.buffer_size = buffer_size
+        self._buffer = np.empty((buffer_size, len(NAMES)))
+        self._buffer_ids = np.empty(buffer_size, dtype=int)
+        self._n_buffer = 0
+        self._trees = []  # (cKDTree, ids of its points), the older trees are larger
+        self.values = []
+        self.hits = 0
+        self.misses = 0
+
+    def __len__(self) -> int:
+        return len(self.values)
+
+    @property
+    def n_trees(self) -> int:
+        return len(self._trees)
+
+    def vector(self, design) -> np.ndarray:
+        """
+        Arg:
+            design (Block | dict | np.ndarray): a Block, a dict of the parameters, or design vectors (..., len(NAMES))
+                in the order of NAMES.
+        Return:
+            (np.ndarray): the normalized design vector(s).
+        """
+        if isinstance(design, Block):
+            values = [getattr(design, name) for name in NAMES]
+        elif isinstance(design, dict):
+            values = np.stack([np.asarray(design.get(name, 0), dtype=float) for name in NAMES], axis=-1)
+        else:
+            values = design
+        return np.asarray(values, dtype=float) / self.scale
+
+    def add(self, design, value=None) -> int:
+        """
+        Arg:
+            value: result of the design, e.g. the cached result, returned by lookup.
+        Return:
+            (int): id of the design, the index of its value in values.
+        """
+        vector = self.vector(design)
+        design_id = len(self.values)
+        self.values.append(value)
+        # a design with a nan parameter is never near another design
+        if np.all(np.isfinite(vector)):
+            self._insert(vector, design_id)
+        return design_id
+
+    def extend(self, designs, values: list = None) -> np.ndarray:
+        """Add a batch of designs, e.g. the columns of a DesignTable, as one tree.
+        Arg:
+            designs (dict | np.ndarray): columns of the parameters or design vectors (n, len(NAMES)).
+        Return:
+            (np.ndarray): the ids of the designs.
+        """
+        vectors = self.vector(designs).reshape(-1, len(NAMES))
+        ids = np.arange(len(self.values), len(self.values) + len(vectors))
+        self.values.extend([None] * len(vectors) if values is None else values)
+        finite = np.all(np.isfinite(vectors), axis=1)
+        if finite.sum() < self.buffer_size:
+            for vector, design_id in zip(vectors[finite], ids[finite]):
+                self._insert(vector, design_id)
+        else:
+            self._push(vectors[finite], ids[finite])
+        return ids
+
+    def _insert(self, vector: np.ndarray, design_id: int) -> None:
+        self._buffer[self._n_buffer] = vector
+        self._buffer_ids[self._n_buffer] = design_id
+        self._n_buffer += 1
+        if self._n_buffer == self.buffer_size:
+            self._push(self._buffer.copy(), self._buffer_ids.copy())
+            self._n_buffer = 0
+
+    def _push(self, vectors: np.ndarray, ids: np.ndarray) -> None:
+        from scipy.spatial import cKDTree
+
+        while self._trees and self._trees[-1][0].n <= len(vectors):
+            tree, tree_ids = self._trees.pop()
+            vectors, ids = np.concatenate((tree.data, vectors)), np.concatenate((tree_ids, ids))
+        self._trees.append((cKDTree(vectors), ids))
+
+    def _buffer_distances(self, vector: np.ndarray) -> np.ndarray:
+        return np.linalg.norm(self._buffer[:self._n_buffer] - vector, ord=self.p, axis=1)
+
+    def nearest(self, design, k: int = 1) -> tuple:
+        """
+        Return:
+            distances, ids (tuple[np.ndarray]): of the k nearest designs, the nearest first. Fewer when the index has
+                less than k designs.
+        """
+        vector = self.vector(design)
+        if not np.all(np.isfinite(vector)):
+            return np.empty(0), np.empty(0, dtype=int)
+        distances, ids = [self._buffer_distances(vector)], [self._buffer_ids[:self._n_buffer]]
+        for tree, tree_ids in self._trees:
+            distance, index = tree.query(vector, k=min(k, tree.n), p=self.p)
+            distances.append(np.atleast_1d(distance))
+            ids.append(tree_ids[np.atleast_1d(index)])
+        distances, ids = np.concatenate(distances), np.concatenate(ids)
+        order = np.argsort(distances, kind="stable")[:k]
+        finite = np.isfinite(distances[order])
+        return distances[order][finite], ids[order][finite]
+
+    def within(self, design, tolerance: float) -> tuple:
+        """
+        Return:
+            distances, ids (tuple[np.ndarray]): of all designs within the tolerance, the nearest first.
+        """
+        vector = self.vector(design)
+        if not np.all(np.isfinite(vector)):
+            return np.empty(0), np.empty(0, dtype=int)
+        buffer_distances = self._buffer_distances(vector)
+        near = buffer_distances <= tolerance
+        distances, ids = [buffer_distances[near]], [self._buffer_ids[:self._n_buffer][near]]
+        for tree, tree_ids in self._trees:
+            index = np.array(tree.query_ball_point(vector, tolerance, p=self.p), dtype=int)
+            distances.append(np.linalg.norm(tree.data[index] - vector, ord=self.p, axis=1))
+            ids.append(tree_ids[index])
+        distances, ids = np.concatenate(distances), np.concatenate(ids)
+        order = np.argsort(distances, kind="stable")
+        return distances[order], ids[order]
+
+    def lookup(self, design, tolerance: float, default=None):
+        """Value of the nearest design within the tolerance.
+        Return:
+            the value of the design or default when no design is within the tolerance.
+        """
+        vector = self.vector(design)
+        best, best_id = np.inf, -1
+        if not np.all(np.isfinite(vector)):
+            self.misses += 1
+            return default
+        if self._n_buffer:
+            distances = self._buffer_distances(vector)
+            i = np.argmin(distances)
+            best, best_id = distances[i], self._buffer_ids[i]
+        # a tree only has to find a design nearer than the best so far
+        bound = np.nextafter(min(best, tolerance), np.inf)
+        for tree, tree_ids in self._trees:
+            distance, index = tree.query(vector, k=1, p=self.p, distance_upper_bound=bound)
+            if distance < best:
+                best, best_id = distance, tree_ids[index]
+                bound = np.nextafter(min(best, tolerance), np.inf)
+        if best <= tolerance:
+            self.hits += 1
+            return self.values[best_id]
+        self.misses += 1
+        return default
+
+    def stats(self) -> dict:
+        total = self.hits + self.misses
+        return {"hits": self.hits, "misses": self.misses, "hit_rate": self.hits / total if total else 0.0,
+                "size": len(self), "trees": self.n_trees}
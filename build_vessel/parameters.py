@@ -1,9 +1,9 @@
-from dataclasses import dataclass, field
+from dataclasses import dataclass, field, fields
 from build_vessel.freeboard import min_freeboard
-import pandas as pd
+from build_vessel.intersection import intersect_plane
 import numpy as np
-from enum import Enum
-import copy
+from enum import Enum, IntFlag
+import math
 
 class Direction(Enum):
     """
@@ -19,6 +19,69 @@ class Direction(Enum):
     ZY = 6
 
 
+class Violation(IntFlag):
+    """
+    violated geometric constraints of a design, see violations.
+    """
+    NONE = 0
+    NOT_FINITE = 1  # a parameter is nan or infinite
+    DIMENSION = 2  # lhold, boa or depth is not positive
+    DRAFT = 4  # the minimum freeboard is larger than the depth
+    LAFT = 8  # no aft frames
+    LFORE = 16  # no forward frames, the half angle of entrance is undefined
+    OFFSET_FORWARD = 32  # ctrlpt_offset_forward outside [0, lfore]
+    BILGE_RADIUS = 64  # negative, or larger than the draft or the half breadth
+    TRANSOM_WIDTH = 128  # outside [0, boa]
+    TRANSOM_HEIGHT = 256  # transom_height_action outside [0, 1]
+    WATERPLANE = 512  # control points of the waterplane outside the half breadth or not increasing in x
+
+
+# range of every parameter of Block, the space of the design of experiments and of DesignIndex
+PARAMETER_BOUNDS = {"laft": (1, 40),
+                    "lhold": (25, 125),
+                    "lfore": (1, 40),
+                    "boa": (3, 15),
+                    "depth": (5, 25),
+                    "bilge_radius": (0, 4),
+                    "ctrlpt_offset_forward": (0, 20),
+                    "transom_width": (0, 15),
+                    "transom_height_action": (0, 1)}
+
+
+def violations(block):
+    """Check the parameters of a design without building the frames. Works for a Block as well as for Blocks.
+    Call it before check_done, which changes the draft of an invalid design.
+    Arg:
+        block (Block | Blocks): the design(s).
+    Return:
+        (Violation | np.ndarray): the violations of a Block, or an int array with the violations of every design.
+    """
+    b = block
+    parameters = (b.laft, b.lhold, b.lfore, b.boa, b.depth, b.draft, b.bilge_radius, b.ctrlpt_offset_forward,
+                  b.transom_width, b.transom_height_action)
+    scalar = np.ndim(b.lhold) == 0
+    if scalar:
+        # plain comparisons of floats are much faster than numpy on scalars
+        not_finite = not all(math.isfinite(value) for value in parameters)
+    else:
+        not_finite = ~np.logical_and.reduce([np.isfinite(value) for value in parameters])
+    checks = ((not_finite, Violation.NOT_FINITE),
+              ((b.lhold <= 0) | (b.boa <= 0) | (b.depth <= 0), Violation.DIMENSION),
+              (b.draft <= 0, Violation.DRAFT),
+              (b.laft < 1, Violation.LAFT),
+              (b.lfore < 1, Violation.LFORE),
+              ((b.ctrlpt_offset_forward < 0) | (b.ctrlpt_offset_forward > b.lfore), Violation.OFFSET_FORWARD),
+              ((b.bilge_radius < 0) | (b.bilge_radius > b.draft) | (b.bilge_radius > b.boa), Violation.BILGE_RADIUS),
+              ((b.transom_width < 0) | (b.transom_width > b.boa), Violation.TRANSOM_WIDTH),
+              ((b.transom_height_action < 0) | (b.transom_height_action > 1), Violation.TRANSOM_HEIGHT))
+    if scalar:
+        return Violation(sum(violation.value for condition, violation in checks if condition))
+    codes = np.zeros(np.shape(not_finite), dtype=int)
+    for condition, violation in checks:
+        codes |= np.where(condition, violation.value, 0)
+    return codes
+
+
 class MainDimGenerator:
     """
     This class generates main dimension based on the bale space. 
@@ -70,16 +133,56 @@ class MainDimGenerator:
         
     @property
     def laft(self):
-        return int(np.ceil(self.lhold * self.action[2]))
+        return ceil_int(self.lhold * self.action[2])
         
     @property
     def lfore(self):
-        return int(np.ceil(self.lhold * self.action[3]))
+        return ceil_int(self.lhold * self.action[3])
 
 
-@dataclass
+def ceil_int(value):
+    """ceil to int, for arrays of values as well as a single value.
+    """
+    if isinstance(value, np.ndarray):
+        return np.ceil(value).astype(int)
+    return int(np.ceil(value))
+
+
+def rescale_actions(tanh_output, low, high):
+    range = high - low
+    return tanh_output * range / 2 + (low + (0.5 * range))
+
+
+def block_parameters(action, bale: float) -> dict:
+    """Translate the normalized action (the design vector of ShipEnv.step, 8 values in [-1, 1]) into the parameters
+    of the Block.\n
+    The action can also be a batch of actions, transposed so that action[i] is the i-th parameter of all designs.
+    Return:
+        (dict): keyword arguments of Block.
+    """
+    md = MainDimGenerator(bale=bale)
+    lhold = rescale_actions(action[0], low=25, high=125)
+    boa = rescale_actions(action[1], low=2, high=7) # B/L relation
+    laft = rescale_actions(action[2], low=0, high=0.5) # percentage of lhold
+    lfore = rescale_actions(action[3], low=0, high=0.5) # percentage of lhold
+    md.action = [lhold, boa, laft, lfore]
+    md.maindim()
+    return dict(laft=md.laft,
+                lhold=md.lhold,
+                lfore=md.lfore,
+                boa=md.boa,
+                depth=md.depth_hold,
+                bilge_radius=rescale_actions(action[6], low=0, high=4),
+                ctrlpt_offset_forward=rescale_actions(action[7], low=0, high=md.lfore),
+                transom_width=rescale_actions(action[4], low=0, high=md.boa),
+                transom_height_action=rescale_actions(action[5],low=0,high=1),
+                )
+
+
+@dataclass(slots=True)
 class Block:
-    """Parameters describing the block of the hull shape.
+    """Parameters describing the block of the hull shape. The slots keep many designs in memory small, see
+    build_vessel.table.DesignTable for a columnar table of designs.
     """
     laft: int
     lhold: float
@@ -96,6 +199,7 @@ class Block:
     transom_width: float# reduction in breadth at the transom from the main deck
     transom_height_action: float
     transom_offset:int = 0
+    transom_height: float = field(init=False)
     # default values
 
     def __post_init__(self):
@@ -104,6 +208,19 @@ class Block:
         self.draft = self.depth - min_freeboard(self.loa)
         self.transom_height = abs(self.transom_height_action * self.draft) # This has to be improved because it could make the transom height broken.
     
+    def key(self, decimals: int = 6) -> tuple:
+        """Canonical parameters of the design, rounded to decimals. Designs with the same key have the same hull.
+        """
+        return tuple(round(float(getattr(self, f.name)), decimals) for f in fields(self) if f.init)
+
+    def as_dict(self) -> dict:
+        """all parameters, including the derived ones.
+        """
+        return {f.name: getattr(self, f.name) for f in fields(self)}
+
+    def violations(self) -> Violation:
+        return violations(self)
+
     def check_done(self, action):
         """Check if the actions are valid. If not, return True.\n
         The action space has to be made more maintable.
@@ -115,7 +232,7 @@ class Block:
         else:
             return False
 
-@dataclass
+@dataclass(slots=True)
 class HMInput:
     lpp: float
     B: float
@@ -232,18 +349,19 @@ class CtrlPts:
                     [self.block.loa, self.block.boa, self.block.depth], 
                     [self.block.loa, 0, self.block.depth]]
 
-        # Change 11.48 with function value from finding where the transom intersects with the waterline.
-        self.waterplane = [[0, 11.48, self.block.draft],
+        self.transom = [[0, 0, self.block.transom_height],
+                [0, self.block.transom_width, self.block.transom_height - self.block.transom_offset],
+                [0, self.block.transom_width, self.block.depth]]
+
+        # the waterplane starts where the transom intersects with the waterline.
+        self.intersect_transom = float(intersect_plane(self.transom, 2, self.block.draft, clamp=True)[1][1])
+        self.waterplane = [[0, self.intersect_transom, self.block.draft],
                     [0, self.block.boa, self.block.draft],
                     [self.block.laft, self.block.boa, self.block.draft],
                     [self.block.laft + self.block.lhold, self.block.boa, self.block.draft],
                     [self.block.lwl - self.block.ctrlpt_offset_forward, self.block.boa, self.block.draft],
                     [self.block.lwl, 0, self.block.draft]]
 
-        self.transom = [[0, 0, self.block.transom_height],
-                [0, self.block.transom_width, self.block.transom_height - self.block.transom_offset],
-                [0, self.block.transom_width, self.block.depth]]
-
         # This is a special list with three sublists containing the first order lines aft, the bspline control points of the bulb and the first order lines fore
         bulb_long = [[self.block.lwl, 0, 0],
                     [self.block.loa, 0, 0],
@@ -265,6 +383,15 @@ class CtrlPts:
                     [self.block.lwl, 3, 0],
                     [self.block.lwl, 3, self.block.draft],
                     bulb_long[3]]
+    def violations(self) -> Violation:
+        """violations of the block and of the control points of the waterplane.
+        """
+        codes = violations(self.block)
+        x, y = np.array(self.waterplane, dtype=float)[:, :2].T
+        if np.any(np.diff(x) < 0) or np.any((y < 0) | (y > self.block.boa)):
+            codes |= Violation.WATERPLANE
+        return codes
+
     @property    
     def cross_frames(self):
         return CrossSectionFrames(web_frame=self.web_frame, transom=self.transom, fpp_frame=self.frame_fpp)
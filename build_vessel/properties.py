@@ -4,14 +4,25 @@ This module contains methods that calculate the properties of the ship.
 author: Dorus Boogaard
 """
 import numpy as np
-from scipy.integrate import simpson
+from build_vessel.integration import distinct_stations, simpson
 
 class Properties:
-    def __init__(self, ul : int, n_frames : int, info) -> None:
+    def __init__(self, ul : int, n_frames : int, info, memory: np.ndarray = None, aft_body=None,
+                 segments: tuple = ()) -> None:
+        """
+        Arg:
+            memory (np.ndarray): frames of the hull, e.g. HullBuffer.points. The array is used by reference, without
+                it the frames are copied in with the memory setter.
+            aft_body (AftBody): closed form of the aft body, the frames start at the aft of the hold.
+            segments (tuple): indices of the frames where the sectional area curve has a knuckle, e.g. the ends of the
+                parallel midbody. The curve is integrated per segment.
+        """
         self.info = info
         self.ul = ul
+        self.aft_body = aft_body
+        self.segments = segments
         self._n_evalpts = 100
-        self._memory = np.empty([n_frames, self.n_evalpts, 3])
+        self._memory = np.empty([n_frames, self.n_evalpts, 3]) if memory is None else memory
         self.section_area = np.empty([n_frames, 2])
 
     @property
@@ -43,46 +54,46 @@ class Properties:
         """
         for idx, frame in enumerate(self.memory):
             # z = self.ul - frame[:,2]
-            self.section_area[idx] = [frame[0][0], simpson(frame[:,1], frame[:,2], even='last')]
+            self.section_area[idx] = [frame[0][0], simpson(frame[:,1], frame[:,2])]
     
     @property
     def transom_area(self):
         """immersed transom area
         """
-        area = self.section_area[0][1]
+        area = self.section_area[0][1] if self.aft_body is None else self.aft_body.transom_area
         self.info.transom_area = area
         return area
 
+    def stations(self) -> list:
+        """positions and areas of the frames of every segment, without the frames at the position of the previous
+        frame.
+        """
+        bounds = (0,) + tuple(self.segments) + (len(self.section_area) - 1,)
+        stations = []
+        for start, stop in zip(bounds[:-1], bounds[1:]):
+            x, area = self.section_area[start:stop + 1, 0], self.section_area[start:stop + 1, 1]
+            distinct = distinct_stations(x)
+            stations.append((x[distinct], area[distinct]))
+        return stations
+
     def volume(self) -> float:
-        """This function is soon to be depricated.
+        """integral of the sectional area curve over the positions of the frames.
         """
-        d = self.section_area[1][0] - self.section_area[0][0] 
-        sum_of_arr = 0
-
-        for idx, val in enumerate(self.section_area[:,1]):
-            if idx == 0:
-                sum_of_arr += val
-            elif idx == len(self.section_area[:,1]) - 1:
-                sum_of_arr += val
-            elif idx % 2 == 0:
-                sum_of_arr += val * 2
-            elif idx % 2 == 1:
-                sum_of_arr += val * 4
-        return d  * sum_of_arr / 3
-
-    def volume_scipy(self) -> float:
-        x = np.linspace(0, self.section_area[:,0][-1] - self.section_area[:,0][0] , len(self.section_area[:,1]))
-        volume = simpson(self.section_area[:,1], x)
+        volume = 0 if self.aft_body is None else self.aft_body.volume
+        volume += sum(simpson(area, x) for x, area in self.stations())
         self.info.volume = volume
         return volume
 
     def statical_moment(self) -> float:
-        statical_moment = np.sum(self.section_area[:,0] * self.section_area[:,1])
+        """first moment of the volume about the aft end.
+        """
+        statical_moment = 0 if self.aft_body is None else self.aft_body.statical_moment
+        statical_moment += sum(simpson(x * area, x) for x, area in self.stations())
         self.info.statical_moment = statical_moment
         return statical_moment
 
     def lcb(self) -> float:
-        lcb = self.statical_moment() / self.volume_scipy()
+        lcb = self.statical_moment() / self.volume()
         self.info.lcb = lcb
         return lcb
 
@@ -96,14 +107,14 @@ class Properties:
         return np.sum(self.section_area[:,1])
 
     def prismatic_coefficient(self, area_wbfrm : float, lwl: float) -> float:
-        c_p = self.volume_scipy() / (area_wbfrm * lwl)
+        c_p = self.volume() / (area_wbfrm * lwl)
         self.info.prismatic_coefficient = c_p
         return c_p
 
     def block_coefficient(self, lwl, boa, draft) -> float:
         """Block coefficient defined at the draft.
         """
-        c_b = self.volume_scipy() / (lwl * boa * draft)
+        c_b = self.volume() / (lwl * boa * draft)
         self.info.block_coefficient = c_b
         return c_b
 
@@ -116,6 +127,12 @@ class Properties:
         return ie
 
 class Info:
+    """Properties of an evaluated design. The attributes are slots, use as_dict and update instead of __dict__.
+    """
+    __slots__ = ("laft", "lhold", "lfore", "lwl", "half_boa", "draft", "transom_area", "volume", "statical_moment",
+                 "lcb", "prismatic_coefficient", "block_coefficient", "ie", "c_wp", "c_m", "fidelity", "screening",
+                 "cache", "timing", "resistance", "violations", "resolution", "error")
+
     def __init__(self) -> None:
         self.laft = None
         self.lhold = None
@@ -132,6 +149,13 @@ class Info:
         self.ie = None
         self.c_wp = None
         self.c_m = None
+        self.fidelity = None
+        self.screening = None
+        self.cache = None
+        self.timing = None
+        self.resistance = None
+        self.violations = None
+        self.resolution = None
         self.error = {}
 
     def __str__(self) -> str:
@@ -146,8 +170,15 @@ class Info:
         else:
             return None  
 
+    def as_dict(self) -> dict:
+        return {name: getattr(self, name) for name in self.__slots__}
+
+    def update(self, values: dict) -> None:
+        for name, value in values.items():
+            setattr(self, name, value)
+
     def print_info(self) -> dict:
-        for key, value in self.__dict__.items():
+        for key, value in self.as_dict().items():
             print(f"{key} = {value}")
     
 
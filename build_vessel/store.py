@@ -0,0 +1,157 @@
+"""
+Persistent store of evaluated designs, shared by training runs and by the workers of a SubprocVecEnv.
+
+The store is a SQLite database in WAL mode, so several processes can read while one writes. Results are written in
+batches to keep the overhead per step small. The key is a hash of Block.key and the evaluation settings, a result
+is therefore only reused when the velocity, the bale, the resolution of the frames and the code version are equal.
+
+usage:
+    python -m build_vessel.store designs.csv --store evaluations.sqlite --velocity 12 --bale 8000
+
+designs.csv has a column for each parameter of Block, see Block.key.
+"""
+import argparse
+import csv
+import hashlib
+import json
+import sqlite3
+import numpy as np
+
+# Increase when a change of the geometry or resistance pipeline changes the results.
+CODE_VERSION = 6
+
+
+def _to_json(value):
+    if isinstance(value, np.generic):
+        return value.item()
+    if isinstance(value, np.ndarray):
+        return value.tolist()
+    return str(value)
+
+
+class EvaluationStore:
+    """
+    Arg:
+        path (str): SQLite database, created when it doesn't exist.
+        batch_size (int): number of results buffered before they are written.
+        timeout (float): seconds to wait for a lock held by another process.
+    """
+    def __init__(self, path: str, batch_size: int = 64, timeout: float = 30.0) -> None:
+        self.path = path
+        self.batch_size = batch_size
+        self._pending = {}
+        self.connection = sqlite3.connect(path, timeout=timeout)
+        self.connection.execute("PRAGMA journal_mode=WAL")
+        self.connection.execute("PRAGMA synchronous=NORMAL")
+        self.connection.execute("CREATE TABLE IF NOT EXISTS evaluations "
+                                "(key TEXT PRIMARY KEY, resistance REAL, input_reward REAL, info TEXT)")
+        self.connection.commit()
+
+    @staticmethod
+    def key(block_key: tuple, velocity: float, bale: float, resolution: int = 100, version: int = CODE_VERSION) -> str:
+        """
+        Arg:
+            block_key (tuple): Block.key of the design.
+            resolution (int): number of points per frame.
+        Return:
+            (str): hash of the design and the evaluation settings.
+        """
+        settings = json.dumps([list(block_key), float(velocity), float(bale), int(resolution), version])
+        return hashlib.sha1(settings.encode()).hexdigest()
+
+    def __len__(self) -> int:
+        self.flush()
+        return self.connection.execute("SELECT COUNT(*) FROM evaluations").fetchone()[0]
+
+    def __contains__(self, key: str) -> bool:
+        return self.get(key) is not None
+
+    def get(self, key: str):
+        """
+        Return:
+            (tuple): resistance, input_reward and info dict, None when the design is not in the store.
+        """
+        if key in self._pending:
+            return self._pending[key]
+        row = self.connection.execute("SELECT resistance, input_reward, info FROM evaluations WHERE key = ?",
+                                      (key,)).fetchone()
+        if row is None:
+            return None
+        resistance, input_reward, info = row
+        return resistance, input_reward, json.loads(info)
+
+    def put(self, key: str, resistance: float, input_reward: float, info: dict) -> None:
+        self._pending[key] = (float(resistance), float(input_reward), info)
+        if len(self._pending) >= self.batch_size:
+            self.flush()
+
+    def flush(self) -> None:
+        """Write the buffered results in one transaction. Results that another process wrote first are kept.
+        """
+        if not self._pending:
+            return
+        rows = [(key, resistance, input_reward, json.dumps(info, default=_to_json))
+                for key, (resistance, input_reward, info) in self._pending.items()]
+        with self.connection:
+            self.connection.executemany("INSERT OR IGNORE INTO evaluations VALUES (?, ?, ?, ?)", rows)
+        self._pending.clear()
+
+    def close(self) -> None:
+        self.flush()
+        self.connection.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+
+def warm(store: EvaluationStore, designs: list, velocity: float, bale: float, chunk_size: int = 256) -> int:
+    """Evaluate the designs which are not in the store yet with BatchHull.
+    Arg:
+        designs (list[dict]): keyword arguments of Block.
+    Return:
+        (int): number of evaluated designs.
+    """
+    from build_vessel.batch import Blocks, BatchHull
+    from build_vessel.parameters import Block
+    from HoltropMennen import HoltropMennen
+
+    keys = [EvaluationStore.key(Block(**design).key(), velocity, bale) for design in designs]
+    todo = [i for i, key in enumerate(keys) if store.get(key) is None]
+    for start in range(0, len(todo), chunk_size):
+        chunk = todo[start:start + chunk_size]
+        blocks = Blocks(**{name: np.array([designs[i][name] for i in chunk]) for name in designs[chunk[0]]})
+        blocks.check_done()
+        hull = BatchHull(blocks)
+        properties = hull.properties()
+        hm_input = hull.hm_input(velocity, properties)
+        resistance = HoltropMennen(hm_input).total_resistance()
+        for j, i in enumerate(chunk):
+            info = {name: value[j] for name, value in properties.items()}
+            info["fidelity"] = "high"
+            store.put(keys[i], resistance[j], hm_input.reward_correct_input[j], info)
+    store.flush()
+    return len(todo)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Warm the evaluation store from a csv file of designs.")
+    parser.add_argument("designs", help="csv file with a column for each parameter of Block")
+    parser.add_argument("--store", default="evaluations.sqlite")
+    parser.add_argument("--velocity", type=float, default=12)
+    parser.add_argument("--bale", type=float, default=8000)
+    args = parser.parse_args()
+
+    with open(args.designs, newline="") as f:
+        designs = [{name: float(value) for name, value in row.items()} for row in csv.DictReader(f)]
+    for design in designs:
+        design["laft"], design["lfore"] = int(design["laft"]), int(design["lfore"])
+    with EvaluationStore(args.store) as store:
+        n_evaluated = warm(store, designs, args.velocity, args.bale)
+        print(f"evaluated {n_evaluated} of {len(designs)} designs, {len(store)} designs in {args.store}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,175 @@
+"""
+Columnar table of designs and their results.
+
+A DesignTable keeps the parameters of many Blocks and the results of their evaluation in NumPy columns, 8 bytes per
+value instead of a Python object per design and per value. Rows are appended one at a time or a batch at a time and
+the columns double their capacity when they are full.
+
+conversions:
+    Block           append, block(i) builds the Block from its row without Block.__post_init__
+    Blocks          extend(blocks), blocks() for BatchHull
+    columns         extend(columns), e.g. doe.evaluate_chunk or a DataFrame of doe.load_sweep, columns()
+    DataFrame       to_pandas
+    npz file        save, load
+"""
+from dataclasses import fields
+import numpy as np
+from build_vessel.batch import Blocks
+from build_vessel.parameters import Block
+
+# the parameters of Block followed by the derived lwl, loa, draft and transom_height
+PARAMETERS = tuple(f.name for f in fields(Block) if f.init)
+BLOCK_COLUMNS = PARAMETERS + tuple(f.name for f in fields(Block) if not f.init)
+INTEGERS = ("laft", "lfore")
+
+
+def _missing(dtype: np.dtype):
+    """value of the rows without a value in a column, nan in the numeric columns of results.
+    """
+    return np.nan if np.issubdtype(dtype, np.floating) else np.zeros((), dtype=dtype).item()
+
+
+class DesignTable:
+    """
+    Arg:
+        capacity (int): number of rows before the columns grow.
+    """
+    def __init__(self, capacity: int = 1024) -> None:
+        self._columns = {name: np.empty(capacity, dtype=int if name in INTEGERS else float) for name in BLOCK_COLUMNS}
+        self._length = 0
+
+    def __len__(self) -> int:
+        return self._length
+
+    @property
+    def capacity(self) -> int:
+        return len(self._columns["laft"])
+
+    @property
+    def names(self) -> tuple:
+        return tuple(self._columns)
+
+    @property
+    def nbytes(self) -> int:
+        return sum(column.nbytes for column in self._columns.values())
+
+    def __getitem__(self, name: str) -> np.ndarray:
+        """the column, a view which is valid until the table grows.
+        """
+        return self._columns[name][:self._length]
+
+    def _reserve(self, n: int) -> None:
+        if self._length + n <= self.capacity:
+            return
+        capacity = max(2 * self.capacity, self._length + n)
+        for name, column in self._columns.items():
+            grown = np.empty(capacity, dtype=column.dtype)
+            grown[:self._length] = column[:self._length]
+            self._columns[name] = grown
+
+    def _add_column(self, name: str, dtype: np.dtype) -> None:
+        # an integer result is stored as float, so a row without a value isn't a 0
+        if np.issubdtype(dtype, np.integer) or np.issubdtype(dtype, np.bool_):
+            dtype = float
+        column = np.empty(self.capacity, dtype=dtype)
+        column[:self._length] = _missing(column.dtype)
+        self._columns[name] = column
+
+    def _write(self, start: int, stop: int, values: dict) -> None:
+        for name, value in values.items():
+            value = np.asarray(value)
+            if name not in self._columns:
+                self._add_column(name, value.dtype)
+            self._columns[name][start:stop] = value
+        for name, column in self._columns.items():
+            if name not in values:
+                column[start:stop] = _missing(column.dtype)
+        self._length = stop
+
+    def append(self, block: Block, **results) -> int:
+        """
+        Arg:
+            results: numbers of the design, e.g. the resistance or the volume of Info, a new name adds a column. The
+                numeric results are floats, nan for the rows without the result.
+        Return:
+            (int): index of the row.
+        """
+        self._reserve(1)
+        row = self._length
+        self._write(row, row + 1, {**{name: getattr(block, name) for name in BLOCK_COLUMNS}, **results})
+        return row
+
+    def extend(self, columns, **results) -> None:
+        """Append a batch of designs.
+        Arg:
+            columns (Blocks | dict): the designs, a dict or a DataFrame of columns has at least the parameters of
+                Block and may have results. The derived parameters are computed when they are missing.
+            results: columns of results of the designs.
+        """
+        if isinstance(columns, Blocks):
+            columns = {name: getattr(columns, name) for name in BLOCK_COLUMNS}
+        else:
+            columns = {name: np.asarray(value) for name, value in columns.items()}
+        if any(name not in columns for name in BLOCK_COLUMNS):
+            blocks = Blocks(**{name: columns[name] for name in PARAMETERS if name in columns})
+            columns.update({name: getattr(blocks, name) for name in BLOCK_COLUMNS if name not in columns})
+        values = {**columns, **results}
+        n = len(values["laft"])
+        self._reserve(n)
+        self._write(self._length, self._length + n, values)
+
+    @classmethod
+    def from_blocks(cls, blocks: list, **results) -> "DesignTable":
+        """
+        Arg:
+            blocks (list[Block]): the designs.
+            results: a sequence of values per result, one value per design.
+        """
+        table = cls(max(len(blocks), 1))
+        columns = {name: [getattr(block, name) for block in blocks] for name in BLOCK_COLUMNS}
+        table.extend(columns, **results)
+        return table
+
+    def block(self, i: int) -> Block:
+        """the Block of row i, with the parameters of the row, also a changed draft, see Block.check_done.
+        """
+        if not -self._length <= i < self._length:
+            raise IndexError(f"row {i} of a table of {self._length} designs")
+        block = object.__new__(Block)
+        for name in BLOCK_COLUMNS:
+            setattr(block, name, self[name][i].item())
+        return block
+
+    def row(self, i: int) -> dict:
+        return {name: self[name][i].item() for name in self._columns}
+
+    def blocks(self):
+        """
+        Return:
+            (Blocks): the designs of the table, e.g. for BatchHull.
+        """
+        blocks = Blocks(**{name: self[name] for name in PARAMETERS})
+        blocks.draft, blocks.transom_height = self["draft"].copy(), self["transom_height"].copy()
+        return blocks
+
+    def columns(self, names: list = None) -> dict:
+        """
+        Return:
+            (dict): copies of the columns.
+        """
+        return {name: self[name].copy() for name in (self._columns if names is None else names)}
+
+    def to_pandas(self):
+        import pandas as pd
+
+        return pd.DataFrame(self.columns())
+
+    def save(self, path: str) -> None:
+        np.savez(path, **self.columns())
+
+    @classmethod
+    def load(cls, path: str) -> "DesignTable":
+        with np.load(path) as data:
+            table = cls(max(len(data["laft"]), 1))
+            table.extend({name: data[name] for name in data.files})
+        return table
@@ -0,0 +1,102 @@
+"""
+Timers for the stages of the evaluation of a design.
+
+usage:
+    timer = StageTimer()
+    with timer.stage("frames_aft"):
+        ...
+    timer.last        # seconds per stage of the current step
+    timer.summary()   # count, mean and percentiles per stage of all steps
+
+A disabled timer returns the same empty context manager for every stage, so the instrumentation costs one attribute
+lookup and a method call per stage.
+"""
+import json
+import time
+from array import array
+from contextlib import nullcontext
+import numpy as np
+
+_NULL = nullcontext()
+
+
+class _Stage:
+    __slots__ = ("timer", "name", "start")
+
+    def __init__(self, timer, name: str) -> None:
+        self.timer = timer
+        self.name = name
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.timer.add(self.name, time.perf_counter() - self.start)
+
+
+class StageTimer:
+    """
+    Arg:
+        enabled (bool): record the timings, a disabled timer does nothing.
+        percentiles (tuple): percentiles reported by summary.
+    """
+    def __init__(self, enabled: bool = True, percentiles: tuple = (50, 90, 99)) -> None:
+        self.enabled = enabled
+        self.percentiles = percentiles
+        self.last = {}
+        self.samples = {}
+
+    def stage(self, name: str):
+        if not self.enabled:
+            return _NULL
+        return _Stage(self, name)
+
+    def add(self, name: str, seconds: float) -> None:
+        """Add the time of a stage to the current step, a stage that runs twice in a step is summed.
+        """
+        self.last[name] = self.last.get(name, 0.0) + seconds
+
+    def start_step(self) -> None:
+        """Move the timings of the previous step to the samples.
+        """
+        if not self.last:
+            return
+        for name, seconds in self.last.items():
+            self.samples.setdefault(name, array('d')).append(seconds)
+        self.last = {}
+
+    def merge(self, samples: dict) -> None:
+        """Add the samples of another timer, e.g. of the workers of a SubprocVecEnv.
+        """
+        for name, seconds in samples.items():
+            self.samples.setdefault(name, array('d')).extend(seconds)
+
+    def summary(self) -> dict:
+        """
+        Return:
+            (dict): per stage the count, total, mean and the percentiles in seconds.
+        """
+        self.start_step()
+        summary = {}
+        for name, seconds in self.samples.items():
+            seconds = np.array(seconds)
+            summary[name] = {"count": len(seconds), "total": float(seconds.sum()), "mean": float(seconds.mean())}
+            for q, value in zip(self.percentiles, np.percentile(seconds, self.percentiles)):
+                summary[name][f"p{q}"] = float(value)
+        return summary
+
+    def dump(self, path: str) -> dict:
+        """Write the summary to a json file.
+        """
+        summary = self.summary()
+        with open(path, "w") as f:
+            json.dump(summary, f, indent=2)
+        return summary
+
+    def reset(self) -> None:
+        self.last = {}
+        self.samples = {}
+
+
+NULL_TIMER = StageTimer(enabled=False)
@@ -1,21 +1,20 @@
 import numpy as np
 import logging
-from geomdl import BSpline, utilities
 from scipy.integrate import simpson
 
-logging.basicConfig(filename='vessel_env.log', level=logging.INFO, format='%(asctime)s %(message)s', datefmt='%m/%d/%Y %I:%M:%S %p')
+# the handlers are configured by the application, not at import.
 log = logging.getLogger(__name__)
 
 class WaterPlane:
-	def __init__(self, waterline) -> None:
-		self._delta = 0.01
-		self.intersect_transom = 11.48
+	def __init__(self, waterline, delta: float = 0.01) -> None:
+		self._delta = delta
 		self.water_plane_ctrl_points = waterline
+		self.intersect_transom = waterline[0][1]  # see CtrlPts.intersect_transom
 
 	@property
 	def area(self) -> float:
 		x, y = self.water_plane_points[:,0], self.water_plane_points[:,1]
-		return simpson(y, x)
+		return simpson(y, x=x)
 
 	def c_wp(self, lwl, boa) -> float:
 		lb = lwl * boa
@@ -38,12 +37,13 @@ class WaterPlane:
 		self._delta = delta
 
 	# BSpline methods
-	def b_spline(self, start : int = None, stop : int = None, degree : int = None) -> BSpline.Curve:
+	def b_spline(self, start : int = None, stop : int = None, degree : int = None):
 		"""
 		Arg:
 			start (int) : start of the main_deck_points list
 			stop (int) : end of the main_deck_points list
 		"""
+		from geomdl import BSpline, utilities
 		curve = BSpline.Curve()
 		if start:
 			ctrlpt = self.water_plane_ctrl_points[start:]
@@ -73,7 +73,6 @@ if __name__ == '__main__':
 
 	block = Block()
 	wp = WaterPlane(block)
-	wp.intersect_transom = 11.48 # replaced in main with closest_value() 
 	data_points = wp.water_plane_points
 	print(data_points[:,1])
 	print(f"The waterplane area is {wp.area}")
@@ -0,0 +1,267 @@
+"""
+Design of experiments over the parameters of Block.
+
+A plan (Latin hypercube, Sobol or full factorial) is split in chunks of designs. The chunks are evaluated with
+BatchHull on a process pool and every chunk is written to the output directory as one npz file, via a temporary file,
+so a chunk file is complete or absent. Running the same plan again skips the chunk files that exist, which resumes the
+sweep after a crash. Designs of another plan which are already in the output are skipped as well.
+
+usage:
+    python doe.py --method sobol --n 200000 --workers 8 --output doe/sobol
+    python doe.py --method factorial --levels 4 --output doe/factorial
+
+    df = load_sweep("doe/sobol")
+"""
+import argparse
+import hashlib
+import json
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor, FIRST_COMPLETED, wait
+from pathlib import Path
+import numpy as np
+from build_vessel.parameters import PARAMETER_BOUNDS
+from build_vessel.store import CODE_VERSION
+
+# range of every parameter of Block, laft and lfore are rounded to integers
+BOUNDS = PARAMETER_BOUNDS
+INTEGERS = ("laft", "lfore")
+METHODS = ("lhs", "sobol", "factorial")
+
+
+class DesignPlan:
+    """
+    Arg:
+        method (str): lhs, sobol or factorial.
+        n (int): number of designs of a Latin hypercube or Sobol plan.
+        levels (int): levels per parameter of a factorial plan, which has levels ** len(bounds) designs.
+        bounds (dict): (low, high) per parameter of Block, replaces the range of BOUNDS.
+    """
+    def __init__(self, method: str = "lhs", n: int = 1000, levels: int = 3, bounds: dict = None, seed: int = 0) -> None:
+        if method not in METHODS:
+            raise ValueError(f"method should be one of {METHODS}")
+        self.method = method
+        self.levels = levels
+        self.bounds = {**BOUNDS, **(bounds or {})}
+        self.seed = seed
+        self.low, self.high = np.array(list(self.bounds.values()), dtype=float).T
+        dimension = len(self.bounds)
+        if method == "factorial":
+            self.n = levels ** dimension
+            self._unit = None  # the designs are computed per chunk
+        elif method == "lhs":
+            from scipy.stats import qmc
+            self.n = n
+            self._unit = qmc.LatinHypercube(d=dimension, seed=seed).random(n)
+        else:
+            from scipy.stats import qmc
+            self.n = n
+            # the first n points of the next power of two, which avoids the warning of scipy
+            m = int(np.ceil(np.log2(max(n, 1))))
+            self._unit = qmc.Sobol(d=dimension, seed=seed).random_base2(m)[:n]
+
+    def __len__(self) -> int:
+        return self.n
+
+    @property
+    def spec(self) -> dict:
+        spec = {"method": self.method, "bounds": self.bounds, "seed": self.seed}
+        spec.update({"levels": self.levels} if self.method == "factorial" else {"n": self.n})
+        return spec
+
+    @property
+    def id(self) -> str:
+        return hashlib.sha1(json.dumps(self.spec, sort_keys=True).encode()).hexdigest()[:8]
+
+    def designs(self, start: int, stop: int) -> dict:
+        """
+        Return:
+            (dict): arrays of the parameters of the designs start to stop, keyword arguments of Blocks.
+        """
+        stop = min(stop, self.n)
+        if self.method == "factorial":
+            index = np.array(np.unravel_index(np.arange(start, stop), (self.levels,) * len(self.bounds))).T
+            unit = index / max(self.levels - 1, 1)
+        else:
+            unit = self._unit[start:stop]
+        values = self.low + unit * (self.high - self.low)
+        designs = dict(zip(self.bounds, values.T))
+        for name in INTEGERS:
+            if name in designs:
+                designs[name] = np.rint(designs[name]).astype(int)
+        return designs
+
+
+def design_keys(designs: dict, decimals: int = 6) -> np.ndarray:
+    """rows of the rounded parameters as bytes, equal designs have equal keys. See Block.key.
+    """
+    rows = np.round(np.column_stack([np.asarray(designs[name], dtype=float) for name in BOUNDS]), decimals) + 0.0
+    return np.ascontiguousarray(rows).view(f"V{rows.shape[1] * rows.itemsize}").ravel()
+
+
+def evaluate_chunk(designs: dict, velocity: float) -> dict:
+    """Evaluate the designs with BatchHull, like build_vessel.store.warm.
+    Return:
+        (dict): columns of the parameters, the hydrostatic properties, the resistance, input_reward, done, which
+            is True for a design that ends the episode of ShipEnv, and the violation codes, see Block.violations.
+    """
+    from build_vessel.batch import Blocks, BatchHull
+    from HoltropMennen import HoltropMennen
+
+    columns = {name: np.asarray(value) for name, value in designs.items()}
+    n = len(next(iter(columns.values())))
+    if n == 0:
+        return columns
+    with np.errstate(all="ignore"):
+        blocks = Blocks(**designs)
+        violations = blocks.violations()
+        done = blocks.check_done()
+        hull = BatchHull(blocks)
+        properties = hull.properties()
+        hm_input = hull.hm_input(velocity, properties)
+        resistance = HoltropMennen(hm_input).total_resistance()
+    columns.update({name: np.asarray(value) for name, value in properties.items() if name not in columns})
+    columns.update(resistance=np.asarray(resistance, dtype=float), input_reward=hm_input.reward_correct_input,
+                   done=done, violations=violations)
+    return columns
+
+
+def _write_chunk(path: Path, columns: dict) -> None:
+    tmp = path.with_name(f"tmp-{path.name}")
+    np.savez(tmp, **columns)
+    os.replace(tmp, path)
+
+
+def _check_settings(output: Path, velocity: float) -> None:
+    settings = {"velocity": float(velocity), "code_version": CODE_VERSION}
+    path = output / "settings.json"
+    if path.exists():
+        with open(path) as f:
+            existing = json.load(f)
+        if existing != settings:
+            raise ValueError(f"{output} has results of other settings {existing}, expected {settings}")
+    else:
+        with open(path, "w") as f:
+            json.dump(settings, f)
+
+
+def existing_keys(output: str) -> set:
+    keys = set()
+    for path in Path(output).glob("*-chunk-*.npz"):
+        with np.load(path) as data:
+            if data.files:
+                keys.update(design_keys({name: data[name] for name in BOUNDS}).tolist())
+    return keys
+
+
+def run_doe(plan: DesignPlan, output: str, velocity: float = 12, chunk_size: int = 4096, workers: int = 0,
+            verbose: bool = True) -> dict:
+    """
+    Arg:
+        output (str): directory of the chunk files, created when it doesn't exist.
+        workers (int): processes evaluating the chunks, 0 evaluates in this process.
+    Return:
+        (dict): number of evaluated and skipped designs, the wall clock time and the designs per second.
+    """
+    output = Path(output)
+    output.mkdir(parents=True, exist_ok=True)
+    _check_settings(output, velocity)
+    with open(output / f"{plan.id}-plan.json", "w") as f:
+        json.dump(plan.spec, f, indent=2)
+
+    n_chunks = -(-len(plan) // chunk_size)
+    # the chunk size is part of the name, the chunks of another size contain other designs
+    paths = [output / f"{plan.id}_{chunk_size}-chunk-{i:06d}.npz" for i in range(n_chunks)]
+    todo = [i for i in range(n_chunks) if not paths[i].exists()]
+    seen = existing_keys(output) if todo else set()
+    skipped = len(plan) - sum(min(chunk_size, len(plan) - i * chunk_size) for i in todo)
+
+    def pending():
+        """designs of the chunks to do without the designs in the output and the duplicates of the plan."""
+        nonlocal skipped
+        for i in todo:
+            designs = plan.designs(i * chunk_size, (i + 1) * chunk_size)
+            keys = design_keys(designs).tolist()
+            new = np.array([key not in seen and not seen.add(key) for key in keys], dtype=bool)
+            skipped += len(new) - new.sum()
+            yield i, {name: value[new] for name, value in designs.items()}
+
+    evaluated = 0
+    start = time.perf_counter()
+
+    def report(i, columns):
+        nonlocal evaluated
+        _write_chunk(paths[i], columns)
+        evaluated += len(columns["laft"])
+        if verbose:
+            elapsed = time.perf_counter() - start
+            rate = evaluated / elapsed if elapsed > 0 else 0.0
+            remaining = len(plan) - evaluated - skipped
+            eta = remaining / rate if rate > 0 else float("nan")
+            print(f"{evaluated + skipped}/{len(plan)} designs, {rate:.0f} designs/s, eta {eta:.0f} s", flush=True)
+
+    if workers:
+        with ProcessPoolExecutor(workers) as pool:
+            futures = {}
+            for i, designs in pending():
+                # a bounded number of chunks in flight keeps the memory of the plan small
+                if len(futures) >= 2 * workers:
+                    done, _ = wait(futures, return_when=FIRST_COMPLETED)
+                    for future in done:
+                        report(futures.pop(future), future.result())
+                futures[pool.submit(evaluate_chunk, designs, velocity)] = i
+            for future in list(futures):
+                report(futures.pop(future), future.result())
+    else:
+        for i, designs in pending():
+            report(i, evaluate_chunk(designs, velocity))
+
+    elapsed = time.perf_counter() - start
+    return {"evaluated": evaluated, "skipped": int(skipped), "wall_clock": elapsed,
+            "designs_per_second": evaluated / elapsed if elapsed > 0 else 0.0}
+
+
+def load_sweep(output: str, columns: list = None):
+    """
+    Arg:
+        columns (list): load only these columns.
+    Return:
+        (pandas.DataFrame): the designs of all chunk files in the output.
+    """
+    import pandas as pd
+
+    frames = []
+    for path in sorted(Path(output).glob("*-chunk-*.npz")):
+        with np.load(path) as data:
+            names = data.files if columns is None else [name for name in columns if name in data.files]
+            frames.append(pd.DataFrame({name: data[name] for name in names}))
+    if not frames:
+        return pd.DataFrame(columns=columns)
+    return pd.concat(frames, ignore_index=True)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--method", choices=METHODS, default="lhs")
+    parser.add_argument("--n", type=int, default=10000, help="designs of a Latin hypercube or Sobol plan")
+    parser.add_argument("--levels", type=int, default=3, help="levels per parameter of a factorial plan")
+    parser.add_argument("--bounds", default=None, help="json file with [low, high] per parameter of Block")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--velocity", type=float, default=12)
+    parser.add_argument("--chunk-size", type=int, default=4096)
+    parser.add_argument("--workers", type=int, default=0)
+    parser.add_argument("--output", default="doe")
+    args = parser.parse_args()
+
+    bounds = None
+    if args.bounds:
+        with open(args.bounds) as f:
+            bounds = {name: tuple(value) for name, value in json.load(f).items()}
+    plan = DesignPlan(args.method, args.n, args.levels, bounds, args.seed)
+    summary = run_doe(plan, args.output, args.velocity, args.chunk_size, args.workers)
+    print(f"evaluated {summary['evaluated']}, skipped {summary['skipped']} designs in {summary['wall_clock']:.1f} s "
+          f"({summary['designs_per_second']:.0f} designs/s)")
+
+
+if __name__ == "__main__":
+    main()
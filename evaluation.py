@@ -0,0 +1,165 @@
+"""
+Evaluation of a single design without the environment.
+
+evaluate maps the parameters of a design to a record of the hydrostatics, the Holtrop and Mennen input and the
+resistance components. It keeps no state and doesn't import gym or pyvista, so the designs and the records can be
+send to the workers of a process pool and the function can be used by optimizers, sweeps and ShipEnv alike.
+
+usage:
+    from evaluation import evaluate
+    record = evaluate(dict(laft=30, lhold=150, lfore=20, boa=16, depth=13, bilge_radius=2, ctrlpt_offset_forward=7,
+                           transom_width=14, transom_height_action=0.8), velocity=12, bale=8000)
+    record.resistance["total"]
+"""
+from dataclasses import dataclass
+from typing import NamedTuple
+import numpy as np
+from HoltropMennen import HoltropMennen
+from build_vessel.aft_body import AftBody
+from build_vessel.cross_section import CrossSection, BuildFrames, HullBuffer
+from build_vessel.parameters import Block, CtrlPts, HMInput
+from build_vessel.properties import Properties, Info
+from build_vessel.timing import StageTimer, NULL_TIMER
+from build_vessel.utils import modify_control_points
+from build_vessel.waterplane import WaterPlane
+
+
+class Frames(NamedTuple):
+    points: np.ndarray  # frames x points x (x, y, z)
+    web_frame: CrossSection
+    waterplane: WaterPlane
+    builder: BuildFrames
+    aft_body: AftBody
+    n_aft: int  # number of aft frames in the points, the midship frames follow
+
+
+def build_frames(ctrlpts: CtrlPts, plot: bool = False, timer: StageTimer = NULL_TIMER,
+                 buffer: HullBuffer = None, aft: bool = True, resolution: int = None) -> Frames:
+    """Sample the frames of the aft body, the parallel midbody and the fore body.
+    Arg:
+        plot (bool): add the frames to the pyvista Plotter of the BuildFrames.
+        aft (bool): sample the aft frames, which are only needed for a plot. The hydrostatics of the aft body follow
+            from the AftBody.
+        timer (StageTimer): times the stages frames_aft, frames_mid and frames_fore.
+        buffer (HullBuffer): the stages write the frames into the buffer, the points of the Frames are a view of it
+            and are overwritten by the next hull build in the same buffer.
+        resolution (int): points per frame and number of forward frames, BuildFrames.n_evalpts when not given.
+    """
+    block = ctrlpts.block
+    resolution = BuildFrames.n_evalpts if resolution is None else resolution
+    delta = 1 / resolution
+    web_frame = CrossSection(ctrlpts.cross_frames.web_frame, delta)
+    # control points at the aft and the fore end of the hold based on the web frame
+    hold_aft_ctrlpts = modify_control_points(ctrlpts.web_frame, 0, block.laft)
+    hold_aft = CrossSection(hold_aft_ctrlpts, delta)
+    hold_fore = CrossSection(modify_control_points(ctrlpts.web_frame, 0, block.laft + block.lhold), delta)
+    waterplane = WaterPlane(ctrlpts.waterlines.waterplane, delta)
+
+    builder = BuildFrames(waterplane, block.laft, block.draft, plot=plot, n_evalpts=resolution)
+    buffer = HullBuffer(resolution) if buffer is None else buffer
+    n_aft = block.laft if aft else 0
+    buffer.allocate(n_aft, len(waterplane.forward), n_evalpts=resolution)
+    with timer.stage("frames_aft"):
+        aft_body = AftBody.from_ctrlpts(ctrlpts)
+        if aft:
+            builder.aft(block.laft, hold_aft_ctrlpts, ctrlpts.transom, out=buffer.aft)
+    with timer.stage("frames_mid"):
+        builder.midship(hold_aft.points, hold_fore.points, out=buffer.mid)
+    with timer.stage("frames_fore"):
+        builder.forward(hold_fore.points, out=buffer.fore)
+    return Frames(buffer.points, web_frame, waterplane, builder, aft_body, n_aft)
+
+
+def hull_input(block: Block, velocity: float, info: Info, frames: Frames = None,
+               timer: StageTimer = NULL_TIMER, resolution: int = None) -> HMInput:
+    """The full geometry pipeline.
+    Arg:
+        info (Info): filled with the hydrostatic properties of the design.
+        frames (Frames): frames of the block, build when not given.
+        timer (StageTimer): times the stages ctrlpts, frames_*, area and coefficients.
+        resolution (int): resolution of the frames that are build, see build_frames.
+    Return:
+        hm_input: HMInput derived from the frames of the hull.
+    """
+    if frames is None:
+        with timer.stage("ctrlpts"):
+            ctrlpts = CtrlPts(block)
+        frames = build_frames(ctrlpts, timer=timer, aft=False, resolution=resolution)
+    # the aft body in closed form, the parallel midbody and the fore body from their frames
+    points = frames.points[frames.n_aft:]
+    prop = Properties(block.draft, len(points), info, memory=points, aft_body=frames.aft_body, segments=(1,))
+    with timer.stage("area"):
+        prop.area()
+
+    with timer.stage("coefficients"):
+        c_m = frames.web_frame.cross_section_coefficient()
+        info.c_m = c_m
+        info.c_wp = frames.waterplane.c_wp(block.lwl, block.boa)
+        hm_input = HMInput(lpp=block.lwl,
+                       B=block.boa * 2,
+                       t_f=block.draft,
+                       t_a=block.draft,
+                       displ=prop.volume() * 2 * 1.025,
+                       lcb=prop.lcb_ratio(block.lwl),
+                       c_m=c_m,
+                       c_wp=info.c_wp,
+                       c_b=prop.block_coefficient(block.lwl, block.boa, block.draft),
+                       a_t=prop.transom_area,
+                       c_prism=prop.prismatic_coefficient(frames.web_frame.area, block.lwl),
+                       ie=prop.ie(block.boa, block.lfore),
+                       velocity=velocity,
+                       )
+    return hm_input
+
+
+def resistance_components(hm_input: HMInput, timer: StageTimer = NULL_TIMER) -> dict:
+    """
+    Return:
+        (dict): components of the Holtrop and Mennen resistance, total is their sum.
+    """
+    with timer.stage("holtrop_mennen"):
+        hm = HoltropMennen(hm_input)
+        components = {"friction": hm.friction_res() * hm.form_factor(),
+                      "wave": hm.wave_res(),
+                      "bulb": hm.bulb_res(),
+                      "correlation": hm.ra(),
+                      "transom": hm.rtr()}
+        components["total"] = sum(components.values())
+    return components
+
+
+@dataclass
+class Evaluation:
+    """Result record of one design.
+    """
+    block: Block
+    velocity: float
+    bale: float
+    info: dict  # hydrostatic properties, see Info
+    hm_input: HMInput
+    resistance: dict  # see resistance_components
+
+    @property
+    def total_resistance(self) -> float:
+        return self.resistance["total"]
+
+
+def evaluate(design, velocity: float, bale: float = None, timer: StageTimer = NULL_TIMER) -> Evaluation:
+    """
+    Arg:
+        design (Block | dict): the block or the keyword arguments of Block.
+        velocity (float): service speed [kn].
+        bale (float): bale space the design was generated for, only recorded.
+        timer (StageTimer): times the stages of the evaluation.
+    Return:
+        (Evaluation): record of the design.
+    """
+    block = design if isinstance(design, Block) else Block(**design)
+    info = Info()
+    hm_input = hull_input(block, velocity, info, timer=timer)
+    info.laft, info.lhold, info.lfore = block.laft, block.lhold, block.lfore
+    info.lwl, info.half_boa, info.draft = block.lwl, block.boa, block.draft
+    info.fidelity = "high"
+    excluded = ("screening", "cache", "timing", "resistance", "violations", "resolution", "error")
+    hydrostatics = {key: value for key, value in info.as_dict().items() if key not in excluded}
+    return Evaluation(block, velocity, bale, hydrostatics, hm_input, resistance_components(hm_input, timer))
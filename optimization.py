@@ -0,0 +1,227 @@
+"""
+Optimization of the hull for a given bale space without reinforcement learning.
+
+The design vector is the action of ShipEnv.step: 8 values in [-1, 1], translated to a Block by
+build_vessel.parameters.block_parameters. Every generation of an optimizer is evaluated as one batch with BatchHull,
+large batches are split in chunks over a process pool.
+
+optimizers:
+    cma_es                  covariance matrix adaptation evolution strategy
+    differential_evolution  scipy.optimize.differential_evolution with a vectorized objective
+    bayesian                Gaussian process (scikit-learn) with expected improvement, a batch per iteration
+
+usage:
+    with BatchObjective(bale=8000, velocity=12) as objective:
+        result = cma_es(objective, max_evaluations=2000)
+    result.fun, result.parameters
+"""
+import warnings
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field
+import numpy as np
+from HoltropMennen import HoltropMennen
+from build_vessel.batch import Blocks, BatchHull
+from build_vessel.parameters import block_parameters
+
+DIMENSION = 8
+# resistance [kN] of a design which is invalid or can't be evaluated
+PENALTY = 1e9
+
+
+def batch_resistance(x: np.ndarray, bale: float, velocity: float) -> np.ndarray:
+    """
+    Arg:
+        x (np.ndarray): (n, 8) design vectors, clipped to [-1, 1].
+    Return:
+        (np.ndarray): total resistance of every design, PENALTY for designs which violate a geometric constraint (see
+            build_vessel.parameters.violations), these aren't built, and for a negative or nan resistance.
+    """
+    x = np.clip(np.atleast_2d(x), -1, 1)
+    parameters = block_parameters(x.T, bale)
+    valid = Blocks(**parameters).violations() == 0
+    resistance = np.full(len(x), PENALTY)
+    if valid.any():
+        with np.errstate(all="ignore"):
+            hull = BatchHull(Blocks(**{name: value[valid] for name, value in parameters.items()}))
+            resistance[valid] = HoltropMennen(hull.hm_input(velocity)).total_resistance()
+    invalid = ~np.isfinite(resistance) | (resistance < 0)
+    return np.where(invalid, PENALTY, resistance)
+
+
+class BatchObjective:
+    """Resistance of a batch of design vectors. Keeps the number of evaluations and the best design.
+    Arg:
+        bale (float): bale space of the hold [m^3].
+        velocity (float): service speed [kn].
+        workers (int): processes for the chunks of a batch, 0 evaluates in this process.
+        chunk_size (int): designs per chunk of a worker.
+    """
+    def __init__(self, bale: float = 8000, velocity: float = 12, workers: int = 0, chunk_size: int = 256) -> None:
+        self.bale = bale
+        self.velocity = velocity
+        self.chunk_size = chunk_size
+        self.pool = ProcessPoolExecutor(workers) if workers else None
+        self.n_evaluations = 0
+        self.best_x = None
+        self.best_f = np.inf
+        self.trace = []  # (evaluations, best resistance) after every batch
+
+    def __call__(self, x: np.ndarray) -> np.ndarray:
+        x = np.atleast_2d(x)
+        if self.pool is None or len(x) <= self.chunk_size:
+            f = batch_resistance(x, self.bale, self.velocity)
+        else:
+            chunks = [x[i:i + self.chunk_size] for i in range(0, len(x), self.chunk_size)]
+            f = np.concatenate(list(self.pool.map(batch_resistance, chunks, [self.bale] * len(chunks),
+                                                  [self.velocity] * len(chunks))))
+        self.n_evaluations += len(x)
+        i = np.argmin(f)
+        if f[i] < self.best_f:
+            self.best_f, self.best_x = float(f[i]), np.clip(x[i], -1, 1)
+        self.trace.append((self.n_evaluations, self.best_f))
+        return f
+
+    def close(self) -> None:
+        if self.pool is not None:
+            self.pool.shutdown()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+
+@dataclass
+class OptimizationResult:
+    x: np.ndarray  # best design vector
+    fun: float  # resistance of the best design [kN]
+    n_evaluations: int
+    trace: list = field(repr=False)  # (evaluations, best resistance) after every batch
+    parameters: dict = field(default=None)  # keyword arguments of the Block of the best design
+
+
+def _result(objective: BatchObjective) -> OptimizationResult:
+    return OptimizationResult(objective.best_x, objective.best_f, objective.n_evaluations, list(objective.trace),
+                              block_parameters(objective.best_x, objective.bale))
+
+
+def evaluations_to_target(trace: list, target: float) -> int:
+    """
+    Return:
+        (int): number of evaluations until the best resistance reached the target, None when it wasn't reached.
+    """
+    for n_evaluations, best in trace:
+        if best <= target:
+            return n_evaluations
+    return None
+
+
+def cma_es(objective: BatchObjective, x0: np.ndarray = None, sigma: float = 0.3, population: int = None,
+           max_evaluations: int = 2000, seed: int = 0) -> OptimizationResult:
+    """(mu/mu_w, lambda)-CMA-ES. Samples outside [-1, 1] are evaluated at the nearest bound with a penalty on the
+    distance to the bound.
+    Arg:
+        x0 (np.ndarray): initial mean, defaults to the centre of the design space.
+        sigma (float): initial step size.
+        population (int): samples per generation, defaults to 4 + 3 ln(n).
+    """
+    rng = np.random.default_rng(seed)
+    n = DIMENSION
+    mean = np.zeros(n) if x0 is None else np.asarray(x0, dtype=float)
+    lam = population or 4 + int(3 * np.log(n))
+    mu = lam // 2
+    weights = np.log(mu + 0.5) - np.log(np.arange(1, mu + 1))
+    weights /= weights.sum()
+    mueff = 1 / np.sum(weights ** 2)
+    cc = (4 + mueff / n) / (n + 4 + 2 * mueff / n)
+    cs = (mueff + 2) / (n + mueff + 5)
+    c1 = 2 / ((n + 1.3) ** 2 + mueff)
+    cmu = min(1 - c1, 2 * (mueff - 2 + 1 / mueff) / ((n + 2) ** 2 + mueff))
+    damps = 1 + 2 * max(0, np.sqrt((mueff - 1) / (n + 1)) - 1) + cs
+    chi_n = np.sqrt(n) * (1 - 1 / (4 * n) + 1 / (21 * n ** 2))
+    pc, ps, C = np.zeros(n), np.zeros(n), np.eye(n)
+
+    generation = 0
+    while objective.n_evaluations + lam <= max_evaluations:
+        D2, B = np.linalg.eigh(C)
+        D = np.sqrt(np.maximum(D2, 1e-20))
+        y = rng.standard_normal((lam, n)) @ (B * D).T
+        x = mean + sigma * y
+        clipped = np.clip(x, -1, 1)
+        f = objective(clipped)
+        f = f * (1 + np.sum((x - clipped) ** 2, axis=1))
+
+        order = np.argsort(f)[:mu]
+        y_w = weights @ y[order]
+        mean = mean + sigma * y_w
+        ps = (1 - cs) * ps + np.sqrt(cs * (2 - cs) * mueff) * (B @ ((B.T @ y_w) / D))
+        hsig = np.linalg.norm(ps) / np.sqrt(1 - (1 - cs) ** (2 * (generation + 1))) / chi_n < 1.4 + 2 / (n + 1)
+        pc = (1 - cc) * pc + hsig * np.sqrt(cc * (2 - cc) * mueff) * y_w
+        rank_mu = (y[order].T * weights) @ y[order]
+        C = ((1 - c1 - cmu) * C + c1 * (np.outer(pc, pc) + (1 - hsig) * cc * (2 - cc) * C) + cmu * rank_mu)
+        sigma *= np.exp((cs / damps) * (np.linalg.norm(ps) / chi_n - 1))
+        generation += 1
+    return _result(objective)
+
+
+def differential_evolution(objective: BatchObjective, population: int = 15, max_evaluations: int = 2000,
+                           seed: int = 0, **kwargs) -> OptimizationResult:
+    """scipy.optimize.differential_evolution, every generation is one batch.
+    Arg:
+        population (int): population size per dimension, see popsize of scipy.
+        kwargs: passed to scipy.optimize.differential_evolution.
+    """
+    from scipy.optimize import differential_evolution as scipy_differential_evolution
+
+    n_population = population * DIMENSION
+    scipy_differential_evolution(lambda x: objective(x.T), [(-1, 1)] * DIMENSION, popsize=population,
+                                 maxiter=max(max_evaluations // n_population - 1, 0), seed=seed, polish=False,
+                                 vectorized=True, updating="deferred", tol=0, **kwargs)
+    return _result(objective)
+
+
+def bayesian(objective: BatchObjective, n_initial: int = 20, batch_size: int = 8, max_evaluations: int = 200,
+             n_candidates: int = 2000, seed: int = 0) -> OptimizationResult:
+    """Gaussian process on the log of the resistance with expected improvement. A batch is selected with the
+    constant liar heuristic: a selected design is added to the model with the best resistance as its value.
+    Arg:
+        n_initial (int): designs of the initial Latin hypercube.
+        batch_size (int): designs evaluated per iteration.
+        n_candidates (int): random designs and perturbations of the best design on which the improvement is computed.
+    """
+    from scipy.stats import norm, qmc
+    from sklearn.gaussian_process import GaussianProcessRegressor
+    from sklearn.gaussian_process.kernels import ConstantKernel, Matern, WhiteKernel
+    from sklearn.exceptions import ConvergenceWarning
+
+    rng = np.random.default_rng(seed)
+    X = qmc.LatinHypercube(d=DIMENSION, seed=seed).random(n_initial) * 2 - 1
+    y = np.log(objective(X))
+    kernel = ConstantKernel() * Matern(length_scale=np.ones(DIMENSION), nu=2.5) + WhiteKernel(1e-3)
+    while objective.n_evaluations + batch_size <= max_evaluations:
+        gp = GaussianProcessRegressor(kernel, normalize_y=True, random_state=seed)
+        with warnings.catch_warnings():
+            # the noise level often converges to its lower bound
+            warnings.simplefilter("ignore", ConvergenceWarning)
+            gp.fit(X, y)
+        best = X[np.argmin(y)]
+        candidates = np.concatenate((rng.uniform(-1, 1, (n_candidates // 2, DIMENSION)),
+                                     np.clip(best + rng.normal(0, 0.1, (n_candidates // 2, DIMENSION)), -1, 1)))
+        X_lie, y_lie, batch = X, y, []
+        for _ in range(batch_size):
+            mu, std = gp.predict(candidates, return_std=True)
+            improvement = y_lie.min() - mu
+            z = improvement / np.maximum(std, 1e-12)
+            ei = improvement * norm.cdf(z) + std * norm.pdf(z)
+            i = int(np.argmax(ei))
+            batch.append(candidates[i])
+            candidates = np.delete(candidates, i, axis=0)
+            X_lie, y_lie = np.vstack((X_lie, batch[-1])), np.append(y_lie, y.min())
+            gp = GaussianProcessRegressor(gp.kernel_, normalize_y=True, optimizer=None).fit(X_lie, y_lie)
+        batch = np.array(batch)
+        X, y = np.vstack((X, batch)), np.append(y, np.log(objective(batch)))
+    return _result(objective)
+
+
+OPTIMIZERS = {"cma_es": cma_es, "differential_evolution": differential_evolution, "bayesian": bayesian}
@@ -0,0 +1,230 @@
+"""
+Pareto front of the resistance against the hold capacity.
+
+NSGA-II over the design vector of optimization.py with the bale space as a ninth variable. Both objectives are
+minimized: the resistance and the negative bale space. Every generation is evaluated as one batch, which is split in
+chunks over a process pool like BatchObjective does. The non-dominated designs of all generations are kept in a
+ParetoArchive, which is written as a csv table with the bale space, the resistance and the parameters of the Block.
+
+usage:
+    python pareto.py --population 100 --generations 50 --workers 4 --output pareto_front.csv
+"""
+import argparse
+import bisect
+import csv
+from concurrent.futures import ProcessPoolExecutor
+import numpy as np
+from build_vessel.parameters import block_parameters, rescale_actions
+from optimization import DIMENSION, PENALTY, batch_resistance
+
+BALE_RANGE = (2000, 16000)
+
+
+def bale_space(x: np.ndarray, bale_range: tuple = BALE_RANGE) -> np.ndarray:
+    """bale space [m^3] of the design vectors, the last variable in [-1, 1] is scaled to the bale range.
+    """
+    return rescale_actions(np.clip(x[:, DIMENSION], -1, 1), *bale_range)
+
+
+def batch_objectives(x: np.ndarray, velocity: float, bale_range: tuple = BALE_RANGE) -> np.ndarray:
+    """
+    Arg:
+        x (np.ndarray): (n, 9) design vectors, the action of ShipEnv.step followed by the bale space.
+    Return:
+        (np.ndarray): (n, 2) resistance and negative bale space, (PENALTY, PENALTY) for an invalid design.
+    """
+    bale = bale_space(x, bale_range)
+    resistance = batch_resistance(x[:, :DIMENSION], bale, velocity)
+    objectives = np.column_stack((resistance, -bale))
+    objectives[resistance >= PENALTY] = PENALTY
+    return objectives
+
+
+def non_dominated_sort(objectives: np.ndarray) -> np.ndarray:
+    """Rank of the front of every point for two objectives, 0 is the non-dominated front.\n
+    The points are sorted on the first objective, a point belongs to the first front whose last point doesn't
+    dominate it. The last points of the fronts are increasing in (f2, f1), so the front is found with a binary search
+    and the sort is O(n log n) instead of the O(n^2) of the sort of NSGA-II. Equal points get the same rank.
+    """
+    objectives = np.asarray(objectives, dtype=float)
+    if objectives.shape[1] != 2:
+        raise ValueError("the sort is implemented for two objectives")
+    order = np.lexsort((objectives[:, 1], objectives[:, 0]))
+    ranks = np.empty(len(objectives), dtype=int)
+    last = []  # (f2, f1) of the last point of every front
+    for i in order:
+        key = (objectives[i, 1], objectives[i, 0])
+        front = bisect.bisect_left(last, key)
+        if front == len(last):
+            last.append(key)
+        else:
+            last[front] = key
+        ranks[i] = front
+    return ranks
+
+
+def pareto_mask(objectives: np.ndarray) -> np.ndarray:
+    """Non-dominated points of two objectives, duplicates are kept once.
+    """
+    objectives = np.asarray(objectives, dtype=float)
+    mask = np.zeros(len(objectives), dtype=bool)
+    if not len(objectives):
+        return mask
+    _, unique = np.unique(objectives, axis=0, return_index=True)  # sorted on f1, then f2
+    f2 = objectives[unique, 1]
+    best = np.minimum.accumulate(np.concatenate(([np.inf], f2[:-1])))
+    mask[unique[f2 < best]] = True
+    return mask
+
+
+def crowding_distance(objectives: np.ndarray) -> np.ndarray:
+    """Crowding distance of the points of one front, infinite at the extremes.
+    """
+    n, m = objectives.shape
+    distance = np.zeros(n)
+    if n <= 2:
+        return np.full(n, np.inf)
+    for j in range(m):
+        order = np.argsort(objectives[:, j], kind="stable")
+        f = objectives[order, j]
+        span = f[-1] - f[0]
+        distance[order[[0, -1]]] = np.inf
+        if span > 0:
+            distance[order[1:-1]] += (f[2:] - f[:-2]) / span
+    return distance
+
+
+class ParetoArchive:
+    """Non-dominated designs of all evaluated designs. A batch is merged with the archive in O(n log n).
+    """
+    def __init__(self) -> None:
+        self.x = np.empty((0, DIMENSION + 1))
+        self.objectives = np.empty((0, 2))
+
+    def __len__(self) -> int:
+        return len(self.x)
+
+    def add(self, x: np.ndarray, objectives: np.ndarray) -> None:
+        valid = np.all(objectives < PENALTY, axis=1)
+        x = np.concatenate((self.x, x[valid]))
+        objectives = np.concatenate((self.objectives, objectives[valid]))
+        mask = pareto_mask(objectives)
+        order = np.argsort(objectives[mask, 0], kind="stable")
+        self.x, self.objectives = x[mask][order], objectives[mask][order]
+
+    def table(self, bale_range: tuple = BALE_RANGE) -> list:
+        """
+        Return:
+            (list[dict]): one row per design of the front, sorted on the resistance.
+        """
+        bale = bale_space(self.x, bale_range)
+        parameters = block_parameters(self.x[:, :DIMENSION].T, bale)
+        rows = []
+        for i in range(len(self)):
+            row = {"bale": float(bale[i]), "resistance": float(self.objectives[i, 0])}
+            row.update({name: float(np.asarray(value)[i]) for name, value in parameters.items()})
+            row.update({f"x{j}": float(value) for j, value in enumerate(self.x[i])})
+            rows.append(row)
+        return rows
+
+    def write(self, path: str, bale_range: tuple = BALE_RANGE) -> None:
+        rows = self.table(bale_range)
+        fieldnames = list(rows[0]) if rows else ["bale", "resistance"]
+        with open(path, "w", newline="") as f:
+            writer = csv.DictWriter(f, fieldnames)
+            writer.writeheader()
+            writer.writerows(rows)
+
+
+def _variation(parents: np.ndarray, rng: np.random.Generator, eta_crossover: float = 15,
+               eta_mutation: float = 20) -> np.ndarray:
+    """simulated binary crossover of pairs of parents and polynomial mutation, bounded to [-1, 1].
+    """
+    n, d = parents.shape
+    a, b = parents[0::2], parents[1::2]
+    u = rng.random(a.shape)
+    beta = np.where(u <= 0.5, (2 * u) ** (1 / (eta_crossover + 1)), (1 / (2 * (1 - u))) ** (1 / (eta_crossover + 1)))
+    beta = np.where(rng.random(a.shape) < 0.5, beta, 1)  # every variable crosses over with probability 0.5
+    children = np.concatenate((0.5 * ((1 + beta) * a + (1 - beta) * b), 0.5 * ((1 - beta) * a + (1 + beta) * b)))
+    u = rng.random(children.shape)
+    delta = np.where(u < 0.5, (2 * u) ** (1 / (eta_mutation + 1)) - 1, 1 - (2 * (1 - u)) ** (1 / (eta_mutation + 1)))
+    mutate = rng.random(children.shape) < 1 / d
+    return np.clip(children + mutate * delta * 2, -1, 1)
+
+
+def nsga2(population: int = 100, generations: int = 50, velocity: float = 12, bale_range: tuple = BALE_RANGE,
+          workers: int = 0, chunk_size: int = 256, seed: int = 0, archive: ParetoArchive = None) -> ParetoArchive:
+    """
+    Arg:
+        population (int): designs per generation, rounded up to an even number.
+        workers (int): processes for the chunks of a generation, 0 evaluates in this process.
+        archive (ParetoArchive): archive to continue, e.g. of a run with another seed.
+    Return:
+        (ParetoArchive): the non-dominated designs of all generations.
+    """
+    rng = np.random.default_rng(seed)
+    population += population % 2
+    archive = ParetoArchive() if archive is None else archive
+    pool = ProcessPoolExecutor(workers) if workers else None
+
+    def evaluate(x):
+        if pool is None or len(x) <= chunk_size:
+            objectives = batch_objectives(x, velocity, bale_range)
+        else:
+            chunks = [x[i:i + chunk_size] for i in range(0, len(x), chunk_size)]
+            objectives = np.concatenate(list(pool.map(batch_objectives, chunks, [velocity] * len(chunks),
+                                                      [bale_range] * len(chunks))))
+        archive.add(x, objectives)
+        return objectives
+
+    try:
+        x = rng.uniform(-1, 1, (population, DIMENSION + 1))
+        objectives = evaluate(x)
+        for _ in range(generations):
+            ranks = non_dominated_sort(objectives)
+            crowding = np.zeros(len(x))
+            for front in np.unique(ranks):
+                crowding[ranks == front] = crowding_distance(objectives[ranks == front])
+            # binary tournament on the rank, then on the crowding distance
+            a, b = rng.integers(len(x), size=(2, population))
+            a_wins = (ranks[a] < ranks[b]) | ((ranks[a] == ranks[b]) & (crowding[a] > crowding[b]))
+            children = _variation(x[np.where(a_wins, a, b)], rng)
+
+            x = np.concatenate((x, children))
+            objectives = np.concatenate((objectives, evaluate(children)))
+            ranks = non_dominated_sort(objectives)
+            selected = []
+            for front in np.unique(ranks):
+                members = np.flatnonzero(ranks == front)
+                if len(selected) + len(members) > population:
+                    distance = crowding_distance(objectives[members])
+                    members = members[np.argsort(-distance, kind="stable")[:population - len(selected)]]
+                selected.extend(members)
+                if len(selected) == population:
+                    break
+            x, objectives = x[selected], objectives[selected]
+    finally:
+        if pool is not None:
+            pool.shutdown()
+    return archive
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--population", type=int, default=100)
+    parser.add_argument("--generations", type=int, default=50)
+    parser.add_argument("--velocity", type=float, default=12)
+    parser.add_argument("--bale-range", type=float, nargs=2, default=BALE_RANGE, help="bale space [m^3]")
+    parser.add_argument("--workers", type=int, default=0)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--output", default="pareto_front.csv")
+    args = parser.parse_args()
+
+    archive = nsga2(args.population, args.generations, args.velocity, tuple(args.bale_range), args.workers,
+                    seed=args.seed)
+    archive.write(args.output, tuple(args.bale_range))
+    print(f"{len(archive)} designs on the front, written to {args.output}")
+
+
+if __name__ == "__main__":
+    main()
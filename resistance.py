@@ -0,0 +1,227 @@
+"""
+Resistance backends of different fidelity and a scheduler that screens designs with the cheap backend before
+spending a full geometry evaluation on them.
+
+low fidelity:   MainDimensionBackend, the Holtrop and Mennen input is estimated from the main dimensions of the Block.
+                No frames are build.
+high fidelity:  HoltropMennenBackend, the Holtrop and Mennen input is derived from the sampled frames of the hull.
+
+The ResolutionSchedule sets the resolution of the frames of the high fidelity backend during training.
+"""
+import bisect
+from abc import ABC, abstractmethod
+import numpy as np
+from HoltropMennen import HoltropMennen
+from evaluation import hull_input
+from build_vessel.parameters import HMInput
+from build_vessel.properties import Info
+
+
+class ResistanceBackend(ABC):
+    """Base class of the resistance backends.\n
+    A backend translates a Block into the Holtrop and Mennen input and the input into the total resistance.
+    """
+    fidelity = None
+
+    @abstractmethod
+    def hm_input(self, block, velocity: float, info: Info) -> HMInput:
+        """
+        Arg:
+            block (Block): design to evaluate.
+            velocity (float): service speed in knots.
+            info (Info): filled with the hydrostatic properties of the design.
+        Return:
+            (HMInput) : input of the resistance calculation.
+        """
+
+    def total_resistance(self, hm_input: HMInput) -> float:
+        return HoltropMennen(hm_input).total_resistance()
+
+    def resistance(self, block, velocity: float, info: Info = None) -> float:
+        if info is None:
+            info = Info()
+        return self.total_resistance(self.hm_input(block, velocity, info))
+
+
+class MainDimensionBackend(ResistanceBackend):
+    """Low fidelity backend which only needs the main dimensions of the Block.\n
+    The hull is approximated by the midship section, which is the rectangle minus the bilge, over the hold length.
+    The aft body lofts linearly from the immersed transom to the midship section and the waterplane of the fore body
+    tapers parabolic to zero. Like the frames, all areas and volumes are for half the hull.
+    """
+    fidelity = 'low'
+
+    def hm_input(self, block, velocity: float, info: Info) -> HMInput:
+        draft = block.draft
+        half_boa = block.boa
+        r = block.bilge_radius
+        area_midship = half_boa * draft - (r ** 2 - np.pi * r ** 2 / 4)
+        transom_area = block.transom_width * max(draft - block.transom_height + block.transom_offset, 0)
+
+        # volume and centroid of the aft body, the parallel midbody and the fore body.
+        vol_aft = block.laft * (transom_area + area_midship) / 2
+        vol_hold = block.lhold * area_midship
+        vol_fore = block.lfore * area_midship * 2 / 3
+        if vol_aft > 0:
+            x_aft = block.laft * (transom_area + 2 * area_midship) / (3 * (transom_area + area_midship))
+        else:
+            x_aft = 0
+        x_hold = block.laft + block.lhold / 2
+        x_fore = block.laft + block.lhold + block.lfore * 3 / 8
+        volume = vol_aft + vol_hold + vol_fore
+        statical_moment = vol_aft * x_aft + vol_hold * x_hold + vol_fore * x_fore
+        lcb = statical_moment / volume
+        lpp_2 = block.lwl / 2
+
+        info.c_m = area_midship / (half_boa * draft)
+        info.c_wp = (block.laft + block.lhold + block.lfore * 2 / 3) / block.lwl
+        info.transom_area = transom_area
+        info.volume = volume
+        info.statical_moment = statical_moment
+        info.lcb = lcb
+        info.prismatic_coefficient = volume / (area_midship * block.lwl)
+        info.block_coefficient = volume / (block.lwl * half_boa * draft)
+        with np.errstate(divide='ignore'):
+            info.ie = np.tanh(np.divide(half_boa, block.lfore)) * 180 / np.pi
+
+        return HMInput(lpp=block.lwl,
+                       B=half_boa * 2,
+                       t_f=draft,
+                       t_a=draft,
+                       displ=volume * 2 * 1.025,
+                       lcb=(lcb - lpp_2) / lpp_2,
+                       c_m=info.c_m,
+                       c_wp=info.c_wp,
+                       c_b=info.block_coefficient,
+                       a_t=transom_area,
+                       c_prism=info.prismatic_coefficient,
+                       ie=info.ie,
+                       velocity=velocity,
+                       )
+
+
+class HoltropMennenBackend(ResistanceBackend):
+    """High fidelity backend, the Holtrop and Mennen input is derived from the sampled frames of the hull.
+    Arg:
+        hull (callable): geometry pipeline hull(block, velocity, info) -> HMInput, defaults to evaluation.hull_input.
+    """
+    fidelity = 'high'
+
+    def __init__(self, hull=None) -> None:
+        self.hull = hull if hull is not None else hull_input
+
+    def hm_input(self, block, velocity: float, info: Info) -> HMInput:
+        return self.hull(block, velocity, info)
+
+
+class ScreeningScheduler:
+    """Screens every design with the low fidelity backend and only promotes promising designs to the high fidelity
+    backend.\n
+    A design is promising when the calibrated low fidelity resistance is within the margin of the best high fidelity
+    resistance since the last reset. The calibration is the geometric mean of the high / low ratio of the promoted
+    designs, so the returned resistances of both backends are comparable.
+    Arg:
+        low (ResistanceBackend): cheap backend used for screening.
+        high (ResistanceBackend): expensive backend.
+        margin (float): relative margin on the best resistance within which a design is promoted.
+        warmup (int): the first designs are always promoted to calibrate the low fidelity backend.
+    """
+    def __init__(self, low: ResistanceBackend, high: ResistanceBackend, margin: float = 0.1, warmup: int = 10) -> None:
+        self.low = low
+        self.high = high
+        self.margin = margin
+        self.warmup = warmup
+        self.best = np.inf
+        self.n_screened = 0
+        self.n_promoted = 0
+        self._log_ratio = 0.0
+        self._n_ratio = 0
+
+    @property
+    def n_avoided(self) -> int:
+        """number of full evaluations avoided by screening.
+        """
+        return self.n_screened - self.n_promoted
+
+    @property
+    def calibration(self) -> float:
+        if self._n_ratio == 0:
+            return 1.0
+        return np.exp(self._log_ratio / self._n_ratio)
+
+    def promising(self, low_resistance: float) -> bool:
+        if self.n_promoted < self.warmup:
+            return True
+        return low_resistance * self.calibration <= self.best * (1 + self.margin)
+
+    def evaluate(self, block, velocity: float, info: Info) -> tuple:
+        """
+        Return:
+            hm_input, resistance, fidelity (tuple): input and resistance of the backend that evaluated the design last.
+        """
+        self.n_screened += 1
+        hm_input = self.low.hm_input(block, velocity, info)
+        low_resistance = self.low.total_resistance(hm_input)
+        if not self.promising(low_resistance):
+            return hm_input, low_resistance * self.calibration, self.low.fidelity
+
+        self.n_promoted += 1
+        hm_input = self.high.hm_input(block, velocity, info)
+        resistance = self.high.total_resistance(hm_input)
+        if resistance > 0 and low_resistance > 0:
+            self._log_ratio += np.log(resistance / low_resistance)
+            self._n_ratio += 1
+        self.best = min(self.best, resistance)
+        return hm_input, resistance, self.high.fidelity
+
+    def reset(self) -> None:
+        """Forget the best resistance, e.g. at the start of an episode. The calibration and counters are kept.
+        """
+        self.best = np.inf
+
+    def stats(self) -> dict:
+        return {"screened": self.n_screened, "promoted": self.n_promoted, "avoided": self.n_avoided,
+                "calibration": self.calibration}
+
+
+class ResolutionSchedule:
+    """Resolution of the frames during training: coarse frames while the agent explores random designs and the full
+    resolution later on. The resolution is the number of points per frame and of forward frames, see build_frames.
+    A design that beats the best of the episode at a coarse resolution is evaluated again at the full resolution by
+    ShipEnv.
+    Arg:
+        resolutions (tuple): resolution of every level, increasing, the last one is the full resolution.
+        milestones (tuple): fraction of the training at which every level starts, evenly spaced when not given.
+    """
+    def __init__(self, resolutions: tuple = (25, 50, 100), milestones: tuple = None) -> None:
+        self.resolutions = tuple(int(resolution) for resolution in resolutions)
+        if not self.resolutions or any(b <= a for a, b in zip(self.resolutions, self.resolutions[1:])):
+            raise ValueError("the resolutions should be increasing")
+        if milestones is None:
+            milestones = tuple(level / len(self.resolutions) for level in range(len(self.resolutions)))
+        if len(milestones) != len(self.resolutions):
+            raise ValueError("give one milestone per resolution")
+        self.milestones = tuple(milestones)
+        self.level = 0
+        self.n_reevaluated = 0
+
+    @property
+    def resolution(self) -> int:
+        return self.resolutions[self.level]
+
+    @property
+    def full(self) -> int:
+        return self.resolutions[-1]
+
+    def update(self, progress: float) -> int:
+        """Move to the level of the fraction of the training that is done, the level never decreases.
+        Return:
+            (int): the resolution of the level.
+        """
+        level = min(max(bisect.bisect_right(self.milestones, progress) - 1, 0), len(self.resolutions) - 1)
+        self.level = max(self.level, level)
+        return self.resolution
+
+    def stats(self) -> dict:
+        return {"level": self.level, "scheduled": self.resolution, "full": self.full,
+                "reevaluated": self.n_reevaluated}
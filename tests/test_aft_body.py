@@ -0,0 +1,62 @@
+import unittest
+import numpy as np
+from build_vessel.aft_body import AftBody
+from build_vessel.batch import Blocks, BatchHull
+from build_vessel.cross_section import CrossSection
+from build_vessel.integration import simpson, trapezoid
+from build_vessel.parameters import Block, CtrlPts
+from build_vessel.utils import lin_interpolate, modify_control_points
+from evaluation import evaluate
+from HoltropMennen import HoltropMennen
+
+DESIGNS = [dict(laft=12, lhold=80, lfore=20, boa=8, depth=12, bilge_radius=2, ctrlpt_offset_forward=5,
+                transom_width=6, transom_height_action=0.5),
+           dict(laft=7, lhold=60, lfore=15, boa=6, depth=10, bilge_radius=1.5, ctrlpt_offset_forward=3,
+                transom_width=4, transom_height_action=0.2)]
+
+
+def sampled_area(ctrlpts, x):
+    """area of the aft frame at x from densely sampled points."""
+    block = ctrlpts.block
+    hold_aft = modify_control_points(ctrlpts.web_frame, 0, block.laft)
+    frame = CrossSection(lin_interpolate((ctrlpts.transom, hold_aft), x, block.draft))
+    frame.delta = 0.0005
+    points = np.array(frame.points)
+    return trapezoid(points[:, 1], points[:, 2])
+
+
+class TestAftBody(unittest.TestCase):
+    def test_same_as_sampled_frames(self):
+        for design in DESIGNS:
+            ctrlpts = CtrlPts(Block(**design))
+            aft_body = AftBody.from_ctrlpts(ctrlpts)
+            x = np.arange(design["laft"] + 1)
+            area = np.array([sampled_area(ctrlpts, station) for station in x])
+            np.testing.assert_allclose(aft_body.area(x), area, rtol=1e-5)
+            # the area is quadratic in x, so Simpson's rule on the sampled frames is exact up to the sampling
+            self.assertAlmostEqual(aft_body.volume / simpson(area, x), 1, places=5)
+            # x * area is cubic, the last interval of an odd number of intervals isn't exact for a cubic
+            self.assertAlmostEqual(aft_body.statical_moment / simpson(x * area, x), 1, places=4)
+
+    def test_batch(self):
+        blocks = Blocks(**{name: np.array([design[name] for design in DESIGNS]) for name in DESIGNS[0]})
+        aft_body = BatchHull(blocks).aft_body()
+        for i, design in enumerate(DESIGNS):
+            expected = AftBody.from_ctrlpts(CtrlPts(Block(**design)))
+            self.assertAlmostEqual(aft_body.volume[i], expected.volume)
+            self.assertAlmostEqual(aft_body.statical_moment[i], expected.statical_moment)
+            self.assertAlmostEqual(aft_body.transom_area[i], expected.transom_area)
+
+    def test_without_aft_body(self):
+        design = {**DESIGNS[0], "laft": 0}
+        evaluation = evaluate(design, 14)
+        hull = BatchHull(Blocks(**{name: np.array([value]) for name, value in design.items()}))
+        properties = hull.properties()
+        self.assertTrue(np.isfinite(evaluation.total_resistance))
+        self.assertAlmostEqual(evaluation.info["volume"], properties["volume"][0])
+        self.assertAlmostEqual(evaluation.info["transom_area"], properties["transom_area"][0])
+        self.assertAlmostEqual(evaluation.total_resistance, HoltropMennen(hull.hm_input(14)).total_resistance()[0])
+
+
+if __name__ == '__main__':
+    unittest.main()
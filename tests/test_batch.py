@@ -0,0 +1,56 @@
+import unittest
+import numpy as np
+from geomdl import BSpline, utilities
+from build_vessel.batch import evaluate, Blocks, BatchHull
+from build_vessel.parameters import Block, CtrlPts
+from build_vessel.cross_section import CrossSection
+from build_vessel.utils import lin_interpolate, new_cross_fore, modify_control_points
+from build_vessel.waterplane import WaterPlane
+
+
+class TestEvaluate(unittest.TestCase):
+    def test_same_as_geomdl(self):
+        rng = np.random.default_rng(0)
+        for n_ctrlpts in (3, 5, 6):
+            ctrlpts = rng.uniform(0, 10, (n_ctrlpts, 3))
+            curve = BSpline.Curve()
+            curve.degree = 2
+            curve.ctrlpts = ctrlpts.tolist()
+            curve.knotvector = utilities.generate_knot_vector(2, n_ctrlpts)
+            curve.delta = 0.01
+            np.testing.assert_array_equal(evaluate(ctrlpts), np.array(curve.evalpts))
+
+
+class TestBatchHull(unittest.TestCase):
+    def setUp(self):
+        self.parameters = [dict(laft=12, lhold=80, lfore=20, boa=8, depth=12, bilge_radius=2, ctrlpt_offset_forward=5,
+                                transom_width=6, transom_height_action=0.5),
+                           dict(laft=7, lhold=60, lfore=15, boa=6, depth=10, bilge_radius=1.5, ctrlpt_offset_forward=3,
+                                transom_width=4, transom_height_action=0.2)]
+        columns = {key: np.array([p[key] for p in self.parameters]) for key in self.parameters[0]}
+        self.hull = BatchHull(Blocks(**columns))
+
+    def test_frames(self):
+        aft, valid = self.hull.aft()
+        mid = self.hull.midship()
+        _, wp_forward = self.hull.waterplane()
+        fore = self.hull.forward(mid[:, 1], wp_forward)
+        for i, parameters in enumerate(self.parameters):
+            block = Block(**parameters)
+            cp = CtrlPts(block)
+            hold_aft = modify_control_points(cp.web_frame, 0, block.laft)
+            hold_fore = np.array(CrossSection(modify_control_points(cp.web_frame, 0, block.laft + block.lhold)).points)
+            frames = aft[i][valid[i]]
+            self.assertEqual(len(frames), block.laft)
+            for x, frame in enumerate(frames):
+                expected = CrossSection(lin_interpolate((cp.transom, hold_aft), x, block.draft)).points
+                np.testing.assert_allclose(frame, expected, atol=1e-12)
+            np.testing.assert_allclose(mid[i, 1], hold_fore, atol=1e-12)
+            wp = WaterPlane(cp.waterlines.waterplane)
+            wp.water_plane_points
+            for x in (0, 50, 99):
+                np.testing.assert_allclose(fore[i, x], new_cross_fore(wp.forward, hold_fore, x), atol=1e-12)
+
+
+if __name__ == '__main__':
+    unittest.main()
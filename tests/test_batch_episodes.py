@@ -0,0 +1,47 @@
+import sys
+import unittest
+from pathlib import Path
+import numpy as np
+
+# the training scripts import their siblings directly
+sys.path.insert(0, str(Path(__file__).parents[1] / "ReinforcementLearning"))
+
+from batch_episodes import BatchEpisodes  # noqa: E402
+
+
+class TestBatchEpisodes(unittest.TestCase):
+    def test_training_progress(self):
+        episodes = BatchEpisodes(2, resolutions=(25, 50, 100), milestones=(0, 0.5, 0.8))
+        self.assertEqual(episodes.resolution, 25)
+        self.assertEqual(episodes.set_training_progress(0.6), 50)
+        # the resolution never decreases
+        self.assertEqual(episodes.set_training_progress(0.1), 50)
+        self.assertEqual(episodes.set_training_progress(0.9), 100)
+        self.assertEqual(BatchEpisodes(2).set_training_progress(0.1), episodes.full_resolution)
+
+    def test_best_is_evaluated_at_full_resolution(self):
+        actions = np.random.default_rng(0).uniform(-1, 1, (3, 8))
+        full = BatchEpisodes(3)
+        scheduled = BatchEpisodes(3, resolutions=(25, 100))
+        full.reset(), scheduled.reset()
+        observation, reward, _, infos = scheduled.step(actions)
+        expected_observation, expected_reward, _, _ = full.step(actions)
+        # every design beats the best of its new episode
+        np.testing.assert_array_equal(observation, expected_observation)
+        np.testing.assert_array_equal(reward, expected_reward)
+        self.assertEqual(scheduled.schedule.n_reevaluated, 3)
+        self.assertEqual([info["resolution"]["evaluated"] for info in infos], [100] * 3)
+        self.assertTrue(all(info["resolution"]["coarse_resistance"] is not None for info in infos))
+        # the same designs again: only a coarse resistance below the best is evaluated again, which doesn't improve
+        best = observation[:, 0]
+        _, reward, _, infos = scheduled.step(actions)
+        coarse = np.array([info["resolution"]["coarse_resistance"] or np.nan for info in infos], dtype=float)
+        evaluated = np.array([info["resolution"]["evaluated"] for info in infos])
+        np.testing.assert_array_equal(evaluated == 100, coarse < best)
+        self.assertEqual(scheduled.schedule.n_reevaluated, 3 + np.sum(evaluated == 100))
+        self.assertIn(25, evaluated)
+        np.testing.assert_array_equal(reward, -1)
+
+
+if __name__ == '__main__':
+    unittest.main()
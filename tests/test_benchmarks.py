@@ -0,0 +1,13 @@
+import unittest
+from benchmarks.suite import compare
+
+
+class TestCompare(unittest.TestCase):
+    def test_regressions(self):
+        baseline = {"results": {"area": 1.0, "frames": 1.0, "removed": 1.0}}
+        results = {"results": {"area": 1.2, "frames": 1.5, "new": 9.0}}
+        self.assertEqual(compare(results, baseline, tolerance=0.25), [("frames", 1.0, 1.5, 1.5)])
+
+
+if __name__ == '__main__':
+    unittest.main()
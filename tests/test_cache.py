@@ -0,0 +1,18 @@
+import unittest
+from build_vessel.cache import ResultCache
+
+
+class TestResultCache(unittest.TestCase):
+    def test_least_recently_used_is_removed(self):
+        cache = ResultCache(maxsize=2)
+        cache.put('a', 1)
+        cache.put('b', 2)
+        self.assertEqual(cache.get('a'), 1)
+        cache.put('c', 3)
+        self.assertNotIn('b', cache)
+        self.assertIsNone(cache.get('b'))
+        self.assertEqual(cache.stats(), {"hits": 1, "misses": 1, "hit_rate": 0.5, "size": 2})
+
+
+if __name__ == '__main__':
+    unittest.main()
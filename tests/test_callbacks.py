@@ -0,0 +1,26 @@
+import importlib.util
+import sys
+import unittest
+from pathlib import Path
+
+# the training scripts import their siblings directly
+sys.path.insert(0, str(Path(__file__).parents[1] / "ReinforcementLearning"))
+
+
+@unittest.skipUnless(importlib.util.find_spec("stable_baselines3"), "stable_baselines3 isn't installed")
+class TestResolutionCallback(unittest.TestCase):
+    def test_batched_env(self):
+        from stable_baselines3 import PPO
+        from batch_env import BatchShipEnv
+        from callbacks import ResolutionCallback
+
+        env = BatchShipEnv(2, resolutions=(25, 100))
+        callback = ResolutionCallback(total_timesteps=16, update_freq=1)
+        model = PPO("MlpPolicy", env, n_steps=8, batch_size=8, n_epochs=1, seed=0)
+        model.learn(16, callback=callback)
+        self.assertEqual(callback.resolution, 100)
+        self.assertEqual(env.resolution, 100)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,35 @@
+import tempfile
+import unittest
+import numpy as np
+from doe import DesignPlan, load_sweep, run_doe
+
+
+class TestDOE(unittest.TestCase):
+    def test_plans(self):
+        for method in ("lhs", "sobol"):
+            plan = DesignPlan(method, n=50, seed=1)
+            designs = plan.designs(0, 100)
+            self.assertEqual(len(designs["lhold"]), 50)
+            self.assertTrue(np.all((designs["lhold"] >= 25) & (designs["lhold"] <= 125)))
+            self.assertEqual(designs["laft"].dtype.kind, "i")
+        plan = DesignPlan("factorial", levels=2, bounds={"lhold": (60, 60)})
+        self.assertEqual(len(plan), 2 ** 9)
+        self.assertTrue(np.all(plan.designs(0, len(plan))["lhold"] == 60))
+
+    def test_resume_and_skip(self):
+        plan = DesignPlan("lhs", n=30, seed=0)
+        with tempfile.TemporaryDirectory() as output:
+            first = run_doe(plan, output, chunk_size=10, verbose=False)
+            self.assertEqual(first["evaluated"], 30)
+            again = run_doe(plan, output, chunk_size=10, verbose=False)
+            self.assertEqual((again["evaluated"], again["skipped"]), (0, 30))
+            # the same designs in chunks of another size are already in the output
+            other = run_doe(plan, output, chunk_size=7, verbose=False)
+            self.assertEqual(other["evaluated"], 0)
+            df = load_sweep(output)
+        self.assertEqual(len(df), 30)
+        self.assertIn("resistance", df)
+
+
+if __name__ == '__main__':
+    unittest.main()
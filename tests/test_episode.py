@@ -0,0 +1,28 @@
+import unittest
+import numpy as np
+from ReinforcementLearning.episode import EpisodeTracker
+
+
+class TestEpisodeTracker(unittest.TestCase):
+    def test_running_statistics(self):
+        records = []
+        tracker = EpisodeTracker(maxlen=3, sink=records.append)
+        resistances = [5.0, 3.0, 4.0, 1.0, 2.0]
+        improved = []
+        for resistance in resistances:
+            tracker.add(resistance)
+            improved.append(tracker.improved)
+        self.assertEqual(improved, [True, True, False, True, False])
+        np.testing.assert_array_equal(tracker.recent(), [4.0, 1.0, 2.0])
+        self.assertAlmostEqual(tracker.mean, np.mean(resistances))
+        self.assertAlmostEqual(tracker.std, np.std(resistances, ddof=1))
+        self.assertEqual(tracker.reset(), 1.0)
+        self.assertEqual(records[-1], {"episode": 0, "step": 5, "resistance": 2.0})
+
+        tracker.add(7.0)
+        self.assertEqual(tracker.episode, 1)
+        self.assertEqual(tracker.stats()["min"], 7.0)
+
+
+if __name__ == '__main__':
+    unittest.main()
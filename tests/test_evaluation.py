@@ -0,0 +1,55 @@
+import pickle
+import unittest
+import numpy as np
+from build_vessel.batch import Blocks, BatchHull
+from build_vessel.cross_section import HullBuffer
+from build_vessel.parameters import Block, CtrlPts
+from evaluation import build_frames, evaluate
+from HoltropMennen import HoltropMennen
+
+
+class TestEvaluate(unittest.TestCase):
+    def setUp(self):
+        self.design = dict(laft=12, lhold=80, lfore=20, boa=8, depth=12, bilge_radius=2, ctrlpt_offset_forward=5,
+                           transom_width=6, transom_height_action=0.5)
+
+    def test_same_as_batch(self):
+        record = evaluate(self.design, velocity=12, bale=8000)
+        hull = BatchHull(Blocks(**{key: np.array([value]) for key, value in self.design.items()}))
+        resistance = HoltropMennen(hull.hm_input(12)).total_resistance()[0]
+        self.assertAlmostEqual(record.total_resistance, resistance, places=6)
+        self.assertAlmostEqual(sum(v for k, v in record.resistance.items() if k != "total"), resistance, places=6)
+
+    def test_independent_of_the_batch(self):
+        # without a fore body all fore frames are at the end of the hold
+        designs = [self.design, {**self.design, "lfore": 0}]
+        hull = BatchHull(Blocks(**{key: np.array([d[key] for d in designs]) for key in self.design}))
+        alone = BatchHull(Blocks(**{key: np.array([value]) for key, value in self.design.items()}))
+        resistance = HoltropMennen(hull.hm_input(12)).total_resistance()
+        self.assertEqual(hull.properties()["volume"][0], alone.properties()["volume"][0])
+        self.assertEqual(resistance[0], HoltropMennen(alone.hm_input(12)).total_resistance()[0])
+        self.assertTrue(np.isfinite(resistance[1]))
+
+    def test_pickle(self):
+        record = evaluate(self.design, velocity=12)
+        copy = pickle.loads(pickle.dumps(record))
+        self.assertEqual(copy.resistance, record.resistance)
+        self.assertEqual(copy.info["volume"], record.info["volume"])
+
+    def test_hull_buffer(self):
+        buffer = HullBuffer()
+        large = CtrlPts(Block(**{**self.design, "laft": 20}))
+        small = CtrlPts(Block(**self.design))
+        build_frames(large, buffer=buffer)
+        array = buffer.points.base
+        frames = build_frames(small, buffer=buffer)
+        self.assertIs(frames.points.base, array)
+        np.testing.assert_array_equal(frames.points, build_frames(small).points)
+        # a coarse hull fits in the memory of the full hull
+        frames = build_frames(small, buffer=buffer, resolution=25)
+        self.assertIs(frames.points.base, array)
+        self.assertEqual(frames.points.shape, (12 + 2 + 25, 25, 3))
+
+
+if __name__ == '__main__':
+    unittest.main()
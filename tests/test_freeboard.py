@@ -0,0 +1,35 @@
+import tempfile
+import unittest
+from pathlib import Path
+import numpy as np
+from build_vessel.freeboard import min_freeboard
+
+
+class TestMinFreeboard(unittest.TestCase):
+    def setUp(self):
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self.path = Path(directory.name) / "min_freeboard.csv"
+        self.path.write_text("length,A,B\n24,200,200\n25,210,220\n26,230,250\n")
+
+    def test_interpolates_between_lengths(self):
+        self.assertAlmostEqual(min_freeboard(25, 'A', path=self.path), 0.21)
+        self.assertAlmostEqual(min_freeboard(25.5, 'A', path=self.path), 0.22)
+        self.assertAlmostEqual(min_freeboard(24.25, 'B', path=self.path), 0.205)
+
+    def test_outside_the_table(self):
+        self.assertAlmostEqual(min_freeboard(10, path=self.path), 0.2)
+        self.assertAlmostEqual(min_freeboard(400, path=self.path), 0.25)
+
+    def test_array(self):
+        loa = np.array([24, 25.5, 26])
+        expected = [min_freeboard(length, path=self.path) for length in loa]
+        np.testing.assert_allclose(min_freeboard(loa, path=self.path), expected)
+
+    def test_type(self):
+        with self.assertRaises(ValueError):
+            min_freeboard(25, 'C', path=self.path)
+
+
+if __name__ == '__main__':
+    unittest.main()
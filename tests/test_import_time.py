@@ -0,0 +1,45 @@
+import os
+import subprocess
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+
+ROOT = Path(__file__).parents[1]
+CORE = ["build_vessel.parameters", "build_vessel.cross_section", "build_vessel.waterplane", "build_vessel.batch",
+        "build_vessel.store", "HoltropMennen", "resistance", "evaluation"]
+HEAVY = ["pandas", "geomdl", "pyvista", "gym", "stable_baselines3", "torch"]
+# seconds, measured on a laptop the core imports in about 0.3 s
+BUDGET = 1.0
+
+SCRIPT = f"""
+import sys, time
+start = time.perf_counter()
+{"; ".join(f"import {module}" for module in CORE)}
+print(time.perf_counter() - start)
+print(",".join(module for module in {HEAVY!r} if module in sys.modules))
+"""
+
+
+def import_core(cwd: str):
+    env = dict(os.environ, PYTHONPATH=str(ROOT))
+    out = subprocess.run([sys.executable, "-c", SCRIPT], cwd=cwd, env=env, capture_output=True, text=True,
+                         check=True).stdout.split("\n")
+    return float(out[0]), out[1]
+
+
+class TestImportTime(unittest.TestCase):
+    def test_startup_budget(self):
+        with tempfile.TemporaryDirectory() as cwd:
+            seconds = min(import_core(cwd)[0] for _ in range(3))
+            self.assertLess(seconds, BUDGET)
+
+    def test_no_heavy_modules_or_files(self):
+        with tempfile.TemporaryDirectory() as cwd:
+            _, loaded = import_core(cwd)
+            self.assertEqual(loaded, "")
+            self.assertEqual(os.listdir(cwd), [])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,49 @@
+import unittest
+import numpy as np
+from build_vessel.integration import (cumulative_simpson, cumulative_trapezoid, distinct_stations, gauss_legendre,
+                                      simpson, simpson_distinct, trapezoid)
+
+
+def quadratic(x):
+    return 1 + 2 * x - 3 * x ** 2
+
+
+def quadratic_integral(a, b):
+    return (b - a) + (b ** 2 - a ** 2) - (b ** 3 - a ** 3)
+
+
+class TestIntegration(unittest.TestCase):
+    def test_exact_on_non_uniform_stations(self):
+        rng = np.random.default_rng(0)
+        for n_stations in (3, 4, 7, 10):
+            x = np.sort(rng.uniform(0, 3, n_stations))
+            self.assertAlmostEqual(simpson(quadratic(x), x), quadratic_integral(x[0], x[-1]), places=10)
+            np.testing.assert_allclose(cumulative_simpson(quadratic(x), x), quadratic_integral(x[0], x), atol=1e-10)
+            self.assertAlmostEqual(trapezoid(2 * x, x), x[-1] ** 2 - x[0] ** 2, places=10)
+            np.testing.assert_allclose(cumulative_trapezoid(2 * x, x), x ** 2 - x[0] ** 2, atol=1e-10)
+
+    def test_many_curves(self):
+        rng = np.random.default_rng(1)
+        x = np.sort(rng.uniform(0, 1, (4, 9)), axis=1)
+        y = rng.random((4, 9))
+        integrals = simpson(y, x)
+        np.testing.assert_allclose(integrals, [simpson(y[i], x[i]) for i in range(4)])
+        np.testing.assert_allclose(simpson(y.T, x.T, axis=0), integrals)
+        np.testing.assert_allclose(cumulative_simpson(y, x)[:, -1], integrals)
+
+    def test_coincident_stations(self):
+        x = np.array([0, 1, 2, 2, 3, 4.0])
+        distinct = distinct_stations(x)
+        self.assertEqual(distinct.tolist(), [True, True, True, False, True, True])
+        self.assertAlmostEqual(simpson(quadratic(x[distinct]), x[distinct]), quadratic_integral(0, 4))
+        self.assertTrue(np.isfinite(simpson(quadratic(x), x)))
+        # every curve without its own coincident stations
+        x = np.array([[0, 1, 2, 2, 3, 4.0], [0, 1, 2, 2.5, 3, 4], [0, 1, 2, 2 + 1e-14, 3, 4]])
+        np.testing.assert_allclose(simpson_distinct(quadratic(x), x), quadratic_integral(0, 4))
+
+    def test_gauss_legendre(self):
+        np.testing.assert_allclose(gauss_legendre(lambda x: x ** 9, 0, np.array([1, 2])), [0.1, 102.4])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,58 @@
+import unittest
+import numpy as np
+from geomdl import BSpline, utilities
+from build_vessel.batch import Blocks, BatchHull
+from build_vessel.intersection import curve_points, intersect_plane
+from build_vessel.parameters import Block, CtrlPts
+
+
+class TestIntersection(unittest.TestCase):
+    def test_same_as_geomdl(self):
+        ctrlpts = np.random.default_rng(0).uniform(0, 10, (7, 3))
+        curve = BSpline.Curve()
+        curve.degree = 3
+        curve.ctrlpts = ctrlpts.tolist()
+        curve.knotvector = utilities.generate_knot_vector(3, 7)
+        for u in (0, 0.2, 0.5, 0.9, 1):
+            point, derivative = curve_points(ctrlpts, u, 3, derivative=True)
+            np.testing.assert_allclose(point, curve.evaluate_single(u), atol=1e-12)
+            np.testing.assert_allclose(derivative, curve.derivatives(u, 1)[1], atol=1e-12)
+
+    def test_transom(self):
+        # without an offset z = h + u^2 (depth - h) and y = width (2u - u^2)
+        height, width, depth = np.array([3.0, 5, 1]), np.array([6.0, 4, 10]), np.array([12.0, 9, 15])
+        draft = np.array([7.0, 8, 2])
+        zero = np.zeros(3)
+        ctrlpts = np.stack([np.stack([zero, zero, height], axis=-1), np.stack([zero, width, height], axis=-1),
+                            np.stack([zero, width, depth], axis=-1)], axis=1)
+        u, points = intersect_plane(ctrlpts, 2, draft)
+        expected = np.sqrt((draft - height) / (depth - height))
+        np.testing.assert_allclose(u, expected, atol=1e-10)
+        np.testing.assert_allclose(points[:, 1], width * (2 * expected - expected ** 2), atol=1e-10)
+        np.testing.assert_allclose(points[:, 2], draft, atol=1e-10)
+        # below and above the transom
+        u, points = intersect_plane(ctrlpts, 2, np.array([1.0, 20, 5]))
+        self.assertTrue(np.isnan(u[:2]).all())
+        u, _ = intersect_plane(ctrlpts, 2, np.array([1.0, 20, 5]), clamp=True)
+        np.testing.assert_array_equal(u[:2], [0, 1])
+
+    def test_first_crossing(self):
+        # the polygon and the curve cross the plane z = 2 twice
+        ctrlpts = np.array([[0.0, 0, 0], [1, 0, 10], [2, 0, 10], [3, 0, 0]])
+        u, point = intersect_plane(ctrlpts, 2, 2.0)
+        self.assertAlmostEqual(point[2], 2, places=9)
+        self.assertLess(u, 0.5)
+        self.assertTrue(np.isnan(intersect_plane(ctrlpts, 2, 20.0)[0]))
+
+    def test_same_as_blocks(self):
+        designs = [dict(laft=12, lhold=80, lfore=20, boa=8, depth=12, bilge_radius=2, ctrlpt_offset_forward=5,
+                        transom_width=6, transom_height_action=0.5),
+                   dict(laft=7, lhold=60, lfore=15, boa=6, depth=10, bilge_radius=1.5, ctrlpt_offset_forward=3,
+                        transom_width=4, transom_height_action=0.2)]
+        hull = BatchHull(Blocks(**{name: np.array([design[name] for design in designs]) for name in designs[0]}))
+        expected = [CtrlPts(Block(**design)).intersect_transom for design in designs]
+        np.testing.assert_allclose(hull.intersect_transom, expected, atol=1e-12)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,18 @@
+import unittest
+from benchmarks.memory import measure
+
+
+class TestMeasure(unittest.TestCase):
+    def test_leak_is_attributed(self):
+        leaked = []
+        report = measure(lambda i: leaked.append(bytearray(10000)), n_steps=200, warmup=20, interval=20)
+        self.assertGreater(report["bytes_per_step"], 9000)
+        self.assertIn("test_memory.py", report["sites"][0]["site"])
+
+    def test_no_leak(self):
+        report = measure(lambda i: bytearray(10000), n_steps=200, warmup=20, interval=20)
+        self.assertLess(report["bytes_per_step"], 100)
+
+
+if __name__ == '__main__':
+    unittest.main()
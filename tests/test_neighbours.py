@@ -0,0 +1,39 @@
+import unittest
+import numpy as np
+from build_vessel.neighbours import DesignIndex, NAMES
+from build_vessel.parameters import Block
+
+DESIGN = dict(laft=12, lhold=80, lfore=20, boa=8, depth=12, bilge_radius=2, ctrlpt_offset_forward=5, transom_width=6,
+              transom_height_action=0.5)
+
+
+class TestDesignIndex(unittest.TestCase):
+    def test_same_as_brute_force(self):
+        rng = np.random.default_rng(0)
+        designs = rng.random((300, len(NAMES)))
+        index = DesignIndex(scale={name: 1 for name in NAMES}, buffer_size=8)
+        index.extend(designs[:100])
+        for design in designs[100:]:
+            index.add(design)
+        self.assertEqual(len(index), 300)
+        self.assertLess(index.n_trees, 8)
+        for query in rng.random((20, len(NAMES))):
+            distances = np.abs(designs - query).max(axis=1)
+            nearest, ids = index.nearest(query, k=3)
+            np.testing.assert_array_equal(ids, np.argsort(distances)[:3])
+            np.testing.assert_allclose(nearest, np.sort(distances)[:3])
+            tolerance = np.sort(distances)[5]
+            self.assertEqual(set(index.within(query, tolerance)[1]), set(np.flatnonzero(distances <= tolerance)))
+
+    def test_lookup(self):
+        index = DesignIndex()
+        index.add(Block(**DESIGN), "evaluated")
+        index.add({**DESIGN, "bilge_radius": np.nan}, "nan")
+        self.assertEqual(index.lookup(Block(**{**DESIGN, "bilge_radius": 2.0001}), 1e-4), "evaluated")
+        self.assertIsNone(index.lookup(Block(**{**DESIGN, "bilge_radius": 2.1}), 1e-4))
+        self.assertIsNone(index.lookup({**DESIGN, "bilge_radius": np.nan}, 1))
+        self.assertEqual(index.stats(), {"hits": 1, "misses": 2, "hit_rate": 1 / 3, "size": 2, "trees": 0})
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,32 @@
+import unittest
+import numpy as np
+from optimization import BatchObjective, cma_es, differential_evolution, evaluations_to_target, PENALTY
+
+
+class TestOptimization(unittest.TestCase):
+    def test_objective(self):
+        objective = BatchObjective()
+        x = np.zeros((3, 8))
+        x[1] = 1  # shallow hold, the draft is below zero
+        f = objective(x)
+        self.assertEqual(f[1], PENALTY)
+        self.assertLess(f[0], PENALTY)
+        self.assertEqual(objective.n_evaluations, 3)
+        self.assertEqual(objective.trace, [(3, min(f))])
+
+    def test_optimizers_improve(self):
+        start = BatchObjective()(np.zeros((1, 8)))[0]
+        for optimizer in (cma_es, differential_evolution):
+            result = optimizer(BatchObjective(), max_evaluations=240, seed=0)
+            self.assertLessEqual(result.n_evaluations, 240)
+            self.assertLess(result.fun, start)
+            self.assertEqual(result.parameters["lfore"], int(result.parameters["lfore"]))
+
+    def test_evaluations_to_target(self):
+        trace = [(10, 5.0), (20, 3.0), (30, 1.0)]
+        self.assertEqual(evaluations_to_target(trace, 3.0), 20)
+        self.assertIsNone(evaluations_to_target(trace, 0.5))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,53 @@
+import csv
+import os
+import tempfile
+import unittest
+import numpy as np
+from pareto import ParetoArchive, nsga2, non_dominated_sort, pareto_mask
+
+
+def brute_force_ranks(objectives):
+    n = len(objectives)
+    dominated = np.array([[np.all(objectives[j] <= objectives[i]) and np.any(objectives[j] < objectives[i])
+                           for j in range(n)] for i in range(n)])
+    ranks, remaining, front = np.full(n, -1), np.ones(n, dtype=bool), 0
+    while remaining.any():
+        current = remaining & ~np.any(dominated & remaining, axis=1)
+        ranks[current], remaining, front = front, remaining & ~current, front + 1
+    return ranks
+
+
+class TestPareto(unittest.TestCase):
+    def test_non_dominated_sort(self):
+        # small integers give many equal values and duplicates
+        objectives = np.random.default_rng(0).integers(0, 8, (200, 2)).astype(float)
+        ranks = non_dominated_sort(objectives)
+        np.testing.assert_array_equal(ranks, brute_force_ranks(objectives))
+        front = objectives[pareto_mask(objectives)]
+        np.testing.assert_array_equal(np.sort(front, axis=0), np.unique(objectives[ranks == 0], axis=0))
+
+    def test_archive(self):
+        archive = ParetoArchive()
+        x = np.zeros((3, 9))
+        archive.add(x, np.array([[1.0, -1.0], [2.0, -3.0], [3.0, -2.0]]))
+        archive.add(x[:1], np.array([[0.5, -1.0]]))
+        np.testing.assert_array_equal(archive.objectives, [[0.5, -1.0], [2.0, -3.0]])
+
+    def test_nsga2(self):
+        archive = nsga2(population=20, generations=3, seed=0)
+        self.assertTrue(pareto_mask(archive.objectives).all())
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "front.csv")
+            archive.write(path)
+            with open(path) as f:
+                rows = list(csv.DictReader(f))
+        self.assertEqual(len(rows), len(archive))
+        resistance = [float(row["resistance"]) for row in rows]
+        bale = [float(row["bale"]) for row in rows]
+        # along the front a lower resistance costs bale space
+        self.assertEqual(resistance, sorted(resistance))
+        self.assertEqual(bale, sorted(bale))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,73 @@
+import unittest
+from types import SimpleNamespace
+from resistance import MainDimensionBackend, ResistanceBackend, ResolutionSchedule, ScreeningScheduler
+from build_vessel.properties import Info
+
+
+def block(lhold=60.0, boa=8.0):
+    return SimpleNamespace(laft=10, lhold=lhold, lfore=15, lwl=10 + lhold + 15, boa=boa, draft=6.0, bilge_radius=2,
+                           transom_width=5.0, transom_height=4.0, transom_offset=0)
+
+
+class FixedBackend(ResistanceBackend):
+    """returns the lhold of the block as resistance."""
+    def __init__(self, fidelity, factor=1.0) -> None:
+        self.fidelity = fidelity
+        self.factor = factor
+        self.calls = 0
+
+    def hm_input(self, block, velocity, info):
+        self.calls += 1
+        return block
+
+    def total_resistance(self, hm_input):
+        return hm_input.lhold * self.factor
+
+
+class TestMainDimensionBackend(unittest.TestCase):
+    def test_coefficients(self):
+        info = Info()
+        hm_input = MainDimensionBackend().hm_input(block(), 12, info)
+        self.assertTrue(0 < info.c_m < 1)
+        self.assertTrue(0 < info.block_coefficient < info.prismatic_coefficient < 1)
+        self.assertTrue(0 < info.lcb < block().lwl)
+        self.assertAlmostEqual(hm_input.B, 16.0)
+        self.assertAlmostEqual(hm_input.displ, info.volume * 2 * 1.025)
+
+
+class TestResistanceBackend(unittest.TestCase):
+    def test_abstract(self):
+        with self.assertRaises(TypeError):
+            ResistanceBackend()
+
+
+class TestScreeningScheduler(unittest.TestCase):
+    def test_avoids_full_evaluations(self):
+        low, high = FixedBackend('low', factor=0.5), FixedBackend('high')
+        scheduler = ScreeningScheduler(low, high, margin=0.0, warmup=2)
+        for lhold in (50, 40, 60, 30, 70):
+            _, resistance, fidelity = scheduler.evaluate(block(lhold), 12, Info())
+            self.assertAlmostEqual(resistance, lhold)
+        # 50 and 40 are the warmup, 30 improves the best, 60 and 70 are screened out.
+        self.assertEqual(high.calls, 3)
+        self.assertEqual(scheduler.n_screened, 5)
+        self.assertEqual(scheduler.n_avoided, 2)
+        self.assertAlmostEqual(scheduler.calibration, 2.0)
+        self.assertEqual(fidelity, 'low')
+
+
+class TestResolutionSchedule(unittest.TestCase):
+    def test_levels(self):
+        schedule = ResolutionSchedule((20, 50, 100), milestones=(0, 0.5, 0.8))
+        self.assertEqual(schedule.resolution, 20)
+        self.assertEqual(schedule.update(0.6), 50)
+        self.assertEqual(schedule.update(0.9), 100)
+        # the resolution isn't lowered, e.g. by a second call to learn
+        self.assertEqual(schedule.update(0.1), 100)
+        self.assertEqual(schedule.full, 100)
+        with self.assertRaises(ValueError):
+            ResolutionSchedule((50, 20))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,34 @@
+import os
+import tempfile
+import unittest
+from build_vessel.store import EvaluationStore
+
+
+class TestEvaluationStore(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.directory.name, "evaluations.sqlite")
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def test_key_depends_on_settings(self):
+        block_key = (10, 60.0, 15, 8.0, 12.0, 2.0, 5.0, 6.0, 0.5, 0.0)
+        key = EvaluationStore.key(block_key, 12, 8000)
+        self.assertEqual(key, EvaluationStore.key(block_key, 12.0, 8000.0))
+        self.assertNotEqual(key, EvaluationStore.key(block_key, 14, 8000))
+        self.assertNotEqual(key, EvaluationStore.key(block_key, 12, 8000, resolution=50))
+
+    def test_batched_writes_are_shared(self):
+        with EvaluationStore(self.path, batch_size=2) as store:
+            store.put("a", 500.0, 8, {"volume": 1000.0})
+            self.assertEqual(store.get("a"), (500.0, 8.0, {"volume": 1000.0}))
+            with EvaluationStore(self.path) as other:
+                self.assertIsNone(other.get("a"))
+                store.put("b", 600.0, 8, {"volume": 2000.0})
+                self.assertEqual(other.get("a"), (500.0, 8.0, {"volume": 1000.0}))
+                self.assertEqual(len(other), 2)
+
+
+if __name__ == '__main__':
+    unittest.main()
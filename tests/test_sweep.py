@@ -0,0 +1,53 @@
+import json
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+from ReinforcementLearning.sweep import batched, expand, run_sweep, collect
+
+# the training scripts import their siblings directly
+sys.path.insert(0, str(Path(__file__).parents[1] / "ReinforcementLearning"))
+
+
+def fake_train(config: dict, output: str) -> dict:
+    metrics = {"run_id": config["run_id"], "mean_reward": float(config["seed"]), "steps_per_second": 1.0}
+    directory = Path(output) / config["run_id"]
+    directory.mkdir(parents=True)
+    with open(directory / "metrics.json", "w") as f:
+        json.dump(metrics, f)
+    return metrics
+
+
+class TestSweep(unittest.TestCase):
+    def setUp(self):
+        self.spec = {"algorithms": {"PPO": {"learning_rate": [0.001, 0.0003], "n_steps": 64},
+                                    "SAC": {"learning_rate": {"low": 0.0001, "high": 0.01, "log": True}}},
+                     "seeds": [0, 1]}
+
+    def test_expand(self):
+        runs = expand(self.spec)
+        self.assertEqual(len(runs), 6)
+        self.assertEqual(len({run["run_id"] for run in runs}), 6)
+        random = expand({**self.spec, "search": "random", "n_samples": 3})
+        self.assertEqual(len(random), 12)
+        self.assertTrue(all(0.0001 <= run["hyperparameters"]["learning_rate"] <= 0.01 for run in random))
+        self.assertEqual(random, expand({**self.spec, "search": "random", "n_samples": 3}))
+
+    def test_batched(self):
+        config = expand({**self.spec, "n_envs": 4, "env": {"bale": 8000, "resolutions": [25, 100]}})[0]
+        self.assertTrue(batched(config))
+        self.assertFalse(batched({**config, "n_envs": 1}))
+        # options of ShipEnv which BatchShipEnv doesn't take need a ShipEnv per environment
+        self.assertFalse(batched({**config, "env": {"bale": 8000, "precheck": True}}))
+
+    def test_resume(self):
+        with tempfile.TemporaryDirectory() as output:
+            spec = {**self.spec, "seeds": [0]}
+            self.assertEqual(len(run_sweep(spec, output, workers=2, trainer=fake_train)), 3)
+            self.assertEqual(run_sweep(spec, output, workers=2, trainer=fake_train), [])
+            self.assertEqual(len(run_sweep(self.spec, output, workers=2, trainer=fake_train)), 3)
+            self.assertEqual(len(collect(output)), 6)
+
+
+if __name__ == '__main__':
+    unittest.main()
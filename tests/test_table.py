@@ -0,0 +1,62 @@
+import os
+import tempfile
+import unittest
+import numpy as np
+from build_vessel.batch import Blocks
+from build_vessel.parameters import Block
+from build_vessel.properties import Info
+from build_vessel.table import DesignTable, PARAMETERS
+
+DESIGN = dict(laft=12, lhold=80, lfore=20, boa=8, depth=12, bilge_radius=2, ctrlpt_offset_forward=5, transom_width=6,
+              transom_height_action=0.5)
+
+
+class TestDesignTable(unittest.TestCase):
+    def test_blocks(self):
+        blocks = [Block(**{**DESIGN, "lhold": lhold}) for lhold in (60, 70, 80)]
+        blocks[1].check_done([])
+        blocks[2].draft = 20
+        table = DesignTable(capacity=1)
+        for i, block in enumerate(blocks):
+            self.assertEqual(table.append(block, resistance=100.0 + i), i)
+        table.append(blocks[0])
+        self.assertEqual(len(table), 4)
+        self.assertEqual([table.block(i) for i in range(3)], blocks)
+        self.assertIsInstance(table.block(0).laft, int)
+        np.testing.assert_array_equal(table["resistance"], [100, 101, 102, np.nan])
+        np.testing.assert_array_equal(table.blocks().draft, [block.draft for block in blocks + blocks[:1]])
+
+    def test_columns(self):
+        columns = {name: np.array([DESIGN[name], DESIGN[name]]) for name in PARAMETERS if name in DESIGN}
+        table = DesignTable()
+        table.extend(columns, resistance=[1.0, 2.0])
+        table.extend(Blocks(**columns))
+        self.assertEqual(table.block(0), Block(**DESIGN))
+        np.testing.assert_array_equal(table["lwl"], 112)
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "designs.npz")
+            table.save(path)
+            loaded = DesignTable.load(path)
+        self.assertEqual(loaded.row(1), table.row(1))
+        np.testing.assert_array_equal(loaded["resistance"], table["resistance"])
+
+    def test_missing_results(self):
+        table = DesignTable()
+        table.append(Block(**DESIGN), reevaluated=3)
+        table.append(Block(**DESIGN))
+        table.append(Block(**DESIGN), reevaluated=0)
+        np.testing.assert_array_equal(table["reevaluated"], [3, np.nan, 0])
+        self.assertTrue(np.issubdtype(table["laft"].dtype, np.integer))
+
+    def test_info(self):
+        info = Info()
+        info.volume, info.resistance = 1.5, {"total": 3.0}
+        copy = Info()
+        copy.update(info.as_dict())
+        self.assertEqual(copy.as_dict(), info.as_dict())
+        with self.assertRaises(AttributeError):
+            info.unknown = 1
+
+
+if __name__ == '__main__':
+    unittest.main()
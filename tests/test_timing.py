@@ -0,0 +1,27 @@
+import unittest
+from build_vessel.timing import StageTimer
+
+
+class TestStageTimer(unittest.TestCase):
+    def test_steps_and_summary(self):
+        timer = StageTimer(percentiles=(50,))
+        for seconds in (1.0, 2.0, 3.0):
+            timer.start_step()
+            timer.add("area", seconds)
+            with timer.stage("frames_aft"):
+                pass
+        self.assertEqual(set(timer.last), {"area", "frames_aft"})
+        summary = timer.summary()
+        self.assertEqual(summary["area"], {"count": 3, "total": 6.0, "mean": 2.0, "p50": 2.0})
+        self.assertEqual(summary["frames_aft"]["count"], 3)
+
+    def test_disabled(self):
+        timer = StageTimer(enabled=False)
+        with timer.stage("area"):
+            pass
+        self.assertEqual(timer.last, {})
+        self.assertEqual(timer.summary(), {})
+
+
+if __name__ == '__main__':
+    unittest.main()
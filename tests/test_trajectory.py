@@ -0,0 +1,21 @@
+import tempfile
+import unittest
+from ReinforcementLearning.trajectory import TrajectoryLogger, load_trajectories
+
+
+class TestTrajectoryLogger(unittest.TestCase):
+    def test_write_and_load(self):
+        with tempfile.TemporaryDirectory() as directory:
+            with TrajectoryLogger(directory, batch_size=4, block=True) as logger:
+                for step in range(10):
+                    logger.log({"step": step, "reward": 1.0, "fidelity": "high" if step % 2 else None})
+                logger.log({"step": 10, "wave": 2.5})
+            df = load_trajectories(directory)
+            self.assertEqual(logger.written, 11)
+            self.assertEqual(df["step"].tolist(), list(range(11)))
+            self.assertEqual(df["fidelity"].tolist()[:2], ["", "high"])
+            self.assertEqual(df["wave"].count(), 1)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,34 @@
+import unittest
+import numpy as np
+from build_vessel.batch import Blocks
+from build_vessel.parameters import Block, CtrlPts, Violation
+
+
+DESIGN = dict(laft=12, lhold=80, lfore=20, boa=8, depth=12, bilge_radius=2, ctrlpt_offset_forward=5, transom_width=6,
+              transom_height_action=0.5)
+
+
+class TestViolations(unittest.TestCase):
+    def test_block(self):
+        self.assertEqual(Block(**DESIGN).violations(), Violation.NONE)
+        block = Block(**{**DESIGN, "laft": 0, "ctrlpt_offset_forward": 25, "transom_width": 9, "depth": 1})
+        self.assertEqual(block.violations(), Violation.LAFT | Violation.OFFSET_FORWARD | Violation.TRANSOM_WIDTH
+                         | Violation.DRAFT | Violation.BILGE_RADIUS)
+
+    def test_ctrlpts(self):
+        self.assertEqual(CtrlPts(Block(**DESIGN)).violations(), Violation.NONE)
+        # the control point of the forward waterplane is aft of the hold
+        self.assertEqual(CtrlPts(Block(**{**DESIGN, "ctrlpt_offset_forward": 25})).violations(),
+                         Violation.OFFSET_FORWARD | Violation.WATERPLANE)
+
+    def test_same_as_blocks(self):
+        designs = [DESIGN, {**DESIGN, "bilge_radius": 9}, {**DESIGN, "lfore": 0, "ctrlpt_offset_forward": 0},
+                   {**DESIGN, "lhold": np.nan}, {**DESIGN, "transom_height_action": 1.5}]
+        blocks = Blocks(**{name: np.array([design[name] for design in designs]) for name in DESIGN})
+        codes = blocks.violations()
+        self.assertEqual(codes.tolist(), [Block(**design).violations() for design in designs])
+        self.assertEqual(codes[3] & Violation.NOT_FINITE, Violation.NOT_FINITE)
+
+
+if __name__ == '__main__':
+    unittest.main()